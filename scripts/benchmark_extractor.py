@@ -0,0 +1,144 @@
+"""저장된 상품 페이지로 추출 엔진별 파싱 시간을 비교하는 마이크로 벤치마크
+
+사용법:
+    python benchmark_extractor.py <HTML 디렉터리 또는 보관소> [--repeat 5] [--stage custom-tabs]
+
+속도 향상과 필드 불일치는 최초 버전 추출 코드의 고정본(baseline)을 기준으로 계산한다.
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from complete_goldenrabbit_scraper import GoldenRabbitCompleteScraper
+from goldenrabbit_archive import PageArchive
+from goldenrabbit_extractor import new_book_data
+from goldenrabbit_extractor_baseline import BaselineExtractor
+
+# 측정할 엔진 (baseline: 최초 버전 추출 코드, soup/lxml: 현재 스크레이퍼의 추출 엔진)
+ENGINES = ('baseline', 'soup', 'lxml')
+
+
+def load_pages(directory):
+    """디렉터리 아래의 모든 .html 파일(또는 --archive 보관소)을 (이름, bytes) 목록으로 읽기"""
+    if (Path(directory) / 'index.jsonl').exists():
+        archive = PageArchive(directory)
+        return [(entry['url'], archive.load(entry)) for entry in archive.entries()]
+
+    paths = sorted(Path(directory).rglob('*.html'))
+    return [(str(path.relative_to(directory)), path.read_bytes()) for path in paths]
+
+
+def page_runner(scraper, engine, stage, html, name):
+    """한 페이지에 대해 측정할 작업(호출 가능 객체) 반환 (scraper는 baseline이면 BaselineExtractor)"""
+    if engine == 'baseline':
+        if stage == 'page':
+            return lambda: scraper.extract(html, name, name)
+
+        soup = BeautifulSoup(html, 'html.parser')
+
+        def run():
+            book_data = new_book_data(name, name)
+            scraper.extract_custom_tabs(soup, book_data)
+            return book_data
+        return run
+
+    if stage == 'page':
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return scraper.parse_book_detail(html, name, name)
+        return run
+
+    # 커스텀 탭 단계만 측정: 파싱과 후보 수집은 측정 밖에서 미리 수행
+    if engine == 'soup':
+        soup = BeautifulSoup(html, 'html.parser')
+
+        def run():
+            book_data = new_book_data(name, name)
+            scraper.extract_custom_tabs(soup, book_data)
+            return book_data
+        return run
+
+    headings, class_divs = scraper.extractor.collect_candidates(scraper.extractor.parse(html))
+
+    def run():
+        book_data = new_book_data(name, name)
+        scraper.extractor.extract_custom_tabs(headings, class_divs, book_data)
+        return book_data
+    return run
+
+
+def time_engine(scraper, engine, stage, pages, repeat):
+    """페이지별 최소 추출 시간(ms)과 마지막 추출 결과 반환"""
+    timings = []
+    results = {}
+
+    for name, html in pages:
+        run = page_runner(scraper, engine, stage, html, name)
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            book_data = run()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append(best)
+        results[name] = book_data
+
+    return timings, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추출 엔진 파싱 시간 벤치마크")
+    parser.add_argument('directory', help="저장된 상품 페이지(.html) 디렉터리 또는 페이지 보관소")
+    parser.add_argument('--repeat', type=int, default=5, help="페이지별 반복 횟수 (최솟값 사용)")
+    parser.add_argument('--stage', choices=['page', 'custom-tabs'], default='page',
+                        help="측정 범위: 페이지 전체 또는 커스텀 탭 추출 단계만")
+    args = parser.parse_args()
+
+    pages = load_pages(args.directory)
+    if not pages:
+        print("❌ HTML 파일을 찾을 수 없습니다.")
+        return
+
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"📚 페이지 {len(pages)}개 ({total_kb:.0f}KB), 반복 {args.repeat}회, 측정 범위: {args.stage}")
+
+    summary = {}
+    outputs = {}
+    for engine in ENGINES:
+        if engine == 'baseline':
+            timings, results = time_engine(BaselineExtractor(), engine, args.stage, pages, args.repeat)
+        else:
+            scraper = GoldenRabbitCompleteScraper(parser=engine)
+            try:
+                timings, results = time_engine(scraper, engine, args.stage, pages, args.repeat)
+            finally:
+                scraper.fetcher.close()
+        summary[engine] = timings
+        outputs[engine] = results
+        print(f"  - {engine:8s}: 평균 {statistics.mean(timings):.2f}ms, "
+              f"중앙값 {statistics.median(timings):.2f}ms, 최대 {max(timings):.2f}ms")
+
+    baseline = statistics.mean(summary['baseline'])
+    for engine in ENGINES[1:]:
+        print(f"🚀 {engine} 엔진 속도 향상 (baseline 대비): {baseline / statistics.mean(summary[engine]):.1f}배")
+
+    # 각 엔진의 결과가 최초 버전 추출 결과와 같은지 필드 단위로 비교
+    for engine in ENGINES[1:]:
+        mismatches = 0
+        for name, _ in pages:
+            before = outputs['baseline'][name] or {}
+            after = outputs[engine][name] or {}
+            for field in sorted(set(before) | set(after)):
+                if before.get(field) != after.get(field):
+                    mismatches += 1
+                    print(f"⚠️ {engine} 결과 불일치 {name}: {field} ({before.get(field)!r:.40} → {after.get(field)!r:.40})")
+        print(f"🔍 {engine} 필드 불일치 (baseline 대비): {mismatches}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+"""로컬 WooCommerce 대역 서버로 스크래퍼 전체를 측정하는 오프라인 벤치마크
+
+사용법:
+    python benchmark_scraper.py [--sizes 73,1000,10000] [--latency 20] [--error-rate 0.01]
+                                [--archive 보관소] [--incremental] [--json 결과.json] [--baseline 이전.json]
+
+- 상품 페이지는 보관소(--archive)에 저장된 실제 페이지를 그대로 돌려주거나,
+  없으면 기존 결과 JSON(73권)의 도서 정보로 만든 WooCommerce 형식 페이지를 쓴다.
+  카탈로그 크기가 도서 수보다 크면 같은 페이지를 다른 URL로 반복해 늘린다.
+- 서버는 요청마다 지연(--latency), 503 오류(--error-rate), 429 + Retry-After(--throttle-rate)를
+  넣을 수 있고, ETag로 조건부 요청에 304를 돌려준다.
+- 크기별로 별도 프로세스에서 GoldenRabbitCompleteScraper.scrape_all_books()를 실행해
+  권/초, 요청 지연 p50/p99, 최대 RSS, 페이지당 CPU 시간을 잰다.
+- --incremental이면 같은 캐시로 한 번 더 실행한다 (--changed 비율의 페이지만 변경).
+"""
+import argparse
+import html
+import json
+import multiprocessing
+import os
+import queue
+import random
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from goldenrabbit_archive import PageArchive
+from goldenrabbit_loader import load_books
+from goldenrabbit_record import format_price, parse_price
+
+
+LISTING_PATH = '/product-category/books/'
+PRODUCT_PATH_RE = re.compile(r'^/product/book-(\d+)/$')
+LISTING_PAGE_RE = re.compile(r'^/product-category/books/(?:page/(\d+)/)?$')
+STORE_API_PATH = '/wp-json/wc/store/products'
+
+# WooCommerce 카테고리 목록의 페이지당 상품 수
+LISTING_PER_PAGE = 12
+
+PLACEHOLDER_GIF = 'data:image/gif;base64,R0lGODlhAQABAAAAACH5BAEKAAEALAAAAAABAAEAAAICTAEAOw=='
+
+# 템플릿에서 복제본마다 바뀌는 제목 자리
+TITLE_MARK = '\x00TITLE\x00'
+
+# 측정 프로세스가 살아 있는지 확인하는 간격 (초)
+POLL_SECONDS = 1.0
+
+
+def default_records_path():
+    """스크립트 옆의 가장 최근 결과 JSON"""
+    paths = sorted(Path(__file__).resolve().parent.glob('complete_goldenrabbit_books_*.json'))
+    return str(paths[-1]) if paths else None
+
+
+def filler_menu(page_kb):
+    """실제 페이지 크기와 DOM 규모를 흉내 내는 메뉴 (약 page_kb KB)"""
+    item = '<li class="menu-item"><a href="/category/{0}/">카테고리 메뉴 {0}</a></li>'
+    count = max(0, page_kb * 1024 // (len(item) + 8))
+    return '<ul class="menu">' + ''.join(item.format(i) for i in range(count)) + '</ul>'
+
+
+def display_value(field, value):
+    """도서 정보 값을 상품 페이지에 보이는 문자열로 (정규화된 정수 가격·페이지 수도 처리)"""
+    if field == 'price':
+        return format_price(value)
+    if field == 'page_count' and isinstance(value, int):
+        return f"{value}쪽"
+    return '' if value is None else str(value)
+
+
+def render_product_page(book, page_kb):
+    """도서 정보로 WooCommerce 상품 페이지 HTML 템플릿 생성 (제목은 TITLE_MARK)
+
+    book은 추출기 출력(문자열 값)과 BookRecord.to_dict 출력(정수 가격 등) 모두 받는다.
+    """
+    escape = html.escape
+    meta_rows = ''.join(
+        f'<tr><th>{label}</th><td>{escape(display_value(field, book[field]))}</td></tr>'
+        for label, field in [('저자', 'author'), ('ISBN', 'isbn'), ('페이지', 'page_count'),
+                             ('출간일', 'publication_date'), ('크기', 'size')]
+        if book.get(field)
+    )
+    sections = ''.join(
+        f'<h3>{heading}</h3><div class="tab-section"><p>{escape(display_value(field, book[field]))}</p></div>'
+        for heading, field in [('목차', 'table_of_contents'), ('출판사 리뷰', 'publisher_review'),
+                               ('추천평', 'testimonials')]
+        if book.get(field)
+    )
+    description = escape(book.get('description') or '')
+    cover = book.get('cover_image_url') or ''
+    cover = cover if cover and not cover.startswith('data:') else '/wp-content/uploads/cover.jpg'
+
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{TITLE_MARK}</title></head>'
+        f'<body class="product-template"><div class="site-header">{filler_menu(page_kb)}</div>'
+        '<div class="product type-product"><div class="woocommerce-product-gallery">'
+        f'<div class="woocommerce-product-gallery__image"><img src="{PLACEHOLDER_GIF}" '
+        f'data-src="{escape(cover)}" class="wp-post-image"></div></div>'
+        f'<div class="summary entry-summary"><h1 class="product_title">{TITLE_MARK}</h1>'
+        f'<p class="price"><span class="woocommerce-Price-amount amount"><bdi>{escape(format_price(book.get("price")))}</bdi></span></p>'
+        f'<div class="woocommerce-product-details__short-description"><p>{description[:200]}</p></div>'
+        f'<div class="product_meta"><table class="shop_attributes">{meta_rows}</table></div></div>'
+        '<div class="woocommerce-tabs wc-tabs-wrapper"><div class="woocommerce-Tabs-panel '
+        'woocommerce-Tabs-panel--description panel entry-content" id="tab-description">'
+        f'<h2>책소개</h2><p>{description}</p>{sections}</div></div></div></body></html>'
+    )
+
+
+class Catalog:
+    """size권짜리 가상 카탈로그 (원본 페이지를 순환하며 복제)"""
+
+    def __init__(self, size, records=None, captured=None, page_kb=80):
+        self.size = size
+        self.records = records or []
+        # 보관소 페이지는 그대로, 도서 정보는 한 번만 렌더링한 템플릿을 재사용
+        self.templates = captured or [render_product_page(book, page_kb) for book in self.records]
+        self.captured = bool(captured)
+        self.versions = {}
+
+    def base_index(self, number):
+        return (number - 1) % len(self.templates)
+
+    def title(self, number):
+        if self.captured:
+            return f"책 {number}"
+        title = self.records[self.base_index(number)].get('title') or f"책 {number}"
+        copy = (number - 1) // len(self.templates)
+        return title if copy == 0 else f"{title} ({copy + 1})"
+
+    def product_page(self, number):
+        template = self.templates[self.base_index(number)]
+        if self.captured:
+            body = template
+        else:
+            body = template.replace(TITLE_MARK, html.escape(self.title(number))).encode('utf-8')
+        # 변경된 페이지는 본문도 달라져야 해시 기반 변경 감지에 걸린다
+        version = self.versions.get(number, 0)
+        if version:
+            body = body.replace(b'</body>', f'<!-- v{version} --></body>'.encode())
+        return body
+
+    def etag(self, number):
+        return f'"book-{number}-v{self.versions.get(number, 0)}"'
+
+    def change(self, fraction, seed=0):
+        """fraction 비율의 페이지를 변경 (다음 조건부 요청에서 200)"""
+        rng = random.Random(seed)
+        for number in rng.sample(range(1, self.size + 1), int(self.size * fraction)):
+            self.versions[number] = self.versions.get(number, 0) + 1
+
+    def listing_pages(self):
+        return max(1, -(-self.size // LISTING_PER_PAGE))
+
+    def listing_page(self, page):
+        start = (page - 1) * LISTING_PER_PAGE + 1
+        items = ''.join(
+            f'<li class="product"><h3><a href="/product/book-{n}/">{html.escape(self.title(n))}</a></h3></li>'
+            for n in range(start, min(self.size, start + LISTING_PER_PAGE - 1) + 1)
+        )
+        return (f'<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>'
+                f'<ul class="products">{items}</ul></body></html>').encode('utf-8')
+
+    def store_products(self, page, per_page, base_url):
+        """Store API 상품 목록 (도서 정보가 있을 때만)"""
+        products = []
+        start = (page - 1) * per_page + 1
+        for n in range(start, min(self.size, start + per_page - 1) + 1):
+            book = self.records[self.base_index(n)]
+            cover = book.get('cover_image_url') or ''
+            products.append({
+                'id': n,
+                'name': self.title(n),
+                'permalink': f"{base_url}/product/book-{n}/",
+                'sku': book.get('isbn') or '',
+                'prices': {'price': str(parse_price(book.get('price')) or ''), 'currency_minor_unit': 0,
+                           'currency_prefix': '₩', 'currency_suffix': ''},
+                'images': [{'src': cover}] if cover and not cover.startswith('data:') else [],
+                'description': book.get('description') or '',
+                'short_description': '',
+                'categories': [{'slug': 'books'}],
+                'attributes': [],
+            })
+        return products
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """WooCommerce 목록/상품/Store API 대역 요청 처리기"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        catalog = server.catalog
+
+        if server.latency:
+            time.sleep(server.latency * random.uniform(0.5, 1.5))
+
+        roll = random.random()
+        if roll < server.error_rate:
+            self.send_body(503, b'unavailable')
+            return
+        if roll < server.error_rate + server.throttle_rate:
+            self.send_body(429, b'slow down', headers={'Retry-After': '1'})
+            return
+
+        parts = urlsplit(self.path)
+        match = PRODUCT_PATH_RE.match(parts.path)
+        if match and 1 <= int(match.group(1)) <= catalog.size:
+            number = int(match.group(1))
+            etag = catalog.etag(number)
+            if self.headers.get('If-None-Match') == etag:
+                self.send_body(304, b'', headers={'ETag': etag})
+            else:
+                self.send_body(200, catalog.product_page(number), headers={'ETag': etag})
+            return
+
+        match = LISTING_PAGE_RE.match(parts.path)
+        if match:
+            page = int(match.group(1) or 1)
+            if page > catalog.listing_pages():
+                self.send_body(404, b'not found')
+            else:
+                self.send_body(200, catalog.listing_page(page))
+            return
+
+        if parts.path.rstrip('/') == STORE_API_PATH and catalog.records and not catalog.captured:
+            query = parse_qs(parts.query)
+            per_page = int(query.get('per_page', ['10'])[0])
+            page = int(query.get('page', ['1'])[0])
+            total_pages = max(1, -(-catalog.size // per_page))
+            body = json.dumps(catalog.store_products(page, per_page, server.base_url)).encode('utf-8')
+            self.send_body(200, body, 'application/json; charset=utf-8',
+                           headers={'X-WP-TotalPages': str(total_pages)})
+            return
+
+        self.send_body(404, b'not found')
+
+
+class StandInServer(ThreadingHTTPServer):
+    """벤치마크용 로컬 WooCommerce 대역 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, catalog, latency_ms=0, error_rate=0.0, throttle_rate=0.0):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.catalog = catalog
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def run_scrape(base_url, options, output_path, cache_path, results):
+    """별도 프로세스에서 스크래퍼 전체를 실행하고 측정값(실패하면 {'error': 트레이스백})을 results 큐에 넣는다"""
+    try:
+        results.put(scrape_and_measure(base_url, options, output_path, cache_path))
+    except BaseException:
+        results.put({'error': traceback.format_exc()})
+        raise
+
+
+def scrape_and_measure(base_url, options, output_path, cache_path):
+    """스크래퍼 전체를 한 번 실행하고 측정값 딕셔너리 반환"""
+    from complete_goldenrabbit_scraper import GoldenRabbitCompleteScraper
+
+    scraper = GoldenRabbitCompleteScraper(
+        concurrency=options['concurrency'],
+        max_concurrency=options['max_concurrency'],
+        rate=0,
+        listing_url=base_url + LISTING_PATH,
+        parser=options['parser'],
+        workers=options['workers'],
+        output_path=output_path,
+        compact=False,
+        cache_path=cache_path,
+        structured=options['structured'],
+    )
+    self_before = resource.getrusage(resource.RUSAGE_SELF)
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            scraper.scrape_all_books()
+    finally:
+        scraper.fetcher.close()
+        if scraper.cache:
+            scraper.cache.close()
+    elapsed = time.perf_counter() - started
+    self_after = resource.getrusage(resource.RUSAGE_SELF)
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    cpu = sum(getattr(after, field) - getattr(before, field)
+              for before, after in [(self_before, self_after), (children_before, children_after)]
+              for field in ('ru_utime', 'ru_stime'))
+    summary = scraper.metrics.summary()
+    fetch = summary['timings'].get('fetch_seconds', {})
+    parse = summary['timings'].get('parse_seconds', {})
+    handled = scraper.book_count + len(scraper.unchanged_urls)
+    pages = max(1, handled)
+
+    return {
+        'books': scraper.book_count,
+        'unchanged': len(scraper.unchanged_urls),
+        'seconds': round(elapsed, 3),
+        'books_per_second': round(handled / elapsed, 2) if elapsed else 0.0,
+        'fetch_p50_ms': round(fetch.get('p50', 0) * 1000, 2),
+        'fetch_p99_ms': round(fetch.get('p99', 0) * 1000, 2),
+        'parse_p50_ms': round(parse.get('p50', 0) * 1000, 2),
+        'parse_p99_ms': round(parse.get('p99', 0) * 1000, 2),
+        # Linux의 ru_maxrss는 KB 단위, 자식은 가장 큰 워커 프로세스 기준
+        'peak_rss_mb': round(max(self_after.ru_maxrss, children_after.ru_maxrss) / 1024, 1),
+        'cpu_ms_per_page': round(cpu * 1000 / pages, 3),
+        'requests': summary['counters'].get('requests', 0),
+        'retries': summary['counters'].get('retries', 0),
+        'bytes_fetched': summary['counters'].get('bytes_fetched', 0),
+    }
+
+
+def wait_result(process, results, timeout):
+    """측정 프로세스의 결과를 기다려 반환
+
+    프로세스가 결과 없이 끝나거나 오류를 보내거나 timeout초를 넘기면 RuntimeError.
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    while True:
+        try:
+            result = results.get(timeout=POLL_SECONDS)
+            break
+        except queue.Empty:
+            pass
+        if not process.is_alive():
+            # 종료 직전에 넣은 결과가 늦게 도착할 수 있으므로 한 번 더 확인
+            try:
+                result = results.get(timeout=POLL_SECONDS)
+                break
+            except queue.Empty:
+                raise RuntimeError(f"측정 프로세스가 결과 없이 종료되었습니다 (종료 코드 {process.exitcode})")
+        if deadline and time.monotonic() > deadline:
+            process.terminate()
+            process.join()
+            raise RuntimeError(f"측정이 {timeout:.0f}초 안에 끝나지 않았습니다")
+
+    if 'error' in result:
+        process.join()
+        raise RuntimeError(f"측정 프로세스 오류:\n{result['error']}")
+    return result
+
+
+def measure(server, options, workdir, label):
+    """새 프로세스에서 한 번 수집하고 측정 결과 반환 (실패하거나 시간을 넘기면 RuntimeError)"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    size = server.catalog.size
+    process = context.Process(target=run_scrape, args=(
+        server.base_url, options,
+        os.path.join(workdir, f"books_{size}_{label}.jsonl"),
+        os.path.join(workdir, f"cache_{size}.sqlite") if options['cache'] else None,
+        results,
+    ))
+    process.start()
+    result = wait_result(process, results, options['timeout'])
+    process.join()
+    result.update({'size': size, 'mode': label})
+    return result
+
+
+def print_result(result, baseline=None):
+    line = (f"  {result['size']:>6} {result['mode']:<11} {result['books_per_second']:>9.1f} "
+            f"{result['fetch_p50_ms']:>8.1f} {result['fetch_p99_ms']:>8.1f} "
+            f"{result['peak_rss_mb']:>9.1f} {result['cpu_ms_per_page']:>10.2f} {result['retries']:>6}")
+    if baseline:
+        change = (result['books_per_second'] / baseline['books_per_second'] - 1) * 100
+        line += f"  ({change:+.1f}% 권/초)"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 대역 서버를 이용한 스크래퍼 처리량 벤치마크")
+    parser.add_argument('--sizes', default='73,1000', help="카탈로그 크기 목록 (기본값: 73,1000)")
+    parser.add_argument('--records', default=default_records_path(),
+                        help="페이지를 만들 도서 정보 JSON/JSONL (기본값: 최근 결과 JSON)")
+    parser.add_argument('--archive', default=None, help="실제 페이지를 그대로 돌려줄 페이지 보관소")
+    parser.add_argument('--page-kb', type=int, default=80, help="합성 페이지에 덧붙일 메뉴 크기 (KB)")
+    parser.add_argument('--latency', type=float, default=20, help="요청당 평균 지연 (ms, 기본값: 20)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="503 응답 비율")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="429 + Retry-After 응답 비율")
+    parser.add_argument('--concurrency', type=int, default=8, help="시작 동시 요청 수 (기본값: 8)")
+    parser.add_argument('--max-concurrency', type=int, default=None, help="최대 동시 요청 수")
+    parser.add_argument('--workers', type=int, default=0, help="파싱 프로세스 수 (0이면 인라인)")
+    parser.add_argument('--parser', choices=['lxml', 'soup'], default='lxml')
+    parser.add_argument('--structured', action='store_true', help="Store API 경로로 수집")
+    parser.add_argument('--incremental', action='store_true',
+                        help="캐시를 켜고 한 번 더 수집해 304 위주의 증분 수집 측정")
+    parser.add_argument('--changed', type=float, default=0.1, help="증분 수집 전 변경할 페이지 비율")
+    parser.add_argument('--timeout', type=float, default=1800,
+                        help="한 번의 수집 측정 제한 시간 (초, 기본값: 1800, 0이면 제한 없음)")
+    parser.add_argument('--json', default=None, help="측정 결과 저장 경로")
+    parser.add_argument('--baseline', default=None, help="비교할 이전 측정 결과(JSON)")
+    args = parser.parse_args()
+
+    records, captured = [], None
+    if args.archive:
+        archive = PageArchive(args.archive)
+        captured = [archive.load(entry) for entry in archive.entries()]
+        source = f"보관소 페이지 {len(captured)}개"
+    elif args.records:
+        records = list(load_books(args.records))
+        source = f"도서 정보 {len(records)}권 ({os.path.basename(args.records)})"
+    if not (records or captured):
+        print("❌ 페이지를 만들 도서 정보나 보관소가 없습니다.")
+        sys.exit(1)
+
+    options = {
+        'concurrency': args.concurrency,
+        'max_concurrency': args.max_concurrency,
+        'workers': args.workers,
+        'parser': args.parser,
+        'structured': args.structured,
+        'cache': args.incremental,
+        'timeout': args.timeout,
+    }
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = {(r['size'], r['mode']): r for r in json.load(f)['results']}
+
+    print(f"📚 원본: {source}, 지연 {args.latency}ms, 503 {args.error_rate:.1%}, 429 {args.throttle_rate:.1%}")
+    print("     크기 모드            권/초  p50(ms)  p99(ms)  최대RSS(MB) CPU/페이지(ms) 재시도")
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in [int(size) for size in args.sizes.split(',') if size.strip()]:
+            catalog = Catalog(size, records, captured, args.page_kb)
+            server = StandInServer(catalog, args.latency, args.error_rate, args.throttle_rate).start()
+            try:
+                runs = [('full', None)]
+                if args.incremental:
+                    runs.append(('incremental', args.changed))
+                for label, changed in runs:
+                    if changed is not None:
+                        catalog.change(changed)
+                    try:
+                        result = measure(server, options, workdir, label)
+                    except RuntimeError as e:
+                        print(f"❌ {size}권 {label} 측정 실패: {e}")
+                        sys.exit(1)
+                    results.append(result)
+                    print_result(result, baseline.get((size, label)))
+            finally:
+                server.stop()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'options': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 측정 결과: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
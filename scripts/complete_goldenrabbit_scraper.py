@@ -1,24 +1,70 @@
 import requests
-from bs4 import BeautifulSoup
-import json
+import argparse
+import asyncio
+import os
+import re
 import time
-import random
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from itertools import repeat
+
+from goldenrabbit_archive import PageArchive, parse_archived_page
+from goldenrabbit_bookstores import RESOLVERS, BookstoreEnricher, LinkCache, fetcher_fetch
+from goldenrabbit_cache import PageCache
+from goldenrabbit_covers import DEFAULT_FORMATS, DEFAULT_WIDTHS, CoverDownloader, parse_list
+from goldenrabbit_dedupe import BoilerplateIndex, TextStore, dedupe_jsonl
+from goldenrabbit_diff import (
+    Snapshot,
+    baseline_path,
+    diff_books,
+    load_rows,
+    max_deletes,
+    previous_snapshot,
+    update_baseline,
+    write_changes,
+)
+from goldenrabbit_extractor import BookExtractor, SoupExtractor, clean_text, header_charset, merge_missing
+from goldenrabbit_fetcher import AsyncFetcher
+from goldenrabbit_listing import LISTING_URL, ListingEnumerator
+from goldenrabbit_loader import book_id, write_sql
+from goldenrabbit_metrics import Metrics, profile_call
+from goldenrabbit_pipeline import ParsePipeline, default_workers
+from goldenrabbit_record import BookRecord
+from goldenrabbit_search import SearchIndex
+from goldenrabbit_sink import JsonlSink, compact_jsonl, count_jsonl, iter_jsonl
+from goldenrabbit_state import CrawlState
+from goldenrabbit_structured import DEFAULT_REQUIRED_FIELDS, StoreApiClient, missing_fields
 
 
 class GoldenRabbitCompleteScraper:
-    def __init__(self):
-        self.books_data = {}
+    def __init__(self, concurrency=4, rate=2.0, burst=None, listing_url=LISTING_URL, use_selenium=False,
+                 cache_path=None, parser='lxml', workers=0, archive_dir=None,
+                 output_path=None, compact=True, state_path=None, max_attempts=3,
+                 sql_format=None, structured=False, required_fields=None,
+                 max_concurrency=None, max_rate=None, retries=3, target_latency=2.0,
+                 covers_dir=None, cover_base_url='/covers', cover_widths=None, cover_formats=None,
+                 metrics_path=None, log_json_path=None, search_index_path=None,
+                 dedupe=False, dedupe_index=None, text_store_path=None, diff_against=None, hard_delete=False,
+                 force_deletes=False,
+                 bookstore_cache=None, bookstores=None):
+        # 단계별 시간, 수집 바이트, 파싱 시간, 큐 깊이, 재시도 수 측정
+        self.metrics = Metrics(log_path=log_json_path)
+        self.metrics_path = metrics_path
         self.book_count = 0
+        # 결과 JSONL 전체의 도서 수 (이어서 수집하면 이전 실행의 도서 포함, save_results에서 계산)
+        self.record_count = 0
+        # 도서 정보는 메모리에 모으지 않고 추출되는 즉시 JSONL로 기록
+        self.output_path = output_path
+        self.compact = compact
+        self.sink = None
+        # 재시작 가능한 수집 상태 (URL별 진행 상황)
+        self.state = CrawlState(state_path, max_attempts=max_attempts) if state_path else None
+        self.errors = {}
+        # 지정하면 결과를 books 테이블 적재 SQL(insert/copy)로도 저장
+        self.sql_format = sql_format
+        # Store API로 도서 정보를 100개씩 받아오고, 빠진 필드만 HTML로 보완
+        self.structured = structured
+        self.required_fields = required_fields or DEFAULT_REQUIRED_FIELDS
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -26,9 +72,60 @@ class GoldenRabbitCompleteScraper:
             'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
             'Connection': 'keep-alive',
         })
+        # 동시 요청 수와 호스트별 초당 요청 수로 예의(politeness)를 조절
+        # (서버 응답 지연/오류에 따라 최대값까지 자동으로 늘리고 줄이며, 실패한 요청은 재시도)
+        self.fetcher = AsyncFetcher(
+            self.session, concurrency=concurrency, rate=rate, burst=burst,
+            max_concurrency=max_concurrency, max_rate=max_rate,
+            retries=retries, target_latency=target_latency, metrics=self.metrics,
+        )
+        self.listing_url = listing_url
+        # Selenium은 브라우저 없는 목록 수집이 불가능할 때만 쓰는 선택적 경로
+        self.use_selenium = use_selenium
+        # 증분 수집: 캐시가 있으면 변경되지 않은 페이지는 파싱하지 않는다
+        self.cache = PageCache(cache_path) if cache_path else None
+        self.unchanged_urls = set()
+        # 이번 실행에서 수집·추출에 실패한 도서 (변경분에서 삭제로 보지 않음)
+        self.failed_urls = set()
+        # 수집에 실패한 목록 페이지 번호 (있으면 목록이 불완전하므로 삭제 보류)
+        self.failed_listing_pages = []
+        # 'lxml': 단일 파싱 추출기, 'soup': 기존 BeautifulSoup(html.parser) 경로
+        self.parser = parser
+        self.extractor = BookExtractor()
+        self.soup_extractor = SoupExtractor()
+        # 0이면 이벤트 루프에서 바로 파싱, 1 이상이면 별도 프로세스 풀에서 파싱
+        self.workers = workers
+        # 원본 HTML 보관소: 파서를 고친 뒤 네트워크 없이 재추출할 때 사용
+        self.archive = PageArchive(archive_dir) if archive_dir else None
+        # 지정하면 표지를 내려받아 해시 이름으로 저장하고 크기별 WebP/AVIF 변형 생성
+        self.covers_dir = covers_dir
+        self.cover_base_url = cover_base_url
+        self.cover_widths = cover_widths
+        self.cover_formats = cover_formats
+        # 지정하면 결과로 한국어 전문 검색 색인(SQLite FTS5)을 증분 갱신
+        self.search_index_path = search_index_path
+        # 필드 간 중복 문장과 사이트 공통 문구 제거, 사전 압축 저장소 생성
+        # 공통 문구 색인과 압축 사전은 전체 수집에서 만들고, 증분 수집에서는 저장된 것을 재사용
+        self.dedupe = dedupe
+        self.dedupe_index = dedupe_index
+        self.text_store_path = text_store_path
+        # 이전 스냅샷('auto'면 같은 폴더의 가장 최근 결과) 또는 books 내보내기와 비교한 변경분 출력
+        self.diff_against = diff_against
+        self.hard_delete = hard_delete
+        # 실패한 도서가 있어도 사라진 도서의 삭제 SQL을 만들지 (기본은 보류)
+        self.force_deletes = force_deletes
+        # 지정하면 ISBN/제목으로 온라인 서점 상품 링크를 찾아 채움 (캐시 경로)
+        self.bookstore_cache = bookstore_cache
+        self.bookstores = bookstores
     
     def setup_selenium_driver(self):
         """Selenium WebDriver 설정"""
+        # Selenium은 선택적 의존성이므로 필요할 때만 불러온다
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+        
         chrome_options = Options()
         chrome_options.add_argument('--headless')  # 브라우저 창 숨기기
         chrome_options.add_argument('--no-sandbox')
@@ -38,8 +135,9 @@ class GoldenRabbitCompleteScraper:
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            with self.metrics.stage('browser_startup'):
+                service = Service(ChromeDriverManager().install())
+                driver = webdriver.Chrome(service=service, options=chrome_options)
             return driver
         except Exception as e:
             print(f"❌ Chrome WebDriver 설정 실패: {e}")
@@ -50,12 +148,17 @@ class GoldenRabbitCompleteScraper:
         """Selenium으로 모든 도서 로드 (Load More 버튼 클릭)"""
         print("🚀 Selenium으로 모든 도서 로드 시작...")
         
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        
         driver = self.setup_selenium_driver()
         if not driver:
             return []
         
         try:
-            url = "https://goldenrabbit.co.kr/product-category/books/"
+            url = self.listing_url
             print(f"📚 페이지 로드: {url}")
             driver.get(url)
             
@@ -157,366 +260,784 @@ class GoldenRabbitCompleteScraper:
         finally:
             driver.quit()
     
+    def open_sink(self):
+        """결과를 기록할 JSONL 스트림 열기"""
+        if self.sink:
+            return
+        if not self.output_path:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.output_path = f"complete_goldenrabbit_books_{timestamp}.jsonl"
+        self.sink = JsonlSink(self.output_path)
+        print(f"📝 결과를 {self.output_path}에 실시간으로 기록합니다.")
+    
+    def record_book(self, book_data):
+        """추출한 도서 정보를 정규화된 레코드(가격·페이지 수 정수, ISO 출간일, ISBN-13)로 바로 기록"""
+        self.open_sink()
+        started = time.monotonic()
+        self.sink.write(BookRecord.from_dict(book_data))
+        self.metrics.observe('write_seconds', time.monotonic() - started)
+        self.metrics.incr('books_written')
+        self.book_count += 1
+    
+    def finish_book(self, book, book_data, error=None):
+        """도서 한 권의 처리 결과를 스트림과 수집 상태에 반영하고 상태 문구 반환"""
+        url = book['url']
+        error = error or self.errors.pop(url, None)
+        
+        # 구조화 데이터가 있으면 그 값을 우선하고, HTML 결과로 빈 필드만 채움
+        if book.get('base'):
+            if book_data:
+                book_data = merge_missing(book['base'], book_data)
+            elif url not in self.unchanged_urls:
+                print(f"⚠️ HTML 보완 실패, 구조화 데이터만 저장: {book['title']}")
+                book_data = book['base']
+        
+        if book_data:
+            self.record_book(book_data)
+            status, outcome = "✅ 성공", 'ok'
+        elif url in self.unchanged_urls:
+            status, outcome = "♻️ 변경 없음", 'unchanged'
+        else:
+            status, outcome = "❌ 실패", 'failed'
+        if outcome == 'failed':
+            self.failed_urls.add(url)
+        else:
+            self.failed_urls.discard(url)
+        self.metrics.incr(f'books_{outcome}')
+        self.metrics.log('book', url=url, outcome=outcome, error=str(error) if error else None)
+        
+        if self.state:
+            if status == "❌ 실패":
+                self.state.mark_failed(url, error or "추출 결과 없음")
+            else:
+                self.state.mark_done(url)
+        return status
+    
+    def load_all_books(self):
+        """브라우저 없이 카테고리 페이지를 병렬로 순회하여 모든 도서 링크 수집"""
+        print("🚀 카테고리 페이지로 모든 도서 로드 시작...")
+        
+        enumerator = ListingEnumerator(self.fetcher, self.listing_url)
+        try:
+            book_links = asyncio.run(enumerator.enumerate())
+        except Exception as e:
+            print(f"❌ 목록 페이지 수집 중 오류: {e}")
+            return []
+        
+        self.failed_listing_pages = enumerator.failed_pages
+        if self.failed_listing_pages:
+            print(f"⚠️ 목록 페이지 {', '.join(map(str, self.failed_listing_pages))}을(를) 수집하지 못해 "
+                  f"나머지 페이지의 도서만 처리합니다.")
+        print(f"🎉 총 {len(book_links)}개의 도서 링크를 수집했습니다!")
+        return book_links
+    
+    def load_structured_books(self):
+        """Store API로 도서 정보를 받아 도서 링크 목록으로 반환 (각 링크에 'base' 레코드 포함)"""
+        print("🚀 WooCommerce Store API로 도서 정보 로드 시작...")
+        
+        try:
+            books = asyncio.run(StoreApiClient(self.fetcher, self.listing_url).fetch_books())
+        except Exception as e:
+            print(f"⚠️ Store API 사용 불가 ({e}), HTML 목록 수집으로 전환합니다.")
+            return self.load_book_links()
+        
+        if not books:
+            print("⚠️ Store API에서 도서를 찾지 못해 HTML 목록 수집으로 전환합니다.")
+            return self.load_book_links()
+        
+        print(f"🎉 Store API에서 {len(books)}개의 도서 정보를 받았습니다!")
+        return [{'title': book['title'], 'url': book['url'], 'base': book} for book in books]
+    
+    def finish_structured_books(self, book_links):
+        """필수 필드가 모두 채워진 도서는 바로 기록하고, HTML 보완이 필요한 도서 링크만 반환"""
+        remaining = []
+        for book in book_links:
+            if book.get('base') and not missing_fields(book['base'], self.required_fields):
+                self.finish_book(book, book['base'])
+            else:
+                remaining.append(book)
+        
+        print(f"🧾 구조화 데이터로 완료: {len(book_links) - len(remaining)}개, HTML 보완 필요: {len(remaining)}개")
+        return remaining
+    
+    def load_book_links(self):
+        """설정에 따라 도서 링크 수집 방식 선택"""
+        if self.use_selenium:
+            return self.load_all_books_with_selenium()
+        return self.load_all_books()
+    
     def clean_text(self, text):
         """텍스트 정리"""
-        if not text:
-            return ""
-        return re.sub(r'\s+', ' ', text).strip()
+        return clean_text(text)
     
     def extract_book_detail(self, book_url, book_title):
         """도서 상세 페이지에서 모든 정보 추출"""
+        return asyncio.run(self.extract_book_detail_async(book_url, book_title))
+    
+    async def extract_book_detail_async(self, book_url, book_title):
+        """도서 상세 페이지를 비동기로 가져와 정보 추출 (레이트 리미트는 fetcher가 담당)"""
         try:
-            print(f"\n📖 도서 상세 정보 추출: {book_title}")
-            print(f"🔗 URL: {book_url}")
-            
-            # Rate limiting
-            time.sleep(random.uniform(2.0, 3.0))
-            
-            response = self.session.get(book_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 기본 정보 추출
-            book_data = {
-                'title': book_title,
-                'url': book_url,
-                'author': '',
-                'publisher': '골든래빗',
-                'publication_date': '',
-                'price': '',
-                'isbn': '',
-                'page_count': '',
-                'description': '',
-                'table_of_contents': '',
-                'publisher_review': '',
-                'testimonials': '',
-                'cover_image_url': '',
-                'category': 'IT전문서'
-            }
-            
-            # 가격 정보
-            price_selectors = [
-                '.price .woocommerce-Price-amount.amount',
-                '.price .amount',
-                'span.price .amount',
-                '.woocommerce-Price-amount',
-            ]
-            
-            for selector in price_selectors:
-                price_element = soup.select_one(selector)
-                if price_element:
-                    book_data['price'] = self.clean_text(price_element.get_text())
-                    break
-            
-            # 상품 이미지
-            image_selectors = [
-                '.woocommerce-product-gallery__image img',
-                '.product-image img',
-                '.wp-post-image',
-                'img[class*="attachment"]'
-            ]
-            
-            for selector in image_selectors:
-                img_element = soup.select_one(selector)
-                if img_element:
-                    src = img_element.get('src') or img_element.get('data-src')
-                    if src:
-                        book_data['cover_image_url'] = src
-                        break
-            
-            # 상품 정보 테이블 또는 메타 정보에서 상세 정보 추출
-            self.extract_product_meta_info(soup, book_data)
-            
-            # 상품 설명 섹션들 추출
-            self.extract_product_descriptions(soup, book_data)
-            
-            # 탭 형태의 추가 정보 추출
-            self.extract_tabbed_content(soup, book_data)
-            
-            print(f"✅ 추출 완료:")
-            print(f"  - 저자: {book_data['author']}")
-            print(f"  - 가격: {book_data['price']}")
-            print(f"  - 출간일: {book_data['publication_date']}")
-            print(f"  - ISBN: {book_data['isbn']}")
-            print(f"  - 설명 길이: {len(book_data['description'])}자")
-            print(f"  - 목차 길이: {len(book_data['table_of_contents'])}자")
-            print(f"  - 출판사 리뷰 길이: {len(book_data['publisher_review'])}자")
-            print(f"  - 추천평 길이: {len(book_data['testimonials'])}자")
+            response = await self.fetch_book_page(book_url, book_title)
+            if response is None:
+                return None
             
+            book_data = self.parse_book_detail(response.content, book_url, book_title,
+                                               header_charset(response.headers.get('Content-Type')))
+            self.remember_page(book_url, response, book_data)
             return book_data
             
         except Exception as e:
-            print(f"❌ 상세 정보 추출 오류: {e}")
+            print(f"❌ 상세 정보 추출 오류 ({book_title}): {e}")
+            self.errors[book_url] = str(e)
             return None
     
-    def extract_product_meta_info(self, soup, book_data):
-        """상품 메타 정보 추출 (저자, ISBN, 페이지 수 등)"""
-        # 다양한 메타 정보 섹션 찾기
-        meta_selectors = [
-            '.product_meta',
-            '.woocommerce-product-attributes',
-            '.additional-information table',
-            '.product-details',
-            'table.shop_attributes'
-        ]
+    async def fetch_book_page(self, book_url, book_title):
+        """상세 페이지를 가져와 응답 반환 (캐시 기준으로 변경이 없으면 None)"""
+        print(f"\n📖 도서 상세 정보 추출: {book_title}")
+        print(f"🔗 URL: {book_url}")
         
-        for meta_selector in meta_selectors:
-            meta_section = soup.select_one(meta_selector)
-            if meta_section:
-                # 테이블 형태
-                rows = meta_section.find_all('tr')
-                for row in rows:
-                    self.process_meta_row(row, book_data)
-                
-                # 정의 목록 형태 (dt, dd)
-                dt_elements = meta_section.find_all('dt')
-                dd_elements = meta_section.find_all('dd')
-                for dt, dd in zip(dt_elements, dd_elements):
-                    label = self.clean_text(dt.get_text()).lower()
-                    value = self.clean_text(dd.get_text())
-                    self.assign_meta_value(label, value, book_data)
-                
-                # span 형태 메타 정보
-                spans = meta_section.find_all('span')
-                for span in spans:
-                    text = self.clean_text(span.get_text())
-                    self.parse_meta_text(text, book_data)
-    
-    def process_meta_row(self, row, book_data):
-        """테이블 행에서 메타 정보 처리"""
-        th = row.find('th')
-        td = row.find('td')
-        
-        if th and td:
-            label = self.clean_text(th.get_text()).lower()
-            value = self.clean_text(td.get_text())
-            self.assign_meta_value(label, value, book_data)
-    
-    def assign_meta_value(self, label, value, book_data):
-        """라벨에 따라 적절한 필드에 값 할당"""
-        if not value:
-            return
+        headers = self.cache.conditional_headers(book_url) if self.cache else None
+        response = await self.fetcher.fetch(book_url, headers=headers)
         
-        if '저자' in label or 'author' in label:
-            book_data['author'] = value
-        elif 'isbn' in label:
-            book_data['isbn'] = value
-        elif '페이지' in label or 'page' in label:
-            book_data['page_count'] = value
-        elif '출간' in label or 'publish' in label or '발행' in label:
-            book_data['publication_date'] = value
-        elif '크기' in label or '판형' in label or 'size' in label:
-            book_data['size'] = value
-    
-    def parse_meta_text(self, text, book_data):
-        """일반 텍스트에서 메타 정보 파싱"""
-        # "저자 : 홍길동" 형태
-        if ':' in text:
-            parts = text.split(':', 1)
-            if len(parts) == 2:
-                label = self.clean_text(parts[0]).lower()
-                value = self.clean_text(parts[1])
-                self.assign_meta_value(label, value, book_data)
-    
-    def extract_product_descriptions(self, soup, book_data):
-        """상품 설명 섹션들 추출"""
-        # 짧은 설명
-        short_desc_selectors = [
-            '.woocommerce-product-details__short-description',
-            '.product-short-description',
-            '.entry-summary .product-excerpt'
-        ]
+        if self.cache and response.status_code == 304:
+            print(f"♻️ 변경 없음 (304): {book_title}")
+            self.cache.touch(book_url)
+            self.unchanged_urls.add(book_url)
+            return None
         
-        for selector in short_desc_selectors:
-            element = soup.select_one(selector)
-            if element:
-                text = self.clean_text(element.get_text())
-                if text and len(text) > len(book_data['description']):
-                    book_data['description'] = text
-                break
-    
-    def extract_tabbed_content(self, soup, book_data):
-        """탭 형태의 콘텐츠 추출 (설명, 목차, 리뷰 등)"""
-        # WooCommerce 탭 구조
-        tab_selectors = [
-            '#tab-description',
-            '#tab-reviews',
-            '#tab-additional_information',
-            '.woocommerce-Tabs-panel--description',
-            '.woocommerce-Tabs-panel--additional_information',
-            '.woocommerce-Tabs-panel--reviews'
-        ]
+        response.raise_for_status()
         
-        for selector in tab_selectors:
-            tab_content = soup.select_one(selector)
-            if tab_content:
-                text = self.clean_text(tab_content.get_text())
-                
-                if 'description' in selector and text:
-                    if len(text) > len(book_data['description']):
-                        book_data['description'] = text
-                elif 'review' in selector and text:
-                    book_data['testimonials'] = text
+        if self.archive:
+            self.archive.save(book_url, book_title, response.content,
+                              header_charset(response.headers.get('Content-Type')))
         
-        # 커스텀 탭들 찾기
-        self.extract_custom_tabs(soup, book_data)
-    
-    def extract_custom_tabs(self, soup, book_data):
-        """커스텀 탭 또는 아코디언 형태의 콘텐츠 추출"""
-        # 한국어 키워드로 섹션 찾기
-        keywords_map = {
-            '목차': 'table_of_contents',
-            '차례': 'table_of_contents',
-            '출판사': 'publisher_review',
-            '출판사리뷰': 'publisher_review',
-            '출판사 리뷰': 'publisher_review',
-            '추천': 'testimonials',
-            '추천평': 'testimonials',
-            '서평': 'testimonials',
-            '리뷰': 'testimonials',
-            '책소개': 'description',
-            '내용': 'description',
-            '소개': 'description'
-        }
-        
-        # 헤딩 태그들 확인
-        headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        for heading in headings:
-            heading_text = self.clean_text(heading.get_text()).lower()
-            
-            for keyword, field in keywords_map.items():
-                if keyword in heading_text:
-                    # 헤딩 다음의 콘텐츠 찾기
-                    content = self.get_content_after_heading(heading)
-                    if content and len(content) > len(book_data.get(field, '')):
-                        book_data[field] = content
-                    break
+        if self.cache:
+            body_hash = PageCache.hash_body(response.content)
+            if self.cache.is_unchanged(book_url, body_hash):
+                print(f"♻️ 변경 없음 (동일 본문): {book_title}")
+                self.cache.store(book_url, response, body_hash)
+                self.unchanged_urls.add(book_url)
+                return None
         
-        # div 클래스명으로 찾기
-        div_classes = soup.find_all('div', class_=True)
-        for div in div_classes:
-            class_text = ' '.join(div.get('class', [])).lower()
-            
-            for keyword, field in keywords_map.items():
-                if keyword in class_text:
-                    content = self.clean_text(div.get_text())
-                    if content and len(content) > len(book_data.get(field, '')):
-                        book_data[field] = content
-                    break
+        return response
+    
+    def remember_page(self, book_url, response, book_data):
+        """파싱에 성공한 경우에만 캐시 갱신 (실패한 페이지는 다음 실행에서 다시 시도)"""
+        if self.cache and book_data:
+            self.cache.store(book_url, response, PageCache.hash_body(response.content))
     
-    def get_content_after_heading(self, heading):
-        """헤딩 태그 다음의 콘텐츠 추출"""
-        content_parts = []
-        current = heading.next_sibling
-        
-        while current and len(content_parts) < 5:  # 최대 5개 요소까지
-            if hasattr(current, 'get_text'):
-                text = self.clean_text(current.get_text())
-                if text:
-                    content_parts.append(text)
-            elif isinstance(current, str):
-                text = self.clean_text(current)
-                if text:
-                    content_parts.append(text)
+    def parse_book_detail(self, html, book_url, book_title, encoding=None):
+        """상세 페이지 HTML에서 모든 정보 추출 (encoding: 응답 헤더의 charset)"""
+        try:
+            started = time.monotonic()
+            if self.parser == 'soup':
+                book_data = self.extract_with_soup(html, book_url, book_title, encoding)
+            else:
+                book_data = self.extractor.extract(html, book_url, book_title, encoding)
+            elapsed = time.monotonic() - started
+            self.metrics.observe('parse_seconds', elapsed)
+            self.metrics.log('parse', url=book_url, seconds=round(elapsed, 4), ok=True)
             
-            current = current.next_sibling
+            self.print_book_summary(book_data)
+            return book_data
             
-            # 다른 헤딩을 만나면 중단
-            if current and hasattr(current, 'name') and current.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                break
-        
-        return ' '.join(content_parts)
+        except Exception as e:
+            print(f"❌ 상세 정보 추출 오류: {e}")
+            return None
+    
+    def print_book_summary(self, book_data):
+        """추출한 도서 정보 요약 출력"""
+        print(f"✅ 추출 완료: {book_data['title']}")
+        print(f"  - 저자: {book_data['author']}")
+        print(f"  - 가격: {book_data['price']}")
+        print(f"  - 출간일: {book_data['publication_date']}")
+        print(f"  - ISBN: {book_data['isbn']}")
+        print(f"  - 설명 길이: {len(book_data['description'])}자")
+        print(f"  - 목차 길이: {len(book_data['table_of_contents'])}자")
+        print(f"  - 출판사 리뷰 길이: {len(book_data['publisher_review'])}자")
+        print(f"  - 추천평 길이: {len(book_data['testimonials'])}자")
+    
+    def extract_with_soup(self, html, book_url, book_title, encoding=None):
+        """BeautifulSoup(html.parser)으로 상세 페이지 정보 추출"""
+        return self.soup_extractor.extract(html, book_url, book_title, encoding)
+    
+    def extract_custom_tabs(self, soup, book_data):
+        """커스텀 탭 또는 아코디언 형태의 콘텐츠 추출 (BeautifulSoup 트리)"""
+        self.soup_extractor.extract_custom_tabs(soup, book_data)
     
     def scrape_all_books(self):
         """모든 도서 정보 스크래핑"""
         print("🚀 골든래빗 완전 스크래핑 시작!")
         print("="*60)
         
-        # 1. Selenium으로 모든 도서 링크 수집
-        book_links = self.load_all_books_with_selenium()
-        
-        if not book_links:
-            print("❌ 도서 링크를 수집할 수 없습니다.")
-            return
+        # 1. 모든 도서 링크 수집 (이전 수집 상태가 있으면 남은 도서만 이어서 처리)
+        if self.state and self.state.has_links():
+            book_links = self.resume_links()
+            if not book_links:
+                return
+        else:
+            with self.metrics.stage('listing'):
+                book_links = self.load_structured_books() if self.structured else self.load_book_links()
+            
+            if not book_links:
+                print("❌ 도서 링크를 수집할 수 없습니다.")
+                return
+            
+            if self.state:
+                self.state.add_links(book_links)
         
         print(f"\n📚 총 {len(book_links)}개 도서의 상세 정보를 추출합니다...")
         print("="*60)
+        self.open_sink()
+        if self.state:
+            self.state.set_meta('output_path', self.output_path)
+        
+        if self.structured:
+            book_links = self.finish_structured_books(book_links)
+        
+        # 2. 각 도서의 상세 정보를 동시에 추출
+        started = time.monotonic()
+        with self.metrics.stage('details'):
+            if self.workers:
+                asyncio.run(self.extract_all_book_details_pipelined(book_links))
+            else:
+                asyncio.run(self.extract_all_book_details(book_links))
+        print(f"\n⏱️ 상세 정보 추출 소요 시간: {time.monotonic() - started:.1f}초")
+        
+        if self.cache:
+            print(f"♻️ 변경 없는 도서: {len(self.unchanged_urls)}개, 변경된 도서: {self.book_count}개")
+        
+        if self.state:
+            self.print_state_summary()
+        
+        # 3. 결과 마무리 (캐시 사용 시 변경된 도서만 기록됨)
+        self.save_results()
+    
+    def resume_links(self):
+        """이전 수집 상태에서 아직 끝나지 않은 도서 링크 반환"""
+        counts = self.state.counts()
+        print(f"🔁 이전 수집 이어서 진행: 완료 {counts['done']}개, "
+              f"대기 {counts['pending']}개, 실패 {counts['failed']}개")
+        
+        # 같은 JSONL에 이어서 기록
+        if not self.output_path:
+            self.output_path = self.state.get_meta('output_path')
+        
+        book_links = self.state.remaining_links()
+        if not book_links:
+            print("✅ 남은 도서가 없습니다. 새로 수집하려면 --restart 옵션을 사용하세요.")
+            self.print_state_summary()
+        return book_links
+    
+    def print_state_summary(self):
+        """수집 상태 요약과 재시도 한도를 넘긴 URL 출력"""
+        counts = self.state.counts()
+        print(f"🗂️ 수집 상태: 완료 {counts['done']}개, 대기 {counts['pending']}개, 실패 {counts['failed']}개")
+        for url, error in self.state.exhausted():
+            print(f"  ⛔ 재시도 한도 초과: {url} ({error})")
+    
+    async def extract_all_book_details(self, book_links):
+        """모든 도서 상세 페이지를 동시성 제한 내에서 병렬로 추출 (결과는 즉시 스트림에 기록)"""
+        total = len(book_links)
+        done = 0
         
-        # 2. 각 도서의 상세 정보 추출
-        for i, book in enumerate(book_links, 1):
+        async def extract_one(book):
+            nonlocal done
+            error = None
             try:
-                print(f"\n[{i}/{len(book_links)}] 진행률: {i/len(book_links)*100:.1f}%")
-                
-                book_data = self.extract_book_detail(book['url'], book['title'])
-                
-                if book_data:
-                    self.book_count += 1
-                    self.books_data[f"book_{self.book_count}"] = book_data
-                    print(f"✅ 성공: {book_data['title']}")
-                else:
-                    print(f"❌ 실패: {book['title']}")
-                    
+                book_data = await self.extract_book_detail_async(book['url'], book['title'])
             except Exception as e:
                 print(f"❌ 오류 ({book['title']}): {e}")
+                book_data, error = None, e
+            
+            done += 1
+            status = self.finish_book(book, book_data, error)
+            print(f"[{done}/{total}] 진행률: {done/total*100:.1f}% - {status}: {book['title']}")
+        
+        await asyncio.gather(*(extract_one(book) for book in book_links))
+    
+    async def extract_all_book_details_pipelined(self, book_links):
+        """수집과 파싱을 분리해, 파싱은 프로세스 풀에서 모든 코어로 수행"""
+        total = len(book_links)
+        responses = {}
+        done = 0
+        
+        async def fetch_page(index):
+            book = book_links[index]
+            response = await self.fetch_book_page(book['url'], book['title'])
+            if response is None:
+                return None
+            responses[index] = response
+            return response.content, book['url'], book['title'], header_charset(response.headers.get('Content-Type'))
+        
+        def on_result(index, book_data, error):
+            nonlocal done
+            book = book_links[index]
+            response = responses.pop(index, None)
+            
+            done += 1
+            if book_data:
+                self.print_book_summary(book_data)
+                self.remember_page(book['url'], response, book_data)
+            status = self.finish_book(book, book_data, error)
+            print(f"[{done}/{total}] 진행률: {done/total*100:.1f}% - {status}: {book['title']}")
+        
+        pipeline = ParsePipeline(workers=self.workers, parser=self.parser, metrics=self.metrics)
+        await pipeline.run(range(total), fetch_page, on_result)
+    
+    def reextract_archive(self, archive_dir):
+        """보관된 원본 HTML에서 네트워크 없이 모든 도서 정보를 병렬로 재추출"""
+        print(f"🗄️ 보관소에서 재추출 시작: {archive_dir}")
+        print("="*60)
+        
+        archive = PageArchive(archive_dir)
+        entries = archive.entries()
+        if not entries:
+            print("❌ 보관된 페이지가 없습니다.")
+            return
+        
+        workers = self.workers or default_workers()
+        print(f"📚 총 {len(entries)}개 페이지를 {workers}개 프로세스로 재추출합니다...")
+        
+        started = time.monotonic()
+        self.open_sink()
+        try:
+            with self.metrics.stage('reextract'), ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(
+                    parse_archived_page,
+                    repeat(archive_dir),
+                    entries,
+                    repeat(self.parser),
+                    chunksize=max(1, len(entries) // (workers * 4)),
+                )
+                for entry, book_data, error in results:
+                    if error:
+                        print(f"❌ 재추출 오류 ({entry['title']}): {error}")
+                    self.finish_book(entry, book_data, error)
+        finally:
+            if self.sink:
+                self.sink.close()
+                self.sink = None
+        print(f"⏱️ 재추출 소요 시간: {time.monotonic() - started:.1f}초")
+        if self.failed_urls:
+            print(f"⚠️ 재추출 실패: {len(self.failed_urls)}개 (성공 {self.book_count}개)")
         
-        # 3. 결과 저장
         self.save_results()
     
     def save_results(self):
-        """결과를 JSON 파일로 저장"""
-        if not self.books_data:
-            print("❌ 저장할 데이터가 없습니다.")
+        """JSONL 스트림을 닫고, 설정에 따라 기존 형식의 JSON으로 정리"""
+        if self.sink:
+            self.sink.close()
+            self.sink = None
+        
+        # --state로 이어서 수집하면 이전 실행에서 기록한 도서도 같은 JSONL에 있으므로
+        # 이번 실행의 성공 수가 아니라 파일의 도서 수로 판단
+        self.record_count = count_jsonl(self.output_path)
+        if not self.record_count:
+            if self.unchanged_urls:
+                print("✅ 변경된 도서가 없습니다.")
+                if self.diff_against:
+                    self.write_changefeed()
+            else:
+                print("❌ 저장할 데이터가 없습니다.")
             return
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"complete_goldenrabbit_books_{timestamp}.json"
+        print(f"\n🎉 스크래핑 완료!")
+        print(f"📊 총 {self.book_count}개의 도서 정보를 수집했습니다.")
+        if self.record_count != self.book_count:
+            print(f"📄 이전 실행에서 기록한 도서를 포함해 결과 파일에 {self.record_count}개 도서가 있습니다.")
+        print(f"💾 결과가 {self.output_path}에 저장되었습니다.")
         
+        if self.covers_dir:
+            self.download_covers()
+        
+        if self.bookstore_cache:
+            self.fill_bookstore_links()
+        
+        if self.dedupe:
+            self.dedupe_results()
+        
+        if self.compact:
+            json_path = re.sub(r'\.jsonl$', '', self.output_path) + '.json'
+            try:
+                with self.metrics.stage('compact'):
+                    compact_jsonl(self.output_path, json_path)
+                print(f"💾 정리된 JSON: {json_path}")
+            except Exception as e:
+                print(f"❌ 파일 저장 오류: {e}")
+        
+        if self.sql_format:
+            sql_path = re.sub(r'\.jsonl$', '', self.output_path) + f'.{self.sql_format}.sql'
+            try:
+                with self.metrics.stage('sql'):
+                    write_sql(iter_jsonl(self.output_path), sql_path, self.sql_format)
+                print(f"💾 적재 SQL: {sql_path}")
+            except Exception as e:
+                print(f"❌ SQL 저장 오류: {e}")
+        
+        if self.diff_against:
+            self.write_changefeed()
+        
+        if self.search_index_path:
+            self.update_search_index()
+        
+        if self.text_store_path:
+            self.write_text_store()
+        
+        # 통계 출력
+        self.print_statistics()
+    
+    def download_covers(self):
+        """표지를 내려받아 변형을 만들고 JSONL의 도서 정보에 변형 URL 추가"""
+        downloader = CoverDownloader(
+            self.fetcher, self.covers_dir, base_url=self.cover_base_url,
+            widths=self.cover_widths, formats=self.cover_formats, workers=self.workers or None,
+        )
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.books_data, f, ensure_ascii=False, indent=2)
-            
-            print(f"\n🎉 스크래핑 완료!")
-            print(f"📊 총 {len(self.books_data)}개의 도서 정보를 수집했습니다.")
-            print(f"💾 결과가 {filename}에 저장되었습니다.")
-            
-            # 통계 출력
-            self.print_statistics()
-            
+            with self.metrics.stage('covers'):
+                asyncio.run(downloader.process_jsonl(self.output_path))
+            downloader.print_stats()
+        except Exception as e:
+            print(f"❌ 표지 처리 오류: {e}")
+        finally:
+            downloader.close()
+    
+    def fill_bookstore_links(self):
+        """비어 있는 온라인 서점 링크를 서점별 리졸버로 찾아 JSONL의 도서 정보에 채움"""
+        cache = None
+        try:
+            cache = LinkCache(self.bookstore_cache)
+            enricher = BookstoreEnricher(fetcher_fetch(self.fetcher), cache, self.bookstores)
+            enricher.configure_limits(self.fetcher)
+            with self.metrics.stage('bookstores'):
+                asyncio.run(enricher.process_jsonl(self.output_path))
+            enricher.print_stats()
+        except Exception as e:
+            print(f"❌ 서점 링크 처리 오류: {e}")
+        finally:
+            if cache:
+                cache.close()
+    
+    def is_partial_run(self):
+        """변경 없는 도서를 건너뛰어 결과 JSONL에 일부 도서만 있는 실행인지"""
+        return bool(self.unchanged_urls)
+    
+    def dedupe_results(self):
+        """JSONL에서 필드 간 중복 문장과 여러 도서에 반복되는 공통 문구 제거
+        
+        공통 문구는 전체 말뭉치 기준으로 판단해야 하므로, 증분 수집에서는 전체 수집 때
+        저장한 색인(--dedupe-index)을 쓰고, 색인이 없으면 공통 문구 제거를 건너뛴다.
+        """
+        try:
+            with self.metrics.stage('dedupe'):
+                boilerplate_ratio, boilerplate = 0.2, None
+                if self.is_partial_run():
+                    boilerplate = BoilerplateIndex.load(self.dedupe_index) if self.dedupe_index else None
+                    if boilerplate is None:
+                        print("⚠️ 증분 수집이라 저장된 공통 문구 색인(--dedupe-index) 없이는 "
+                              "공통 문구를 판단할 수 없어, 도서 안의 중복 문장만 제거합니다.")
+                        boilerplate_ratio = 0
+                elif self.dedupe_index:
+                    boilerplate = BoilerplateIndex.from_books(iter_jsonl(self.output_path))
+                    boilerplate.save(self.dedupe_index)
+                stats = dedupe_jsonl(self.output_path, boilerplate_ratio, boilerplate=boilerplate)
+            print(f"🧹 중복 텍스트 {stats['chars_removed']:,}자 제거: "
+                  f"{stats['bytes_before'] / 1024:.0f}KB → {stats['bytes_after'] / 1024:.0f}KB")
+        except Exception as e:
+            print(f"❌ 중복 제거 오류: {e}")
+    
+    def write_text_store(self):
+        """도서별 JSON을 말뭉치 사전으로 압축한 저장소 생성
+        
+        증분 수집에서는 바뀐 도서 몇 권으로 사전을 다시 만들지 않고 기존 사전으로 압축한다.
+        """
+        store = TextStore(self.text_store_path)
+        try:
+            partial = self.is_partial_run()
+            if partial and store.latest_dictionary() is None:
+                print("⚠️ 증분 수집이라 새 사전을 만들지 않는데 저장소에 사전이 없어 압축 저장을 건너뜁니다.")
+                return
+            with self.metrics.stage('text_store'):
+                raw_bytes, stored_bytes = store.write_books(iter_jsonl(self.output_path), train=not partial)
+            print(f"🗜️ 사전 압축 저장소 {self.text_store_path}: "
+                  f"{raw_bytes / 1024:.0f}KB → {stored_bytes / 1024:.0f}KB")
+        except Exception as e:
+            print(f"❌ 압축 저장소 오류: {e}")
+        finally:
+            store.close()
+    
+    def write_changefeed(self):
+        """이전 스냅샷과 비교해 변경 피드(JSONL)와 바뀐 컬럼만 고치는 SQL 저장
+        
+        비교가 끝나면 이전 자료에 변경 피드를 적용해 비교 기준 파일(books_baseline.jsonl)을
+        갱신한다. 증분 수집 결과에는 바뀐 도서만 있으므로 'auto'는 이 파일과 비교한다.
+        """
+        previous = self.diff_against
+        baseline = baseline_path(self.output_path)
+        if previous == 'auto':
+            if not os.path.exists(baseline) and self.is_partial_run():
+                # 이전 결과 파일도 증분 수집 결과일 수 있어 전체 도서와 비교할 수 없음
+                print("⚠️ 증분 수집인데 비교 기준 파일이 없어 변경분을 만들지 않습니다. "
+                      "--diff-against로 books 테이블 내보내기나 전체 결과를 한 번 지정하세요.")
+                return
+            previous = previous_snapshot(self.output_path)
+            if not previous:
+                print("⚠️ 비교할 이전 스냅샷이 없어 변경분을 만들지 않습니다.")
+                if self.record_count and not self.is_partial_run():
+                    # 첫 전체 수집 결과를 다음 실행의 비교 기준으로
+                    count = update_baseline(self.output_path, None, baseline)
+                    print(f"💾 비교 기준 {baseline} 생성 ({count}개 도서)")
+                return
+        
+        stem = re.sub(r'\.jsonl$', '', self.output_path)
+        feed_path, sql_path = stem + '.changes.jsonl', stem + '.changes.sql'
+        # 증분 수집에서 건너뛴 도서는 변경 없음으로, 실패했거나 아직 끝나지 않은 도서는
+        # 상태를 알 수 없는 것으로 보고 삭제 대상에서 제외
+        failed = set(self.failed_urls)
+        if self.state:
+            failed.update(self.state.unfinished_urls())
+        present_ids = {book_id({'url': url}) for url in self.unchanged_urls | failed}
+        # 실패한 도서나 목록 페이지가 있으면 목록 자체가 불완전할 수 있으므로 삭제는 보류 (--force-deletes로 강제)
+        allow_deletes = self.force_deletes or not (failed or self.failed_listing_pages)
+        try:
+            with self.metrics.stage('diff'):
+                snapshot = Snapshot(load_rows(previous))
+                books = iter_jsonl(self.output_path) if self.record_count else []
+                counts = write_changes(diff_books(snapshot, books, present_ids), feed_path, sql_path,
+                                       self.hard_delete, allow_deletes,
+                                       None if self.force_deletes else max_deletes(snapshot))
+                baseline_count = update_baseline(previous, feed_path, baseline)
+            print(f"🔀 {previous} 대비 추가 {counts['insert']}개, 변경 {counts['update']}개, "
+                  f"삭제 {counts['delete']}개")
+            if counts['held']:
+                if self.failed_listing_pages:
+                    reason = f"목록 페이지 {len(self.failed_listing_pages)}개를 수집하지 못해"
+                elif failed:
+                    reason = f"실패한 도서 {len(failed)}개가 있어"
+                else:
+                    reason = "이전 도서의 절반 넘게 사라져"
+                print(f"⚠️ {reason} 삭제 {counts['held']}개를 보류했습니다 "
+                      f"(변경 피드의 held 이벤트 확인 후 --force-deletes로 다시 실행).")
+            print(f"💾 변경 피드: {feed_path}, 변경분 SQL: {sql_path}")
+            print(f"💾 비교 기준 {baseline} 갱신 ({baseline_count}개 도서)")
+        except Exception as e:
+            print(f"❌ 변경분 생성 오류: {e}")
+    
+    def update_search_index(self):
+        """이번에 기록한 도서로 검색 색인 갱신 (바뀐 도서만 다시 색인)"""
+        index = SearchIndex(self.search_index_path)
+        try:
+            with self.metrics.stage('search_index'):
+                counts = index.index_books(iter_jsonl(self.output_path))
+                index.optimize()
+            print(f"🔎 검색 색인 {self.search_index_path}: 추가 {counts['added']}개, "
+                  f"갱신 {counts['updated']}개, 변경 없음 {counts['unchanged']}개")
         except Exception as e:
-            print(f"❌ 파일 저장 오류: {e}")
+            print(f"❌ 검색 색인 오류: {e}")
+        finally:
+            index.close()
+    
+    def finish_metrics(self):
+        """측정 결과 요약 출력 및 저장"""
+        self.fetcher.print_stats()
+        self.metrics.print_summary()
+        if self.metrics_path:
+            self.metrics.write(self.metrics_path)
+            print(f"📈 측정 결과: {self.metrics_path}")
+    
+    def profile_url(self, book_url, profiler='cprofile', output=None):
+        """상품 페이지 하나의 수집·추출을 프로파일링"""
+        print(f"🔬 프로파일링: {book_url} ({profiler})")
+        book_data = profile_call(self.extract_book_detail, book_url, book_url, profiler=profiler, output=output)
+        if book_data is None:
+            print("❌ 추출 결과가 없습니다.")
+        return book_data
     
-    def print_statistics(self):
-        """수집 통계 출력"""
-        if not self.books_data:
+    def print_statistics(self, path=None):
+        """수집 통계 출력 (JSONL 스트림을 한 번 읽으며 집계)"""
+        path = path or self.output_path
+        if not path:
             return
         
-        print(f"\n📈 수집 통계:")
+        fields = [
+            ('author', '저자 정보'),
+            ('price', '가격 정보'),
+            ('isbn', 'ISBN 정보'),
+            ('description', '책 소개'),
+            ('table_of_contents', '목차'),
+            ('publisher_review', '출판사 리뷰'),
+            ('testimonials', '추천평'),
+        ]
         
-        # 기본 통계
-        total_books = len(self.books_data)
-        books_with_author = sum(1 for book in self.books_data.values() if book.get('author'))
-        books_with_price = sum(1 for book in self.books_data.values() if book.get('price'))
-        books_with_isbn = sum(1 for book in self.books_data.values() if book.get('isbn'))
-        books_with_description = sum(1 for book in self.books_data.values() if book.get('description'))
-        books_with_toc = sum(1 for book in self.books_data.values() if book.get('table_of_contents'))
-        books_with_review = sum(1 for book in self.books_data.values() if book.get('publisher_review'))
-        books_with_testimonials = sum(1 for book in self.books_data.values() if book.get('testimonials'))
+        total_books = 0
+        counts = {field: 0 for field, _ in fields}
+        for book in iter_jsonl(path):
+            total_books += 1
+            for field, _ in fields:
+                if book.get(field):
+                    counts[field] += 1
         
+        if not total_books:
+            return
+        
+        print(f"\n📈 수집 통계:")
         print(f"  - 총 도서 수: {total_books}")
-        print(f"  - 저자 정보: {books_with_author}/{total_books} ({books_with_author/total_books*100:.1f}%)")
-        print(f"  - 가격 정보: {books_with_price}/{total_books} ({books_with_price/total_books*100:.1f}%)")
-        print(f"  - ISBN 정보: {books_with_isbn}/{total_books} ({books_with_isbn/total_books*100:.1f}%)")
-        print(f"  - 책 소개: {books_with_description}/{total_books} ({books_with_description/total_books*100:.1f}%)")
-        print(f"  - 목차: {books_with_toc}/{total_books} ({books_with_toc/total_books*100:.1f}%)")
-        print(f"  - 출판사 리뷰: {books_with_review}/{total_books} ({books_with_review/total_books*100:.1f}%)")
-        print(f"  - 추천평: {books_with_testimonials}/{total_books} ({books_with_testimonials/total_books*100:.1f}%)")
+        for field, label in fields:
+            print(f"  - {label}: {counts[field]}/{total_books} ({counts[field]/total_books*100:.1f}%)")
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="골든래빗 도서 정보 스크래퍼")
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help="동시에 가져올 상세 페이지 수 (기본값: 4)")
+    parser.add_argument('--rate', type=float, default=2.0,
+                        help="호스트별 초당 최대 요청 수, 0이면 제한 없음 (기본값: 2.0)")
+    parser.add_argument('--burst', type=int, default=None,
+                        help="토큰 버킷 최대 버스트 크기 (기본값: concurrency)")
+    parser.add_argument('--max-concurrency', type=int, default=None,
+                        help="서버가 빠르게 응답할 때 늘릴 수 있는 최대 동시 요청 수 (기본값: concurrency x 2)")
+    parser.add_argument('--max-rate', type=float, default=None,
+                        help="서버가 빠르게 응답할 때 늘릴 수 있는 최대 초당 요청 수 (기본값: rate x 2)")
+    parser.add_argument('--retries', type=int, default=3,
+                        help="429/5xx/네트워크 오류 시 요청별 재시도 횟수 (기본값: 3)")
+    parser.add_argument('--target-latency', type=float, default=2.0,
+                        help="이보다 느린 응답은 과부하로 보고 요청 속도를 줄임 (초, 기본값: 2.0)")
+    parser.add_argument('--listing-url', default=LISTING_URL,
+                        help="도서 카테고리 목록 URL")
+    parser.add_argument('--selenium', action='store_true',
+                        help="목록 수집에 Selenium(Load More 클릭)을 사용")
+    parser.add_argument('--cache', default=None,
+                        help="증분 수집용 페이지 캐시(SQLite) 경로, 지정하면 변경된 도서만 저장")
+    parser.add_argument('--parser', choices=['lxml', 'soup'], default='lxml',
+                        help="상세 페이지 추출 엔진 (기본값: lxml 단일 파싱)")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="파싱 전용 프로세스 수, 0이면 수집과 같은 프로세스에서 파싱 (기본값: 0)")
+    parser.add_argument('--archive', default=None,
+                        help="수집한 상품 페이지 원본을 압축 보관할 디렉터리")
+    parser.add_argument('--reextract', metavar='ARCHIVE', default=None,
+                        help="네트워크 없이 보관소의 페이지에서 도서 정보를 다시 추출")
+    parser.add_argument('--output', default=None,
+                        help="결과 JSONL 경로 (기본값: complete_goldenrabbit_books_<시각>.jsonl)")
+    parser.add_argument('--no-compact', action='store_true',
+                        help="종료 시 JSONL을 보기 좋은 JSON으로 정리하지 않음")
+    parser.add_argument('--state', default=None,
+                        help="재시작 가능한 수집 상태(SQLite) 경로, 다시 실행하면 남은 도서만 처리")
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help="도서별 최대 시도 횟수 (기본값: 3)")
+    parser.add_argument('--sql', choices=['insert', 'copy'], default=None,
+                        help="books 테이블 적재 SQL도 생성 (insert: 다중 행 upsert, copy: COPY 후 upsert)")
+    parser.add_argument('--structured', action='store_true',
+                        help="WooCommerce Store API로 도서 정보를 먼저 받고 빠진 필드만 HTML로 보완")
+    parser.add_argument('--require-fields', default=','.join(DEFAULT_REQUIRED_FIELDS),
+                        help="--structured에서 비어 있으면 HTML로 보완할 필드 (쉼표 구분, "
+                             "예: table_of_contents 추가 시 모든 상세 페이지 요청)")
+    parser.add_argument('--covers', default=None,
+                        help="표지를 내려받아 크기별 WebP/AVIF 변형을 만들 디렉터리 (예: public/covers)")
+    parser.add_argument('--cover-base-url', default='/covers',
+                        help="표지 변형의 공개 URL 경로 (기본값: /covers)")
+    parser.add_argument('--cover-widths', default=','.join(map(str, DEFAULT_WIDTHS)),
+                        help="표지 변형 너비 목록 (기본값: 160,320,640)")
+    parser.add_argument('--cover-formats', default=','.join(DEFAULT_FORMATS),
+                        help="표지 변형 형식 목록 (기본값: webp,avif)")
+    parser.add_argument('--bookstore-links', default=None,
+                        help="온라인 서점 상품 링크를 찾아 채우고 ISBN별 결과를 이 SQLite 파일에 캐시")
+    parser.add_argument('--bookstores', default=','.join(RESOLVERS),
+                        help=f"--bookstore-links로 찾을 서점 목록 (기본값: {','.join(RESOLVERS)})")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="필드 간 중복 문장과 여러 도서에 반복되는 사이트 공통 문구 제거")
+    parser.add_argument('--dedupe-index', default=None,
+                        help="--dedupe의 공통 문구 색인(SQLite) 경로: 전체 수집에서 저장하고 증분 수집에서 재사용")
+    parser.add_argument('--text-store', default=None,
+                        help="도서별 JSON을 말뭉치 사전으로 압축한 저장소(SQLite) 경로")
+    parser.add_argument('--diff-against', default=None,
+                        help="이전 결과 또는 books 테이블 내보내기(CSV/JSON)와 비교해 변경 피드와 "
+                             "최소 변경 SQL 생성 ('auto'면 같은 폴더의 가장 최근 결과)")
+    parser.add_argument('--hard-delete', action='store_true',
+                        help="--diff-against에서 사라진 도서를 비활성화하지 않고 DELETE")
+    parser.add_argument('--force-deletes', action='store_true',
+                        help="--diff-against에서 실패한 도서가 있거나 이전 도서의 절반 넘게 사라져도 "
+                             "사라진 도서의 삭제 SQL 생성")
+    parser.add_argument('--search-index', default=None,
+                        help="결과로 갱신할 한국어 전문 검색 색인(SQLite FTS5) 경로")
+    parser.add_argument('--metrics', default=None,
+                        help="측정 결과 저장 경로 (.prom이면 Prometheus textfile, 그 외 JSON 요약)")
+    parser.add_argument('--log-json', default=None,
+                        help="요청·파싱·재시도·단계 이벤트를 한 줄씩 기록할 JSONL 구조화 로그 경로")
+    parser.add_argument('--profile-url', default=None,
+                        help="상품 페이지 하나만 수집·추출하며 프로파일링")
+    parser.add_argument('--profiler', choices=['cprofile', 'pyinstrument'], default='cprofile',
+                        help="--profile-url에 사용할 프로파일러 (기본값: cprofile)")
+    parser.add_argument('--profile-output', default=None,
+                        help="프로파일 결과 저장 경로 (cProfile: .prof, pyinstrument: HTML)")
+    parser.add_argument('--restart', action='store_true',
+                        help="저장된 수집 상태를 지우고 처음부터 수집")
+    args = parser.parse_args()
+
+    unknown = [name for name in parse_list(args.bookstores) if name not in RESOLVERS]
+    if unknown:
+        parser.error(f"알 수 없는 서점: {', '.join(unknown)} (사용 가능: {', '.join(RESOLVERS)})")
+    return args
 
 
 def main():
     """메인 실행 함수"""
-    scraper = GoldenRabbitCompleteScraper()
-    scraper.scrape_all_books()
+    args = parse_args()
+    scraper = GoldenRabbitCompleteScraper(
+        concurrency=args.concurrency,
+        rate=args.rate,
+        burst=args.burst,
+        max_concurrency=args.max_concurrency,
+        max_rate=args.max_rate,
+        retries=args.retries,
+        target_latency=args.target_latency,
+        listing_url=args.listing_url,
+        use_selenium=args.selenium,
+        cache_path=args.cache,
+        parser=args.parser,
+        workers=args.workers,
+        archive_dir=args.archive,
+        output_path=args.output,
+        compact=not args.no_compact,
+        state_path=args.state,
+        max_attempts=args.max_attempts,
+        sql_format=args.sql,
+        structured=args.structured,
+        required_fields=[field.strip() for field in args.require_fields.split(',') if field.strip()],
+        covers_dir=args.covers,
+        cover_base_url=args.cover_base_url,
+        cover_widths=parse_list(args.cover_widths, int),
+        cover_formats=parse_list(args.cover_formats),
+        metrics_path=args.metrics,
+        log_json_path=args.log_json,
+        search_index_path=args.search_index,
+        dedupe=args.dedupe,
+        dedupe_index=args.dedupe_index,
+        text_store_path=args.text_store,
+        diff_against=args.diff_against,
+        hard_delete=args.hard_delete,
+        force_deletes=args.force_deletes,
+        bookstore_cache=args.bookstore_links,
+        bookstores=parse_list(args.bookstores),
+    )
+    if scraper.state and args.restart:
+        scraper.state.reset()
+    try:
+        if args.profile_url:
+            scraper.profile_url(args.profile_url, args.profiler, args.profile_output)
+            return
+        if args.reextract:
+            scraper.reextract_archive(args.reextract)
+        else:
+            scraper.scrape_all_books()
+        scraper.finish_metrics()
+    finally:
+        scraper.metrics.close()
+        scraper.fetcher.close()
+        if scraper.cache:
+            scraper.cache.close()
+        if scraper.state:
+            scraper.state.close()
 
 
 if __name__ == "__main__":
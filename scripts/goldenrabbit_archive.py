@@ -0,0 +1,88 @@
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from goldenrabbit_pipeline import parse_book_page
+
+
+class PageArchive:
+    """수집한 상품 페이지 원본을 gzip으로 압축해 URL별로 보관하는 저장소
+
+    디렉터리 구조:
+        index.jsonl            URL, 제목, 파일명, 본문 해시, 수집 시각 (한 줄에 한 페이지)
+        pages/<sha1(url)>.html.gz
+
+    같은 URL을 다시 저장하면 파일을 덮어쓰고 색인에 새 줄을 추가한다.
+    색인을 읽을 때는 URL별 마지막 줄이 유효하다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.pages_dir = os.path.join(directory, 'pages')
+        self.index_path = os.path.join(directory, 'index.jsonl')
+        os.makedirs(self.pages_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(url):
+        """URL에 대응하는 파일 키"""
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def path_for(self, url):
+        """URL의 압축 파일 경로"""
+        return os.path.join(self.pages_dir, f"{self.key_for(url)}.html.gz")
+
+    def save(self, url, title, body, encoding=None):
+        """페이지 본문(bytes)을 압축 저장하고 색인에 기록 (encoding: 응답 헤더의 charset)"""
+        path = self.path_for(url)
+        tmp_path = f"{path}.tmp"
+
+        # 중간에 중단되어도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        entry = {
+            'url': url,
+            'title': title,
+            'file': os.path.relpath(path, self.directory),
+            'sha256': hashlib.sha256(body).hexdigest(),
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        if encoding:
+            entry['encoding'] = encoding
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def entries(self):
+        """URL별 최신 색인 항목 목록 (처음 저장된 순서 유지)"""
+        if not os.path.exists(self.index_path):
+            return []
+
+        latest = {}
+        with open(self.index_path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    latest[entry['url']] = entry
+        return list(latest.values())
+
+    def load(self, entry):
+        """색인 항목의 페이지 본문(bytes) 반환"""
+        with gzip.open(os.path.join(self.directory, entry['file']), 'rb') as f:
+            return f.read()
+
+
+def parse_archived_page(directory, entry, parser='lxml'):
+    """워커 프로세스에서 보관된 페이지를 읽어 파싱하고 (entry, 도서 정보, 오류) 반환 (네트워크 접근 없음)
+
+    페이지 하나의 오류(빈 본문, 깨진 gzip 등)가 전체 재추출을 멈추지 않도록 예외를 잡아
+    오류 문구로 돌려준다 (예외 객체는 프로세스 사이에서 복원되지 않을 수 있음).
+    """
+    try:
+        html = PageArchive(directory).load(entry)
+        return entry, parse_book_page(html, entry['url'], entry['title'], parser, entry.get('encoding')), None
+    except Exception as e:
+        return entry, None, f"{type(e).__name__}: {e}"
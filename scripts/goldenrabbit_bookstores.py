@@ -0,0 +1,548 @@
+"""온라인 서점(YES24, 교보문고, 알라딘, 리디북스) 상품 링크를 찾아 도서 정보에 채움
+
+사용법:
+    python goldenrabbit_bookstores.py <결과 JSONL> [--cache bookstore_links.sqlite]
+                                      [--stores yes24,kyobo,aladin,ridibooks]
+                                      [--fixtures 디렉터리 | --record 디렉터리]
+    python goldenrabbit_bookstores.py --check-fixtures [--fixtures 디렉터리]
+
+- 서점마다 StoreResolver를 상속한 리졸버가 검색 URL과 검색 결과에서 상품 링크를 찾는
+  방법을 정한다. 새 서점은 @register_resolver로 등록하면 --stores에서 고를 수 있다.
+- 종이책 서점(YES24, 교보문고, 알라딘)은 ISBN으로, 전자책인 리디북스는 제목으로 찾는다.
+  입력 파일에서 여러 도서가 같은 ISBN을 쓰면 (사이트의 ISBN 입력 실수) 그 도서들은 제목으로 찾는다.
+- 검색 결과의 상품 링크마다 주변 텍스트에 도서 제목(또는 ISBN)이 있는지 확인해,
+  엉뚱한 책의 링크를 채우지 않는다.
+- 요청은 AsyncFetcher로 동시에 보내되, 서점(호스트)마다 따로 정한 동시 요청 수와
+  초당 요청 수를 넘지 않는다.
+- 찾은 링크는 ISBN(없으면 제목)별로 SQLite에 캐시하고, 찾지 못한 결과는
+  --missing-ttl일 동안만 캐시해 신간이 서점에 올라오면 다시 찾는다.
+- 이미 링크가 있는 필드는 덮어쓰지 않는다 (관리자가 직접 입력한 값 보존).
+
+--fixtures를 지정하면 네트워크 대신 저장해 둔 검색 결과 HTML로 리졸버를 실행하고,
+--record를 지정하면 실제 응답을 같은 규칙의 파일로 저장해 픽스처를 만든다.
+--check-fixtures는 픽스처 디렉터리(기본값: fixtures/bookstores)의 expected.json에 적힌
+도서마다 리졸버 결과를 기대 결과와 비교한다. 서점 검색 결과 구조가 바뀌었을 때
+--record로 픽스처를 다시 저장하고 이 검사로 리졸버를 확인한다.
+"""
+import argparse
+import asyncio
+import hashlib
+import html as htmllib
+import json
+import os
+import re
+import sqlite3
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from urllib.parse import quote, urlsplit
+
+import requests
+
+from goldenrabbit_extractor import WHITESPACE_RE, isbn13
+from goldenrabbit_fetcher import AsyncFetcher
+from goldenrabbit_sink import JsonlSink, iter_jsonl
+
+
+# 한 번에 동시에 처리하는 도서 수
+BATCH_SIZE = 32
+
+# 찾지 못한 결과를 캐시하는 기간 (일)
+MISSING_TTL_DAYS = 7
+
+# 픽스처 파일 이름 최대 길이 (넘으면 해시 이름)
+MAX_FIXTURE_NAME = 200
+
+# 저장소에 포함된 서점 검색 결과 픽스처와 기대 결과 파일
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'bookstores')
+EXPECTED_FILE = 'expected.json'
+
+# 제목 비교 시 무시하는 문자 (공백, 문장 부호)
+TITLE_NOISE_RE = re.compile(r'[\s\W_]+')
+
+# 제목 핵심 비교 시 지우는 괄호 부분 ('[Must Have]', '(2판)', '(세종도서 선정작)')
+TITLE_BRACKET_RE = re.compile(r'\[[^\]]*\]|\([^)]*\)|〈[^〉]*〉|《[^》]*》|<[^>]*>')
+
+# 부제목 구분자 (':', ' - ')
+SUBTITLE_RE = re.compile(r'\s*:.*|\s+[-–—]\s+.*')
+
+# 검색 결과 HTML의 태그 또는 태그 사이 텍스트, 태그에서 남기는 alt/title 속성 값
+HTML_TOKEN_RE = re.compile(r'<[^>]*>|[^<]+')
+TAG_TEXT_RE = re.compile(r'\b(?:alt|title)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.I)
+
+# 상품 링크 뒤에서 제목을 찾는 최대 범위 (문자)
+RESULT_WINDOW = 3000
+
+RESOLVERS = {}
+
+
+def register_resolver(cls):
+    """서점 리졸버 클래스를 이름으로 등록하는 데코레이터"""
+    RESOLVERS[cls.name] = cls
+    return cls
+
+
+def normalize_title(title):
+    """비교용 제목 (공백과 문장 부호 제거, 소문자)"""
+    return TITLE_NOISE_RE.sub('', (title or '').lower())
+
+
+def title_core(title):
+    """서점마다 다르게 붙는 괄호 부분과 부제목을 뺀 비교용 제목
+
+    '[Must Have] Tucker의 Go 언어 프로그래밍(2판)' → 'tucker의go언어프로그래밍'
+    괄호를 빼면 남는 것이 없으면 normalize_title과 같다.
+    """
+    core = SUBTITLE_RE.sub('', TITLE_BRACKET_RE.sub(' ', title or ''))
+    return normalize_title(core) or normalize_title(title)
+
+
+def tag_start(html, position):
+    """position을 포함한 태그의 시작 위치 (태그 안이 아니면 position)"""
+    start = html.rfind('<', 0, position)
+    return start if start >= 0 and html.rfind('>', start, position) < 0 else position
+
+
+def text_pieces(html):
+    """태그 사이 텍스트와 이미지 alt, 링크 title 속성 값 목록 (빈 값 제외)"""
+    pieces = []
+    for token in HTML_TOKEN_RE.findall(html):
+        if token.startswith('<'):
+            pieces.extend(a or b for a, b in TAG_TEXT_RE.findall(token))
+        else:
+            pieces.append(token)
+    return [htmllib.unescape(piece).strip() for piece in pieces if piece.strip()]
+
+
+def duplicate_isbns(books):
+    """두 권 이상의 도서가 함께 쓰는 ISBN-13 집합"""
+    counts = Counter(isbn13(book.get('isbn')) for book in books)
+    return {isbn for isbn, count in counts.items() if isbn and count > 1}
+
+
+class StoreResolver:
+    """서점 하나의 검색 URL과 검색 결과에서 상품 링크를 찾는 방법
+
+    - column: 채울 books 테이블 컬럼
+    - search_url_template: {query}에 URL 인코딩한 ISBN(또는 제목)이 들어가는 검색 URL
+    - product_re: 검색 결과 HTML에서 상품 링크의 id를 찾는 정규식
+    - product_url_template: {id}에 상품 id가 들어가는 상품 URL
+    - by_title: ISBN 대신 제목으로 검색 (전자책처럼 ISBN이 다른 경우)
+    - concurrency, rate: 이 서점에 보내는 동시 요청 수와 초당 요청 수 상한
+    """
+
+    name = ''
+    column = ''
+    search_url_template = ''
+    product_re = None
+    product_url_template = ''
+    by_title = False
+    concurrency = 2
+    rate = 1.0
+
+    def lookup_key(self, book, ambiguous_isbns=()):
+        """캐시 키 (ISBN, 제목 검색 서점이거나 ISBN이 없거나 여러 도서가 같은 ISBN을 쓰면 제목) 또는 None"""
+        isbn = isbn13(book.get('isbn'))
+        if isbn and not self.by_title and isbn not in ambiguous_isbns:
+            return f"isbn:{isbn}"
+        title = WHITESPACE_RE.sub(' ', book.get('title') or '').strip()
+        return f"title:{title}" if title else None
+
+    def search_url(self, key):
+        """캐시 키로 검색 URL 생성"""
+        return self.search_url_template.format(query=quote(key.split(':', 1)[1]))
+
+    def results(self, html):
+        """검색 결과의 (상품 id, 상품 부분의 text_pieces) 목록
+
+        상품 부분은 링크부터 다른 상품의 링크 전까지(최대 RESULT_WINDOW자)로,
+        같은 상품의 표지 링크와 제목 링크는 한 부분으로 묶인다.
+        """
+        matches = list(self.product_re.finditer(html))
+        results = []
+        previous = None
+        for index, match in enumerate(matches):
+            product_id = match.group(1)
+            if product_id == previous:
+                continue
+            previous = product_id
+            start = tag_start(html, match.start())
+            end = min(len(html), start + RESULT_WINDOW)
+            for following in matches[index + 1:]:
+                if following.group(1) != product_id:
+                    end = min(end, tag_start(html, following.start()))
+                    break
+            results.append((product_id, text_pieces(html[start:end])))
+        return results
+
+    def parse(self, html, key, title=None):
+        """검색 결과 HTML에서 상품 URL을 찾음 (없으면 None)
+
+        엉뚱한 책을 고르지 않도록 상품 부분에 제목 핵심(ISBN으로 검색했으면 ISBN도 인정)이
+        있는 상품만 받아들인다. 여러 상품이 맞으면 제목이 그대로 적힌 상품, 전체 제목을
+        포함한 상품, 제목 핵심만 포함한 상품 순으로 고른다 ('개발자 원칙'을 찾을 때
+        앞에 있는 '개발자 원칙(확장판)'보다 '개발자 원칙'을 고른다).
+        """
+        if key.startswith('title:'):
+            title, isbn = key[6:], None
+        else:
+            isbn = key[5:]
+        full, core = normalize_title(title), title_core(title) if title else ''
+
+        best, best_rank = None, 0
+        for product_id, pieces in self.results(html):
+            normalized = [normalize_title(piece) for piece in pieces]
+            joined = ''.join(normalized)
+            if full and full in normalized:
+                rank = 3
+            elif full and full in joined:
+                rank = 2
+            elif (core and core in joined) or (isbn and any(isbn in piece.replace('-', '') for piece in pieces)):
+                rank = 1
+            else:
+                rank = 0
+            if rank > best_rank:
+                best, best_rank = product_id, rank
+        return self.product_url_template.format(id=best) if best else None
+
+    async def resolve(self, key, fetch, title=None):
+        """검색 결과를 가져와 상품 URL 반환 (검색 결과가 없으면 None)"""
+        html = await fetch(self.search_url(key))
+        return self.parse(html, key, title) if html else None
+
+
+@register_resolver
+class Yes24Resolver(StoreResolver):
+    name = 'yes24'
+    column = 'yes24_link'
+    search_url_template = 'https://www.yes24.com/Product/Search?domain=BOOK&query={query}'
+    product_re = re.compile(r'href="(?:https?://www\.yes24\.com)?/Product/Goods/(\d+)', re.I)
+    product_url_template = 'https://www.yes24.com/Product/Goods/{id}'
+
+
+@register_resolver
+class KyoboResolver(StoreResolver):
+    name = 'kyobo'
+    column = 'kyobo_link'
+    search_url_template = 'https://search.kyobobook.co.kr/search?keyword={query}&gbCode=TOT&target=total'
+    product_re = re.compile(r'product\.kyobobook\.co\.kr/detail/(S\d+)')
+    product_url_template = 'https://product.kyobobook.co.kr/detail/{id}'
+
+
+@register_resolver
+class AladinResolver(StoreResolver):
+    name = 'aladin'
+    column = 'aladin_link'
+    search_url_template = 'https://www.aladin.co.kr/search/wsearchresult.aspx?SearchTarget=Book&SearchWord={query}'
+    product_re = re.compile(r'wproduct\.aspx\?ItemId=(\d+)', re.I)
+    product_url_template = 'https://www.aladin.co.kr/shop/wproduct.aspx?ItemId={id}'
+
+
+@register_resolver
+class RidibooksResolver(StoreResolver):
+    name = 'ridibooks'
+    column = 'ridibooks_link'
+    search_url_template = 'https://ridibooks.com/search?q={query}'
+    product_re = re.compile(r'/books/(\d{6,})')
+    product_url_template = 'https://ridibooks.com/books/{id}'
+    by_title = True
+
+
+class LinkCache:
+    """(캐시 키, 서점)별로 찾은 상품 링크를 저장하는 SQLite 캐시 (못 찾은 결과는 url이 NULL)"""
+
+    def __init__(self, path, missing_ttl_days=MISSING_TTL_DAYS):
+        self.conn = sqlite3.connect(path)
+        self.missing_ttl = timedelta(days=missing_ttl_days)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS links (
+                lookup_key TEXT NOT NULL,
+                store TEXT NOT NULL,
+                url TEXT,
+                resolved_at TEXT,
+                PRIMARY KEY (lookup_key, store)
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, key, store):
+        """캐시 결과 (찾은 URL 또는 None)와 캐시 적중 여부 반환
+
+        못 찾은 결과는 missing_ttl이 지나면 적중으로 보지 않는다.
+        """
+        row = self.conn.execute(
+            "SELECT url, resolved_at FROM links WHERE lookup_key = ? AND store = ?", (key, store)
+        ).fetchone()
+        if not row:
+            return None, False
+        if row[0] is None and datetime.fromisoformat(row[1]) < datetime.now() - self.missing_ttl:
+            return None, False
+        return row[0], True
+
+    def put(self, key, store, url):
+        self.conn.execute(
+            """
+            INSERT INTO links (lookup_key, store, url, resolved_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(lookup_key, store) DO UPDATE SET
+                url = excluded.url,
+                resolved_at = excluded.resolved_at
+            """,
+            (key, store, url, datetime.now().isoformat(timespec='seconds')),
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def fixture_path(directory, url):
+    """URL에 해당하는 픽스처 파일 경로 (<디렉터리>/<호스트>/<인코딩한 경로와 쿼리>.html)
+
+    긴 한글 제목처럼 인코딩한 이름이 파일 이름 길이 제한을 넘으면 해시를 쓴다.
+    """
+    parts = urlsplit(url)
+    name = quote(parts.path + ('?' + parts.query if parts.query else ''), safe='')
+    if len(name) > MAX_FIXTURE_NAME:
+        name = hashlib.sha1(name.encode('utf-8')).hexdigest()
+    return os.path.join(directory, parts.netloc, name + '.html')
+
+
+def fetcher_fetch(fetcher, record_dir=None):
+    """AsyncFetcher로 검색 결과 HTML을 가져오는 fetch 함수 (404면 None)
+
+    record_dir를 지정하면 응답을 픽스처 파일로도 저장한다.
+    """
+    async def fetch(url):
+        response = await fetcher.fetch(url)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        html = response.text
+        if record_dir:
+            path = fixture_path(record_dir, url)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+        return html
+
+    return fetch
+
+
+def fixture_fetch(directory):
+    """저장해 둔 픽스처 파일에서 검색 결과 HTML을 읽는 fetch 함수 (파일이 없으면 None)"""
+    async def fetch(url):
+        path = fixture_path(directory, url)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    return fetch
+
+
+def check_fixtures(directory):
+    """expected.json의 도서마다 픽스처로 리졸버를 실행해 기대 결과와 비교
+
+    expected.json은 {"books": [{"title", "isbn", "expected": {서점: URL 또는 null}}]} 형식으로,
+    expected에 적은 서점만 확인한다 (null은 찾지 말아야 함).
+    확인한 수와 틀린 (제목, 서점, 기대 결과, 실제 결과) 목록을 반환한다.
+    """
+    with open(os.path.join(directory, EXPECTED_FILE), encoding='utf-8') as f:
+        books = json.load(f)['books']
+    fetch = fixture_fetch(directory)
+    ambiguous_isbns = duplicate_isbns(books)
+
+    async def run():
+        checked, failures = 0, []
+        for book in books:
+            for name, expected in book['expected'].items():
+                resolver = RESOLVERS[name]()
+                key = resolver.lookup_key(book, ambiguous_isbns)
+                url = await resolver.resolve(key, fetch, book.get('title')) if key else None
+                checked += 1
+                if url != expected:
+                    failures.append((book.get('title', ''), name, expected, url))
+        return checked, failures
+
+    return asyncio.run(run())
+
+
+class BookstoreEnricher:
+    """도서 정보의 비어 있는 서점 링크를 리졸버로 찾아 채움
+
+    fetch는 URL을 받아 HTML 문자열(없으면 None)을 돌려주는 코루틴 함수로,
+    실제 수집에는 fetcher_fetch(), 테스트에는 fixture_fetch()를 넘긴다.
+    """
+
+    def __init__(self, fetch, cache, stores=None, overwrite=False):
+        self.fetch = fetch
+        self.cache = cache
+        self.resolvers = [RESOLVERS[name]() for name in (stores or RESOLVERS)]
+        self.overwrite = overwrite
+        self.ambiguous_isbns = set()
+        self.pending = {}
+        self.stats = {
+            resolver.name: {'found': 0, 'missing': 0, 'cached': 0, 'failed': 0}
+            for resolver in self.resolvers
+        }
+
+    def configure_limits(self, fetcher):
+        """서점별 동시 요청 수와 초당 요청 수 상한을 AsyncFetcher에 지정"""
+        for resolver in self.resolvers:
+            fetcher.configure_host(resolver.search_url_template, resolver.concurrency, resolver.rate)
+
+    async def resolve(self, resolver, book):
+        """서점 하나의 상품 링크 (캐시 우선, 찾지 못하거나 실패하면 None)
+
+        같은 ISBN을 가진 도서가 한 묶음에 있으면 진행 중인 검색 결과를 함께 쓴다.
+        """
+        key = resolver.lookup_key(book, self.ambiguous_isbns)
+        if not key:
+            return None
+
+        stats = self.stats[resolver.name]
+        url, hit = self.cache.get(key, resolver.name)
+        pending = self.pending.get((key, resolver.name))
+        if hit or pending:
+            stats['cached'] += 1
+            return await pending if pending else url
+
+        task = asyncio.ensure_future(self.search(resolver, key, book))
+        self.pending[(key, resolver.name)] = task
+        try:
+            return await task
+        finally:
+            del self.pending[(key, resolver.name)]
+
+    async def search(self, resolver, key, book):
+        """서점 검색으로 상품 링크를 찾아 캐시에 기록"""
+        stats = self.stats[resolver.name]
+        try:
+            url = await resolver.resolve(key, self.fetch, book.get('title'))
+        except Exception as e:
+            # 실패는 캐시하지 않고 다음 실행에서 다시 시도
+            stats['failed'] += 1
+            print(f"⚠️ {resolver.name} 검색 실패 ({book.get('title', '')}): {e}")
+            return None
+
+        stats['found' if url else 'missing'] += 1
+        self.cache.put(key, resolver.name, url)
+        return url
+
+    async def enrich_book(self, book):
+        """비어 있는 서점 링크를 서점별로 동시에 찾아 채운 도서 정보 반환"""
+        resolvers = [
+            resolver for resolver in self.resolvers
+            if self.overwrite or not book.get(resolver.column)
+        ]
+        urls = await asyncio.gather(*(self.resolve(resolver, book) for resolver in resolvers))
+        for resolver, url in zip(resolvers, urls):
+            if url:
+                book[resolver.column] = url
+        return book
+
+    async def process_jsonl(self, path):
+        """결과 JSONL의 모든 도서에 서점 링크를 채우고 파일을 교체
+
+        먼저 파일 전체에서 여러 도서가 함께 쓰는 ISBN을 찾아 그 도서들은 제목으로 찾는다.
+        """
+        self.ambiguous_isbns = duplicate_isbns(iter_jsonl(path))
+        if self.ambiguous_isbns:
+            print(f"⚠️ 여러 도서가 같은 ISBN을 씁니다. 해당 도서는 제목으로 찾습니다: "
+                  f"{', '.join(sorted(self.ambiguous_isbns))}")
+        tmp_path = path + '.bookstores.tmp'
+        sink = JsonlSink(tmp_path, fsync=False)
+        count = 0
+        try:
+            batch = []
+            for book in iter_jsonl(path):
+                batch.append(book)
+                if len(batch) >= BATCH_SIZE:
+                    count += await self.write_batch(batch, sink)
+                    batch = []
+            if batch:
+                count += await self.write_batch(batch, sink)
+        finally:
+            sink.close()
+            self.cache.commit()
+
+        os.replace(tmp_path, path)
+        return count
+
+    async def write_batch(self, batch, sink):
+        books = await asyncio.gather(*(self.enrich_book(book) for book in batch))
+        for book in books:
+            sink.write(book)
+        self.cache.commit()
+        return len(books)
+
+    def print_stats(self):
+        for name, stats in self.stats.items():
+            print(f"🏬 {name}: 찾음 {stats['found']}개, 없음 {stats['missing']}개, "
+                  f"캐시 {stats['cached']}개, 실패 {stats['failed']}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑 결과에 온라인 서점 상품 링크 채우기")
+    parser.add_argument('input', nargs='?', help="스크래핑 결과 JSONL (서점 링크를 채워 덮어씀)")
+    parser.add_argument('--cache', default='bookstore_links.sqlite',
+                        help="ISBN별 서점 링크 캐시(SQLite) 경로 (기본값: bookstore_links.sqlite)")
+    parser.add_argument('--stores', default=','.join(RESOLVERS),
+                        help=f"찾을 서점 목록 (기본값: {','.join(RESOLVERS)})")
+    parser.add_argument('--missing-ttl', type=float, default=MISSING_TTL_DAYS,
+                        help=f"찾지 못한 결과를 캐시하는 일수 (기본값: {MISSING_TTL_DAYS})")
+    parser.add_argument('--overwrite', action='store_true', help="이미 있는 서점 링크도 다시 찾아 덮어씀")
+    parser.add_argument('--fixtures', default=None, help="네트워크 대신 사용할 검색 결과 픽스처 디렉터리")
+    parser.add_argument('--record', default=None, help="실제 검색 결과를 픽스처로 저장할 디렉터리")
+    parser.add_argument('--check-fixtures', action='store_true',
+                        help="픽스처로 리졸버를 실행해 expected.json과 비교 (기본 디렉터리: fixtures/bookstores)")
+    args = parser.parse_args()
+
+    if args.check_fixtures:
+        directory = args.fixtures or FIXTURE_DIR
+        checked, failures = check_fixtures(directory)
+        for title, name, expected, url in failures:
+            print(f"❌ {name} ({title}): 기대 {expected}, 결과 {url}")
+        if failures:
+            sys.exit(1)
+        print(f"✅ {directory}의 서점 검색 결과 {checked}건이 모두 기대 결과와 같습니다.")
+        return
+    if not args.input:
+        parser.error("스크래핑 결과 JSONL 경로가 필요합니다.")
+
+    stores = [name.strip() for name in args.stores.split(',') if name.strip()]
+    unknown = [name for name in stores if name not in RESOLVERS]
+    if unknown:
+        parser.error(f"알 수 없는 서점: {', '.join(unknown)} (사용 가능: {', '.join(RESOLVERS)})")
+
+    fetcher = None
+    if args.fixtures:
+        fetch = fixture_fetch(args.fixtures)
+    else:
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
+        })
+        fetcher = AsyncFetcher(session)
+        fetch = fetcher_fetch(fetcher, args.record)
+
+    cache = LinkCache(args.cache, args.missing_ttl)
+    enricher = BookstoreEnricher(fetch, cache, stores, overwrite=args.overwrite)
+    if fetcher:
+        enricher.configure_limits(fetcher)
+    try:
+        count = asyncio.run(enricher.process_jsonl(args.input))
+        print(f"💾 {count}개 도서의 서점 링크를 {args.input}에 갱신했습니다.")
+        enricher.print_stats()
+    finally:
+        cache.close()
+        if fetcher:
+            fetcher.close()
+
+
+if __name__ == "__main__":
+    main()
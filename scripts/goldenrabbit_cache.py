@@ -0,0 +1,91 @@
+import hashlib
+import sqlite3
+from datetime import datetime
+
+
+class PageCache:
+    """URL별 ETag/Last-Modified와 본문 해시를 저장하는 SQLite 페이지 캐시
+
+    조건부 요청(If-None-Match / If-Modified-Since) 헤더를 만들고,
+    304 응답이나 본문 해시가 같은 페이지는 다시 파싱하지 않도록 판단한다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                fetched_at TEXT
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def hash_body(body):
+        """응답 본문(bytes)의 SHA-256 해시"""
+        return hashlib.sha256(body).hexdigest()
+
+    def get(self, url):
+        """캐시된 항목 반환 (없으면 None)"""
+        row = self.conn.execute(
+            "SELECT etag, last_modified, body_hash FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'body_hash': row[2]}
+
+    def conditional_headers(self, url):
+        """이전 응답의 검증자로 조건부 요청 헤더 생성"""
+        entry = self.get(url)
+        if not entry:
+            return None
+
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers or None
+
+    def is_unchanged(self, url, body_hash):
+        """본문 해시가 캐시와 같은지 확인"""
+        entry = self.get(url)
+        return bool(entry) and entry['body_hash'] == body_hash
+
+    def store(self, url, response, body_hash):
+        """응답의 검증자와 본문 해시 저장"""
+        self.conn.execute(
+            """
+            INSERT INTO pages (url, etag, last_modified, body_hash, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                body_hash = excluded.body_hash,
+                fetched_at = excluded.fetched_at
+            """,
+            (
+                url,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                body_hash,
+                datetime.now().isoformat(timespec='seconds'),
+            ),
+        )
+        self.conn.commit()
+
+    def touch(self, url):
+        """304 응답 시 마지막 확인 시각만 갱신"""
+        self.conn.execute(
+            "UPDATE pages SET fetched_at = ? WHERE url = ?",
+            (datetime.now().isoformat(timespec='seconds'), url),
+        )
+        self.conn.commit()
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
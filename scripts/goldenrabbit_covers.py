@@ -0,0 +1,281 @@
+"""도서 표지 이미지를 내려받아 내용 해시로 저장하고 크기별 WebP/AVIF 변형을 생성
+
+사용법:
+    python goldenrabbit_covers.py <결과 JSONL> --dir public/covers [--base-url /covers]
+                                  [--widths 160,320,640] [--formats webp,avif]
+
+- 원본은 SHA-256 해시 이름(originals/<해시>.<확장자>)으로 한 번만 저장한다.
+  여러 도서가 같은 이미지를 써도 파일은 하나다.
+- 이전에 받은 이미지는 ETag/Last-Modified로 조건부 요청하고, 304면 다시 받지 않는다.
+- 변형(<해시>-<너비>.<형식>)은 프로세스 풀에서 만들며, 이미 있으면 건너뛴다.
+- 도서 정보에 cover_image_variants({형식: {너비: URL}})를 추가한다.
+
+변형 생성에는 Pillow가 필요하다 (AVIF는 Pillow 11.3+ 또는 pillow-avif-plugin).
+Pillow가 없으면 원본만 저장한다.
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+
+from goldenrabbit_cache import PageCache
+from goldenrabbit_fetcher import AsyncFetcher
+from goldenrabbit_pipeline import default_workers
+from goldenrabbit_sink import JsonlSink, iter_jsonl
+
+
+DEFAULT_WIDTHS = [160, 320, 640]
+DEFAULT_FORMATS = ['webp', 'avif']
+
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/webp': 'webp',
+    'image/gif': 'gif',
+    'image/avif': 'avif',
+}
+
+# 한 번에 처리하는 도서 수 (결과 파일 전체를 메모리에 올리지 않기 위함)
+BATCH_SIZE = 64
+
+
+def pillow_available():
+    """변형 생성에 필요한 Pillow 설치 여부"""
+    return importlib.util.find_spec('PIL') is not None
+
+
+def variant_name(key, width, fmt):
+    return f"{key}-{width}.{fmt}"
+
+
+def render_variants(original_path, directory, key, widths, formats):
+    """워커 프로세스에서 원본을 너비별·형식별로 줄여 저장하고 [(형식, 너비, 파일명)] 반환
+
+    원본보다 큰 너비는 만들지 않는다 (원본이 가장 작은 너비보다 작으면 원본 크기로 하나만).
+    """
+    from PIL import Image
+
+    try:
+        # AVIF 인코더 플러그인 (Pillow 11.3 미만에서 선택)
+        import pillow_avif  # noqa: F401
+    except ImportError:
+        pass
+    Image.init()
+
+    formats = [fmt for fmt in formats if fmt.upper() in Image.SAVE]
+    variants = []
+
+    with Image.open(original_path) as image:
+        image.seek(0)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('P', 'LA') else 'RGB')
+
+        original_width, original_height = image.size
+        targets = [width for width in widths if width <= original_width] or [original_width]
+
+        for width in targets:
+            resized = None
+            for fmt in formats:
+                name = variant_name(key, width, fmt)
+                path = os.path.join(directory, name)
+                if not os.path.exists(path):
+                    if resized is None:
+                        height = max(1, round(original_height * width / original_width))
+                        resized = image if width == original_width else image.resize((width, height), Image.LANCZOS)
+                    tmp_path = path + '.tmp'
+                    resized.save(tmp_path, format=fmt.upper(), quality=80)
+                    os.replace(tmp_path, path)
+                variants.append((fmt, width, name))
+
+    return variants
+
+
+class CoverStore:
+    """내용 주소(content-addressed) 표지 저장소
+
+    directory/
+        originals/<sha256>.<확장자>   내려받은 원본
+        <sha256>-<너비>.<형식>         미리 만든 변형 (base_url 아래에서 그대로 서빙)
+        covers.sqlite                  URL별 ETag/Last-Modified와 원본 해시
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.originals_dir = os.path.join(directory, 'originals')
+        os.makedirs(self.originals_dir, exist_ok=True)
+        self.cache = PageCache(os.path.join(directory, 'covers.sqlite'))
+
+    def original_path(self, key):
+        """해시에 해당하는 원본 파일 경로 (없으면 None)"""
+        for ext in set(CONTENT_TYPE_EXTENSIONS.values()) | {'img'}:
+            path = os.path.join(self.originals_dir, f"{key}.{ext}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def save_original(self, body, content_type):
+        """원본을 해시 이름으로 저장하고 해시 반환 (같은 내용이 있으면 쓰지 않음)"""
+        key = PageCache.hash_body(body)
+        if self.original_path(key):
+            return key
+
+        ext = CONTENT_TYPE_EXTENSIONS.get((content_type or '').split(';')[0].strip().lower(), 'img')
+        path = os.path.join(self.originals_dir, f"{key}.{ext}")
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+        return key
+
+    def close(self):
+        self.cache.close()
+
+
+class CoverDownloader:
+    """표지 수집 단계: 동시 다운로드 + 해시 중복 제거 + 프로세스 풀 변형 생성"""
+
+    def __init__(self, fetcher, directory, base_url='/covers', widths=None, formats=None, workers=None):
+        self.fetcher = fetcher
+        self.store = CoverStore(directory)
+        self.base_url = base_url.rstrip('/')
+        self.widths = sorted(widths or DEFAULT_WIDTHS)
+        self.formats = formats or DEFAULT_FORMATS
+        self.workers = workers or default_workers()
+        self.render_variants = pillow_available()
+        # 같은 원본의 변형은 한 번만 생성
+        self._renders = {}
+        self.stats = {'downloaded': 0, 'unchanged': 0, 'deduplicated': 0, 'failed': 0}
+
+        if not self.render_variants:
+            print("⚠️ Pillow가 설치되어 있지 않아 표지 변형 없이 원본만 저장합니다. (pip install Pillow)")
+
+    async def fetch_original(self, image_url):
+        """표지 원본을 받아 해시 반환 (변경이 없으면 저장된 해시)"""
+        cache = self.store.cache
+        entry = cache.get(image_url)
+        known = entry and self.store.original_path(entry['body_hash'])
+        headers = cache.conditional_headers(image_url) if known else None
+
+        response = await self.fetcher.fetch(image_url, headers=headers)
+        if known and response.status_code == 304:
+            cache.touch(image_url)
+            self.stats['unchanged'] += 1
+            return entry['body_hash']
+
+        response.raise_for_status()
+        key = PageCache.hash_body(response.content)
+        if self.store.original_path(key):
+            self.stats['deduplicated'] += 1
+        else:
+            self.stats['downloaded'] += 1
+        self.store.save_original(response.content, response.headers.get('Content-Type'))
+        cache.store(image_url, response, key)
+        return key
+
+    async def variants_for(self, key, pool):
+        """원본 해시의 변형 URL 딕셔너리 ({형식: {너비: URL}})"""
+        if key not in self._renders:
+            loop = asyncio.get_running_loop()
+            self._renders[key] = loop.run_in_executor(
+                pool, render_variants, self.store.original_path(key),
+                self.store.directory, key, self.widths, self.formats,
+            )
+
+        variants = {}
+        for fmt, width, name in await self._renders[key]:
+            variants.setdefault(fmt, {})[str(width)] = f"{self.base_url}/{name}"
+        return variants
+
+    async def process_book(self, book, pool):
+        """도서 한 건의 표지를 받고 cover_image_variants를 채운다"""
+        src = book.get('cover_image_url') or ''
+        if not src or src.startswith('data:'):
+            return book
+
+        image_url = urljoin(book.get('url') or '', src)
+        try:
+            key = await self.fetch_original(image_url)
+            if pool is not None:
+                book['cover_image_variants'] = await self.variants_for(key, pool)
+        except Exception as e:
+            print(f"❌ 표지 처리 오류 ({book.get('title', image_url)}): {e}")
+            self.stats['failed'] += 1
+        return book
+
+    async def process_jsonl(self, path):
+        """결과 JSONL의 모든 도서 표지를 처리하고 파일을 갱신된 도서 정보로 교체"""
+        tmp_path = path + '.covers.tmp'
+        sink = JsonlSink(tmp_path, fsync=False)
+        count = 0
+
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.render_variants else None
+        try:
+            batch = []
+            for book in iter_jsonl(path):
+                batch.append(book)
+                if len(batch) >= BATCH_SIZE:
+                    count += await self.write_batch(batch, sink, pool)
+                    batch = []
+            if batch:
+                count += await self.write_batch(batch, sink, pool)
+        finally:
+            sink.close()
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+        os.replace(tmp_path, path)
+        return count
+
+    async def write_batch(self, batch, sink, pool):
+        books = await asyncio.gather(*(self.process_book(book, pool) for book in batch))
+        for book in books:
+            sink.write(book)
+        return len(books)
+
+    def print_stats(self):
+        print(f"🖼️ 표지: 새로 받음 {self.stats['downloaded']}개, 변경 없음 {self.stats['unchanged']}개, "
+              f"중복 {self.stats['deduplicated']}개, 실패 {self.stats['failed']}개")
+
+    def close(self):
+        self.store.close()
+
+
+def parse_list(text, cast=str):
+    return [cast(item.strip()) for item in text.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑 결과의 도서 표지를 내려받아 크기별 변형 생성")
+    parser.add_argument('input', help="스크래핑 결과 JSONL (표지 변형 URL을 추가해 덮어씀)")
+    parser.add_argument('--dir', required=True, help="표지 저장 디렉터리 (예: public/covers)")
+    parser.add_argument('--base-url', default='/covers', help="변형 이미지의 공개 URL 경로 (기본값: /covers)")
+    parser.add_argument('--widths', default=','.join(map(str, DEFAULT_WIDTHS)),
+                        help="변형 너비 목록 (기본값: 160,320,640)")
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help="변형 형식 목록 (기본값: webp,avif)")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시 다운로드 수 (기본값: 4)")
+    parser.add_argument('--rate', type=float, default=2.0,
+                        help="호스트별 초당 최대 요청 수, 0이면 제한 없음 (기본값: 2.0)")
+    parser.add_argument('--workers', type=int, default=0, help="변형 생성 프로세스 수 (기본값: CPU 코어 수)")
+    args = parser.parse_args()
+
+    fetcher = AsyncFetcher(requests.Session(), concurrency=args.concurrency, rate=args.rate)
+    downloader = CoverDownloader(
+        fetcher, args.dir, base_url=args.base_url, widths=parse_list(args.widths, int),
+        formats=parse_list(args.formats), workers=args.workers or None,
+    )
+    try:
+        count = asyncio.run(downloader.process_jsonl(args.input))
+        print(f"💾 {count}개 도서의 표지 정보를 {args.input}에 갱신했습니다.")
+        downloader.print_stats()
+    finally:
+        downloader.close()
+        fetcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""스크래핑 결과의 중복 텍스트 제거와 사전 압축 저장
+
+사용법:
+    python goldenrabbit_dedupe.py <결과 JSON/JSONL> [--output 결과.jsonl] [--store books_text.sqlite]
+                                  [--boilerplate-ratio 0.2] [--threshold 0.8]
+
+상세 페이지 추출은 가장 긴 컨테이너 텍스트를 고르기 때문에 같은 문장이 여러
+필드(책 소개와 추천평 등)에 겹쳐 들어가고, 사이트 공통 요소(최근 칼럼 목록,
+뉴스레터 안내, 리뷰 작성 양식)가 거의 모든 도서에 반복된다. 이 단계는
+
+1. 문장 단위로 나눈 뒤, 여러 도서(기본 20% 이상)에 반복되는 문장을 MinHash LSH로
+   찾아 사이트 공통 문구로 보고 제거하고,
+2. 도서 안에서 앞선 필드(목차, 출판사 리뷰, 추천평 ...)에 이미 포함된 문장을
+   단어 shingle 포함률로 찾아 뒤쪽 필드(책 소개)와 같은 필드 안의 반복에서 제거한다.
+
+--store를 지정하면 말뭉치에서 자주 나오는 문장으로 만든 사전을 써서 도서별로
+압축한 SQLite 저장소도 만든다 (zstandard가 있으면 zstd 사전, 없으면 zlib 사전).
+--save-index를 지정하면 공통 문구 색인을 저장해 두고, 바뀐 도서만 수집한 증분 실행에서
+그 색인으로 공통 문구를 판단한다 (몇 권만으로는 반복 여부를 알 수 없으므로).
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sqlite3
+import zlib
+from collections import Counter
+
+from goldenrabbit_loader import load_books
+from goldenrabbit_sink import JsonlSink
+
+
+# 앞쪽 필드가 문장을 소유하고, 뒤쪽 필드에서 겹치는 문장을 지운다
+TEXT_FIELDS = ['table_of_contents', 'publisher_review', 'testimonials', 'author_bio', 'description']
+
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+WORD_RE = re.compile(r'\w+')
+
+# 이보다 짧은 문장('설명', '목차' 같은 제목)은 지우지 않는다
+MIN_SEGMENT_CHARS = 20
+
+# 공통 문구로 보려면 최소 이 권수 이상에 나와야 한다
+MIN_BOILERPLATE_BOOKS = 3
+
+# MinHash 서명 길이와 LSH 밴드 구성 (밴드 4개 x 8행, 유사도 0.9에서 약 89% 검출)
+NUM_HASHES = 32
+LSH_BANDS = 4
+MERSENNE_PRIME = (1 << 61) - 1
+HASH_PARAMS = [
+    ((i * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) % MERSENNE_PRIME or 1,
+     (i * 0xC2B2AE3D27D4EB4F + 0x165667B19E3779F9) % MERSENNE_PRIME)
+    for i in range(1, NUM_HASHES + 1)
+]
+
+# zlib 사전 최대 크기 (deflate 창 크기)
+ZLIB_DICT_SIZE = 32 * 1024
+ZSTD_DICT_SIZE = 112 * 1024
+
+
+def split_segments(text):
+    """텍스트를 문장 단위로 분리"""
+    return [segment for segment in SENTENCE_END_RE.split(text or '') if segment]
+
+
+def shingles(segment, size=3):
+    """문장의 단어 size-gram 해시 집합 (단어가 적으면 글자 5-gram)"""
+    words = WORD_RE.findall(segment.lower())
+    if len(words) >= size:
+        grams = (' '.join(words[i:i + size]) for i in range(len(words) - size + 1))
+    else:
+        text = ''.join(words)
+        grams = (text[i:i + 5] for i in range(max(1, len(text) - 4)))
+    return {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+
+
+def minhash(shingle_set):
+    """shingle 집합의 MinHash 서명"""
+    return tuple(min((a * h + b) % MERSENNE_PRIME for h in shingle_set) for a, b in HASH_PARAMS)
+
+
+def band_keys(signature):
+    """LSH 밴드별 버킷 키"""
+    rows = NUM_HASHES // LSH_BANDS
+    return [(band,) + signature[band * rows:(band + 1) * rows] for band in range(LSH_BANDS)]
+
+
+def containment(inner, outer):
+    """inner shingle 중 outer에 포함된 비율"""
+    return len(inner & outer) / len(inner) if inner else 0.0
+
+
+class BoilerplateIndex:
+    """여러 도서에 반복되는 문장(사이트 공통 문구)을 찾는 MinHash LSH 색인
+
+    필드별로 문장 서명의 밴드 키마다 등장한 도서 수를 세고, 어느 밴드에서든
+    min_books권 이상에 나온 문장을 공통 문구로 본다. 날짜처럼 조금씩 다른
+    반복 문장도 같은 버킷에 모인다.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.books = 0
+        self._signatures = {}
+
+    @classmethod
+    def from_books(cls, books):
+        index = cls()
+        for book in books:
+            index.add_book(book)
+        return index
+
+    def min_books(self, ratio):
+        """ratio 비율의 도서 수 (최소 MIN_BOILERPLATE_BOOKS권)"""
+        return max(MIN_BOILERPLATE_BOOKS, math.ceil(self.books * ratio))
+
+    def save(self, path):
+        """공통 문구 판단에 쓰일 수 있는 버킷(MIN_BOILERPLATE_BOOKS권 이상)만 SQLite 파일에 저장 (기존 내용 교체)"""
+        conn = sqlite3.connect(path)
+        try:
+            with conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+                    CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, books INTEGER NOT NULL);
+                    DELETE FROM buckets;
+                """)
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('books', ?)", (self.books,))
+                conn.executemany(
+                    "INSERT INTO buckets (key, books) VALUES (?, ?)",
+                    ((json.dumps(key, ensure_ascii=False), count) for key, count in self.buckets.items()
+                     if count >= MIN_BOILERPLATE_BOOKS),
+                )
+        finally:
+            conn.close()
+
+    @classmethod
+    def load(cls, path):
+        """save로 저장한 색인 (파일이 없으면 None)"""
+        if not os.path.exists(path):
+            return None
+        index = cls()
+        conn = sqlite3.connect(path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'books'").fetchone()
+            index.books = row[0] if row else 0
+            index.buckets = {tuple(json.loads(key)): count
+                             for key, count in conn.execute("SELECT key, books FROM buckets")}
+        except sqlite3.DatabaseError:
+            return None
+        finally:
+            conn.close()
+        return index if index.books else None
+
+    def signature(self, segment):
+        if segment not in self._signatures:
+            self._signatures[segment] = minhash(shingles(segment))
+        return self._signatures[segment]
+
+    def add_book(self, book):
+        self.books += 1
+        for field in TEXT_FIELDS:
+            keys = set()
+            for segment in split_segments(book.get(field)):
+                if len(segment) >= MIN_SEGMENT_CHARS:
+                    keys.update(band_keys(self.signature(segment)))
+            for key in keys:
+                self.buckets[(field,) + key] = self.buckets.get((field,) + key, 0) + 1
+
+    def is_boilerplate(self, field, segment, min_books):
+        if len(segment) < MIN_SEGMENT_CHARS:
+            return False
+        return any(self.buckets.get((field,) + key, 0) >= min_books
+                   for key in band_keys(self.signature(segment)))
+
+
+def dedupe_book(book, boilerplate=None, min_books=None, threshold=0.8):
+    """도서 한 권의 필드 간/필드 내 중복 문장과 공통 문구를 제거한 사본과 제거한 글자 수 반환"""
+    result = dict(book)
+    owned = set()
+    removed = 0
+
+    for field in TEXT_FIELDS:
+        text = book.get(field)
+        if not text:
+            continue
+
+        kept = []
+        for segment in split_segments(text):
+            if boilerplate is not None and boilerplate.is_boilerplate(field, segment, min_books):
+                removed += len(segment) + 1
+                continue
+
+            segment_shingles = shingles(segment)
+            if len(segment) >= MIN_SEGMENT_CHARS and containment(segment_shingles, owned) >= threshold:
+                removed += len(segment) + 1
+                continue
+
+            owned |= segment_shingles
+            kept.append(segment)
+
+        cleaned = ' '.join(kept)
+        result[field] = cleaned if len(cleaned) != len(text) else text
+
+    return result, removed
+
+
+def dedupe_books(read_books, output_path, boilerplate_ratio=0.2, threshold=0.8, boilerplate=None):
+    """도서 정보를 두 번 읽어(공통 문구 집계 → 정리) output_path(JSONL)에 기록하고 통계 반환
+
+    read_books는 호출할 때마다 도서 정보를 처음부터 돌려주는 함수다.
+    boilerplate(전체 말뭉치로 만든 색인)를 주면 집계하지 않고 그 색인으로 공통 문구를 판단한다.
+    """
+    min_books = None
+    if boilerplate_ratio:
+        if boilerplate is None:
+            boilerplate = BoilerplateIndex.from_books(read_books())
+        min_books = boilerplate.min_books(boilerplate_ratio)
+    else:
+        boilerplate = None
+
+    stats = {'books': 0, 'bytes_before': 0, 'bytes_after': 0, 'chars_removed': 0}
+    sink = JsonlSink(output_path, fsync=False)
+    try:
+        for book in read_books():
+            cleaned, removed = dedupe_book(book, boilerplate, min_books, threshold)
+            sink.write(cleaned)
+            stats['books'] += 1
+            stats['chars_removed'] += removed
+            stats['bytes_before'] += len(json.dumps(book, ensure_ascii=False).encode('utf-8'))
+            stats['bytes_after'] += len(json.dumps(cleaned, ensure_ascii=False).encode('utf-8'))
+    finally:
+        sink.close()
+    return stats
+
+
+def dedupe_jsonl(path, boilerplate_ratio=0.2, threshold=0.8, boilerplate=None):
+    """결과 JSONL을 중복 제거한 내용으로 교체하고 통계 반환"""
+    tmp_path = path + '.dedupe.tmp'
+    stats = dedupe_books(lambda: load_books(path), tmp_path, boilerplate_ratio, threshold, boilerplate)
+    os.replace(tmp_path, path)
+    return stats
+
+
+def train_dictionary(books, size=ZLIB_DICT_SIZE):
+    """여러 도서에 반복되는 문장으로 압축 사전 생성
+
+    zlib은 사전 끝쪽을 더 가까운 거리로 참조하므로, 절약량이 큰 문장을 뒤에 둔다.
+    """
+    counts = Counter()
+    for book in books:
+        segments = set()
+        for field in TEXT_FIELDS:
+            segments.update(split_segments(book.get(field)))
+        counts.update(segments)
+
+    common = [(count * len(segment), segment) for segment, count in counts.items() if count > 1]
+    chosen = []
+    total = 0
+    for _, segment in sorted(common, reverse=True):
+        encoded = segment.encode('utf-8')
+        if total + len(encoded) + 1 > size:
+            continue
+        chosen.append(encoded)
+        total += len(encoded) + 1
+    return b' '.join(reversed(chosen))
+
+
+class TextStore:
+    """말뭉치 사전으로 도서별 JSON을 압축해 URL로 찾는 SQLite 저장소
+
+    도서 하나만 필요할 때도 그 도서만 풀면 되므로 상세 페이지별 전송량을 줄일 수 있다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS dictionaries (
+                id INTEGER PRIMARY KEY,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS books (
+                url TEXT PRIMARY KEY,
+                dictionary_id INTEGER NOT NULL,
+                data BLOB NOT NULL
+            );
+        """)
+        self.conn.commit()
+        self._codecs = {}
+
+    def codec(self, dictionary_id):
+        """사전 id에 해당하는 (압축 함수, 해제 함수)"""
+        if dictionary_id not in self._codecs:
+            codec, data = self.conn.execute(
+                "SELECT codec, data FROM dictionaries WHERE id = ?", (dictionary_id,)
+            ).fetchone()
+            if codec == 'zstd':
+                import zstandard
+                zdict = zstandard.ZstdCompressionDict(data)
+                compressor = zstandard.ZstdCompressor(level=19, dict_data=zdict)
+                decompressor = zstandard.ZstdDecompressor(dict_data=zdict)
+                self._codecs[dictionary_id] = (compressor.compress, decompressor.decompress)
+            else:
+                def compress(raw, zdict=data):
+                    compressor = zlib.compressobj(9, zdict=zdict)
+                    return compressor.compress(raw) + compressor.flush()
+
+                def decompress(blob, zdict=data):
+                    decompressor = zlib.decompressobj(zdict=zdict)
+                    return decompressor.decompress(blob) + decompressor.flush()
+
+                self._codecs[dictionary_id] = (compress, decompress)
+        return self._codecs[dictionary_id]
+
+    def add_dictionary(self, books):
+        """도서 정보로 새 사전을 만들어 저장하고 id 반환"""
+        try:
+            import zstandard
+        except ImportError:
+            codec, data = 'zlib', train_dictionary(books)
+        else:
+            samples = [json.dumps(book, ensure_ascii=False).encode('utf-8') for book in books]
+            codec = 'zstd'
+            data = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+
+        with self.conn:
+            return self.conn.execute(
+                "INSERT INTO dictionaries (codec, data) VALUES (?, ?)", (codec, data)
+            ).lastrowid
+
+    def latest_dictionary(self):
+        """가장 최근에 만든 사전 id (없으면 None)"""
+        return self.conn.execute("SELECT max(id) FROM dictionaries").fetchone()[0]
+
+    def write_books(self, books, train=True):
+        """도서 정보를 압축 저장하고 압축 전후 바이트 수 반환
+
+        train이면 이 도서들로 새 사전을 만들고, 아니면 가장 최근 사전을 그대로 쓴다
+        (바뀐 도서 몇 권만 저장하는 증분 실행용, 사전이 없으면 ValueError).
+        """
+        books = list(books)
+        if train:
+            dictionary_id = self.add_dictionary(books)
+        else:
+            dictionary_id = self.latest_dictionary()
+            if dictionary_id is None:
+                raise ValueError("재사용할 사전이 없습니다. 전체 수집으로 먼저 저장소를 만드세요.")
+        compress, _ = self.codec(dictionary_id)
+
+        raw_bytes = stored_bytes = 0
+        with self.conn:
+            for book in books:
+                raw = json.dumps(book, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                blob = compress(raw)
+                raw_bytes += len(raw)
+                stored_bytes += len(blob)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO books (url, dictionary_id, data) VALUES (?, ?, ?)",
+                    (book.get('url'), dictionary_id, blob),
+                )
+            # 더 이상 쓰지 않는 사전 정리
+            self.conn.execute("DELETE FROM dictionaries WHERE id NOT IN (SELECT dictionary_id FROM books)")
+        return raw_bytes, stored_bytes
+
+    def get(self, url):
+        """URL의 도서 정보 (없으면 None)"""
+        row = self.conn.execute("SELECT dictionary_id, data FROM books WHERE url = ?", (url,)).fetchone()
+        if not row:
+            return None
+        _, decompress = self.codec(row[0])
+        return json.loads(decompress(row[1]))
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑 결과의 중복 텍스트 제거와 사전 압축 저장")
+    parser.add_argument('input', help="스크래핑 결과 JSON 또는 JSONL")
+    parser.add_argument('--output', default=None,
+                        help="정리한 결과 JSONL 경로 (기본값: 입력이 JSONL이면 덮어씀)")
+    parser.add_argument('--store', default=None, help="사전 압축 저장소(SQLite) 경로")
+    parser.add_argument('--boilerplate-ratio', type=float, default=0.2,
+                        help="이 비율 이상의 도서에 반복되는 문장을 공통 문구로 제거, 0이면 끔 (기본값: 0.2)")
+    parser.add_argument('--threshold', type=float, default=0.8,
+                        help="앞선 필드에 이 비율 이상 포함된 문장을 중복으로 제거 (기본값: 0.8)")
+    parser.add_argument('--save-index', default=None,
+                        help="입력 전체로 만든 공통 문구 색인을 저장할 SQLite 경로 (증분 실행에서 재사용)")
+    args = parser.parse_args()
+
+    index = None
+    if args.save_index:
+        index = BoilerplateIndex.from_books(load_books(args.input))
+        index.save(args.save_index)
+        print(f"💾 공통 문구 색인({index.books}권): {args.save_index}")
+
+    if args.output:
+        output = args.output
+        stats = dedupe_books(lambda: load_books(args.input), output, args.boilerplate_ratio, args.threshold, index)
+    elif args.input.endswith('.jsonl'):
+        output = args.input
+        stats = dedupe_jsonl(output, args.boilerplate_ratio, args.threshold, index)
+    else:
+        output = os.path.splitext(args.input)[0] + '.dedupe.jsonl'
+        stats = dedupe_books(lambda: load_books(args.input), output, args.boilerplate_ratio, args.threshold, index)
+
+    saved = 1 - stats['bytes_after'] / stats['bytes_before'] if stats['bytes_before'] else 0
+    print(f"🧹 {stats['books']}개 도서에서 중복 {stats['chars_removed']:,}자 제거: "
+          f"{stats['bytes_before'] / 1024:.0f}KB → {stats['bytes_after'] / 1024:.0f}KB ({saved:.0%} 감소)")
+    print(f"💾 정리된 결과: {output}")
+
+    if args.store:
+        store = TextStore(args.store)
+        try:
+            raw_bytes, stored_bytes = store.write_books(load_books(output))
+        finally:
+            store.close()
+        print(f"🗜️ 사전 압축 저장소 {args.store}: {raw_bytes / 1024:.0f}KB → {stored_bytes / 1024:.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
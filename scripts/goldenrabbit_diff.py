@@ -0,0 +1,382 @@
+"""새 스크래핑 결과와 이전 스냅샷(또는 books 테이블 내보내기)을 비교해 변경분만 적재
+
+사용법:
+    python goldenrabbit_diff.py <새 결과 JSON/JSONL> [--previous 이전 결과 또는 books.csv]
+                                [--feed changes.jsonl] [--sql changes.sql] [--hard-delete]
+                                [--update-baseline]
+
+- 이전 자료: 스크래핑 결과(JSON/JSONL) 또는 books 테이블 내보내기
+  (\\copy books TO 'books.csv' CSV HEADER, 또는 행 배열 JSON/JSONL)
+- --previous를 생략하면 같은 폴더의 비교 기준(books_baseline.jsonl), 없으면 가장 최근의
+  complete_goldenrabbit_books_* 파일과 비교
+- 증분 수집(--cache) 결과에는 바뀐 도서만 있으므로 결과 파일끼리 비교하면 안 된다.
+  비교 기준은 이전 자료에 변경 피드를 적용한 전체 도서 행으로, 스크래퍼의 --diff-against
+  (또는 이 스크립트의 --update-baseline)가 실행마다 갱신한다. 보류한 삭제는 적용하지 않는다.
+
+도서는 상품 URL로 만든 id(UUIDv5)로 맞추고, id가 다른 도서(URL이 바뀐 도서, 이전 적재로
+임의의 UUIDv4를 가진 books 행)는 제목(공백·대소문자 무시), 그다음 ISBN이 유일하게 같은
+이전 도서에 맞춘다.
+이전 자료는 필드별 해시(지문)만 메모리에 두고 비교하므로 본문이 커도 부담이 없다.
+결과는 추가/삭제/변경된 필드만 담은 변경 피드(JSONL)와, 바뀐 컬럼만 고치는
+UPDATE 문(새 도서는 기존 적재와 같은 INSERT ... ON CONFLICT)으로 저장한다.
+사라진 도서는 기본적으로 is_active = false로 내리고, --hard-delete면 DELETE한다.
+이전 도서의 절반 넘게 사라졌다면 맞추기가 잘못됐을 가능성이 크므로, --force-deletes가
+없으면 삭제는 변경 피드에만 보류(held)로 남기고 SQL은 만들지 않는다.
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import re
+from datetime import datetime
+
+from goldenrabbit_loader import (
+    BOOK_COLUMNS,
+    PRESERVE_IF_NULL_COLUMNS,
+    UNKNOWN_KEY,
+    UPDATE_COLUMNS,
+    book_to_row,
+    empty_to_none,
+    insert_statements,
+    load_books,
+    sql_literal,
+    title_key,
+)
+from goldenrabbit_record import parse_page_count, parse_price
+from goldenrabbit_sink import iter_jsonl
+
+
+# 비교하는 컬럼: 재적재 시 덮어쓰는 컬럼 (updated_at 제외)
+DIFF_COLUMNS = [column for column in UPDATE_COLUMNS if column != 'updated_at']
+
+# 새 값이 있을 때만 비교하는 컬럼 (관리자가 직접 입력한 값 보존, 적재 SQL과 같은 규칙)
+PRESERVE_COLUMNS = PRESERVE_IF_NULL_COLUMNS
+
+# 이전 도서 중 이 비율을 넘게 삭제하려 하면 보류 (--force-deletes로 강제)
+MAX_DELETE_RATIO = 0.5
+
+# 실행마다 변경 피드를 적용해 갱신하는 비교 기준 파일 이름 (결과 파일과 같은 폴더)
+BASELINE_NAME = 'books_baseline.jsonl'
+
+# 스크래퍼가 만드는 결과 파일 이름 (변경 피드 *.changes.jsonl 등은 제외)
+SNAPSHOT_RE = re.compile(r'^complete_goldenrabbit_books_\d{8}_\d{6}\.jsonl?$')
+
+
+def fingerprint(value):
+    """필드 값의 짧은 해시 (값이 없으면 None)"""
+    if value is None:
+        return None
+    data = json.dumps(value, ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def parse_bool(value):
+    """내보내기의 't'/'true'/'1' 같은 값을 bool로 (없으면 None)"""
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    return text in ('t', 'true', '1', 'y', 'yes')
+
+
+def export_to_row(record):
+    """books 테이블 내보내기 행을 book_to_row와 같은 형태로 정규화"""
+    row = {column: empty_to_none(record.get(column)) for column in BOOK_COLUMNS}
+    row['price'] = parse_price(record.get('price')) if row['price'] is not None else None
+    row['page_count'] = parse_page_count(record.get('page_count'))
+    row['is_active'] = parse_bool(record.get('is_active'))
+    return row
+
+
+def is_export_record(record):
+    """스크래핑 결과가 아니라 테이블 행인지 (id는 있고 url이 없음)"""
+    return 'id' in record and 'url' not in record
+
+
+def load_rows(path):
+    """이전 자료를 books 행 형태로 한 건씩 반환 (스크래핑 결과와 테이블 내보내기 모두)"""
+    if path.endswith('.csv'):
+        with open(path, encoding='utf-8', newline='') as f:
+            for record in csv.DictReader(f):
+                yield export_to_row(record)
+        return
+
+    for record in load_books(path):
+        if is_export_record(record):
+            yield export_to_row(record)
+        else:
+            row = book_to_row(record)
+            # 스크래핑 결과에는 활성 여부가 없음
+            row['is_active'] = None
+            yield row
+
+
+def row_fingerprints(row):
+    """비교 대상 컬럼별 지문"""
+    return {column: fingerprint(row.get(column)) for column in DIFF_COLUMNS + PRESERVE_COLUMNS}
+
+
+class Snapshot:
+    """이전 자료의 도서별 필드 지문 (본문은 보관하지 않음)"""
+
+    def __init__(self, rows):
+        self.books = {}
+        self.by_isbn = {}
+        self.by_title = {}
+        for row in rows:
+            self.books[row['id']] = {
+                'title': row.get('title'),
+                'is_active': row.get('is_active'),
+                'fingerprints': row_fingerprints(row),
+            }
+            # 여러 도서가 같은 값을 가지면(잘못 추출된 ISBN, 같은 제목 등) 그 값으로는 맞추지 않음
+            if row.get('isbn'):
+                isbn = row['isbn']
+                self.by_isbn[isbn] = None if isbn in self.by_isbn else row['id']
+            key = title_key(row.get('title'))
+            if key:
+                self.by_title[key] = None if key in self.by_title else row['id']
+
+    def __len__(self):
+        return len(self.books)
+
+    def match(self, row):
+        """id가 다른 새 행을 제목, 그다음 ISBN이 유일하게 같은 이전 도서 id에 맞춤 (없으면 None)"""
+        return self.by_title.get(title_key(row.get('title'))) or self.by_isbn.get(row.get('isbn'))
+
+
+def changed_fields(previous, row):
+    """이전 지문과 다른 컬럼의 새 값과 (이전, 새) 지문 (수집하지 않은 컬럼은 비교하지 않음)"""
+    changed, fingerprints = {}, {}
+    new_fingerprints = row_fingerprints(row)
+    unknown = row.get(UNKNOWN_KEY) or ()
+    for column in DIFF_COLUMNS + PRESERVE_COLUMNS:
+        old, new = previous['fingerprints'].get(column), new_fingerprints[column]
+        if old == new or column in unknown or (column in PRESERVE_COLUMNS and row.get(column) is None):
+            continue
+        changed[column] = row.get(column)
+        fingerprints[column] = [old, new]
+
+    # 내렸던 도서가 다시 나타나면 활성화
+    if previous['is_active'] is False:
+        changed['is_active'] = True
+        fingerprints['is_active'] = [fingerprint(False), fingerprint(True)]
+    return changed, fingerprints
+
+
+def diff_books(snapshot, books, present_ids=(), now=None):
+    """이전 지문과 새 결과를 비교해 insert/update/delete 변경 이벤트를 차례로 반환
+
+    id가 같은 도서를 먼저 모두 맞춘 뒤, 남은 새 도서만 제목·ISBN으로 남은 이전 도서에 맞춘다.
+    present_ids: 이번 결과에는 없지만 변경 없음으로 확인된 도서 id (증분 수집)
+    """
+    now = now or datetime.now().isoformat()
+    seen = set(present_ids)
+    unmatched = []
+
+    def compare(previous_id, book, row):
+        seen.add(previous_id)
+        changed, fingerprints = changed_fields(snapshot.books[previous_id], row)
+        if changed:
+            return {
+                'op': 'update', 'id': previous_id, 'url': book.get('url'), 'title': row['title'],
+                'changed': changed, 'fingerprints': fingerprints,
+            }
+        return None
+
+    for book in books:
+        row = book_to_row(book, now)
+        if row['id'] in snapshot.books:
+            change = compare(row['id'], book, row)
+            if change:
+                yield change
+        else:
+            unmatched.append((book, row))
+
+    for book, row in unmatched:
+        previous_id = snapshot.match(row)
+        if previous_id is not None and previous_id not in seen:
+            change = compare(previous_id, book, row)
+            if change:
+                yield change
+        else:
+            seen.add(row['id'])
+            yield {'op': 'insert', 'id': row['id'], 'url': book.get('url'), 'title': row['title'], 'row': row}
+
+    for book_id, previous in snapshot.books.items():
+        if book_id not in seen and previous['is_active'] is not False:
+            yield {'op': 'delete', 'id': book_id, 'title': previous['title']}
+
+
+def update_statement(change, now):
+    """바뀐 컬럼만 고치는 UPDATE 문"""
+    assignments = [f"{column} = {sql_literal(value)}" for column, value in change['changed'].items()]
+    assignments.append(f"updated_at = {sql_literal(now)}")
+    return f"UPDATE books SET {', '.join(assignments)} WHERE id = {sql_literal(change['id'])};\n"
+
+
+def delete_statement(change, now, hard_delete=False):
+    """사라진 도서를 비활성화(기본) 또는 삭제하는 문"""
+    if hard_delete:
+        return f"DELETE FROM books WHERE id = {sql_literal(change['id'])};\n"
+    return (f"UPDATE books SET is_active = false, updated_at = {sql_literal(now)} "
+            f"WHERE id = {sql_literal(change['id'])};\n")
+
+
+def write_changes(changes, feed_path, sql_path=None, hard_delete=False, allow_deletes=True, max_deletes=None):
+    """변경 이벤트를 변경 피드(JSONL)와 최소 변경 SQL로 저장하고 종류별 건수 반환
+
+    allow_deletes가 아니거나(이번 수집에 실패한 도서가 있는 등) 삭제가 max_deletes개를
+    넘으면 삭제 이벤트는 피드에 'held': true로만 남기고 SQL은 만들지 않는다.
+    보류한 수는 counts['held'].
+    """
+    now = datetime.now()
+    counts = {'insert': 0, 'update': 0, 'delete': 0, 'held': 0}
+    inserts, statements, deletes = [], [], []
+
+    def record(feed, change):
+        feed.write(json.dumps({'ts': now.isoformat(), **change}, ensure_ascii=False) + '\n')
+
+    with open(feed_path, 'w', encoding='utf-8') as feed:
+        for change in changes:
+            if change['op'] == 'delete':
+                # 전체 삭제 수를 알아야 보류 여부를 정할 수 있으므로 모아 두었다가 기록
+                deletes.append(change)
+                continue
+            counts[change['op']] += 1
+            record(feed, change)
+            if change['op'] == 'insert':
+                inserts.append(change['row'])
+            else:
+                statements.append(update_statement(change, now.isoformat()))
+
+        held = not allow_deletes or (max_deletes is not None and len(deletes) > max_deletes)
+        for change in deletes:
+            if held:
+                counts['held'] += 1
+                record(feed, {**change, 'held': True})
+            else:
+                counts['delete'] += 1
+                record(feed, change)
+                statements.append(delete_statement(change, now.isoformat(), hard_delete))
+
+    if sql_path:
+        with open(sql_path, 'w', encoding='utf-8') as f:
+            f.write("-- 골든래빗 도서 변경분 SQL\n")
+            f.write(f"-- 생성일: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write("BEGIN;\n\n")
+            for statement in insert_statements(inserts):
+                f.write(statement)
+            for statement in statements:
+                f.write(statement)
+            f.write("\nCOMMIT;\n")
+            f.write(f"-- 추가 {counts['insert']}개, 변경 {counts['update']}개, 삭제 {counts['delete']}개\n")
+            if counts['held']:
+                f.write(f"-- 삭제 보류 {counts['held']}개 (변경 피드의 held 이벤트 참고)\n")
+
+    return counts
+
+
+def max_deletes(snapshot):
+    """보류 없이 만들 수 있는 최대 삭제 수"""
+    return int(len(snapshot) * MAX_DELETE_RATIO)
+
+
+def latest_snapshot(path):
+    """path와 같은 폴더에서 가장 최근 스크래핑 결과 (path 자신과 같은 이름의 .json/.jsonl 제외)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    stem = os.path.splitext(os.path.abspath(path))[0]
+    candidates = [
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if SNAPSHOT_RE.match(name) and os.path.splitext(os.path.join(directory, name))[0] != stem
+    ]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def baseline_path(path):
+    """path와 같은 폴더의 비교 기준 파일 경로"""
+    return os.path.join(os.path.dirname(os.path.abspath(path)), BASELINE_NAME)
+
+
+def previous_snapshot(path):
+    """path와 비교할 이전 자료 (비교 기준 파일, 없으면 가장 최근 스크래핑 결과, 둘 다 없으면 None)"""
+    baseline = baseline_path(path)
+    return baseline if os.path.exists(baseline) else latest_snapshot(path)
+
+
+def update_baseline(previous, feed_path, path):
+    """이전 자료에 변경 피드를 적용한 전체 도서 행을 비교 기준 파일(path)로 저장하고 도서 수 반환
+
+    변경 이벤트는 바뀐 컬럼만 담으므로 피드만 메모리에 올리고 이전 자료는 한 건씩 읽는다.
+    보류한(held) 삭제는 적용하지 않는다. previous가 path 자신이어도 되도록 임시 파일에 쓴 뒤 교체한다.
+    feed_path가 None이면 previous(첫 전체 수집 결과)를 그대로 비교 기준으로 저장한다.
+    """
+    updates, inserts, deletes = {}, [], set()
+    for change in iter_jsonl(feed_path) if feed_path else ():
+        if change['op'] == 'update':
+            updates[change['id']] = change['changed']
+        elif change['op'] == 'insert':
+            inserts.append(change['row'])
+        elif change['op'] == 'delete' and not change.get('held'):
+            deletes.add(change['id'])
+
+    count = 0
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for row in itertools.chain(load_rows(previous), inserts):
+            if row['id'] in deletes:
+                continue
+            row = {column: row.get(column) for column in BOOK_COLUMNS}
+            row.update(updates.get(row['id'], {}))
+            f.write(json.dumps(row, ensure_ascii=False) + '\n')
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이전 스냅샷과 비교해 변경 피드와 최소 변경 SQL 생성")
+    parser.add_argument('input', help="새 스크래핑 결과 JSON 또는 JSONL")
+    parser.add_argument('--previous', default=None,
+                        help="이전 스크래핑 결과 또는 books 테이블 내보내기(CSV/JSON/JSONL) "
+                             "(기본값: 같은 폴더의 비교 기준 파일, 없으면 가장 최근 결과)")
+    parser.add_argument('--feed', default=None, help="변경 피드 JSONL 경로")
+    parser.add_argument('--sql', default=None, help="변경분 SQL 경로")
+    parser.add_argument('--hard-delete', action='store_true',
+                        help="사라진 도서를 비활성화하지 않고 DELETE")
+    parser.add_argument('--force-deletes', action='store_true',
+                        help=f"이전 도서의 {MAX_DELETE_RATIO:.0%}를 넘게 사라져도 삭제 SQL 생성")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help=f"변경 피드를 적용한 결과로 같은 폴더의 {BASELINE_NAME} 갱신 (SQL을 적재할 때 사용)")
+    args = parser.parse_args()
+
+    previous = args.previous or previous_snapshot(args.input)
+    if not previous:
+        print("❌ 비교할 이전 스냅샷이 없습니다. --previous로 지정하세요.")
+        return
+
+    snapshot = Snapshot(load_rows(previous))
+    print(f"📂 이전 자료: {previous} ({len(snapshot)}개 도서)")
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    feed_path = args.feed or f"changes_goldenrabbit_books_{timestamp}.jsonl"
+    sql_path = args.sql or f"changes_goldenrabbit_books_{timestamp}.sql"
+    counts = write_changes(diff_books(snapshot, load_books(args.input)), feed_path, sql_path, args.hard_delete,
+                           max_deletes=None if args.force_deletes else max_deletes(snapshot))
+
+    print(f"🔀 추가 {counts['insert']}개, 변경 {counts['update']}개, 삭제 {counts['delete']}개")
+    if counts['held']:
+        print(f"⚠️ 이전 도서의 {MAX_DELETE_RATIO:.0%}를 넘게 사라져 삭제 {counts['held']}개를 보류했습니다 "
+              f"(변경 피드의 held 이벤트 확인 후 --force-deletes로 다시 실행).")
+    print(f"💾 변경 피드: {feed_path}")
+    print(f"💾 변경분 SQL: {sql_path}")
+    if args.update_baseline:
+        baseline = baseline_path(args.input)
+        print(f"💾 비교 기준 {baseline} 갱신 ({update_baseline(previous, feed_path, baseline)}개 도서)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,740 @@
+import codecs
+import json
+import re
+
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+
+# 응답 헤더(Content-Type)와 본문 <meta>에 선언된 문자 인코딩
+HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+
+# <meta charset>을 찾는 본문 앞부분 길이 (바이트)
+META_SNIFF_BYTES = 4096
+
+# 헤더와 본문 어디에도 인코딩 선언이 없을 때 (사이트는 UTF-8)
+DEFAULT_ENCODING = 'utf-8'
+
+# 필드별 선택자 (앞쪽 선택자가 우선)
+PRICE_SELECTORS = [
+    '.price .woocommerce-Price-amount.amount',
+    '.price .amount',
+    'span.price .amount',
+    '.woocommerce-Price-amount',
+]
+
+IMAGE_SELECTORS = [
+    '.woocommerce-product-gallery__image img',
+    '.product-image img',
+    '.wp-post-image',
+    'img[class*="attachment"]'
+]
+
+# 지연 로딩 이미지는 src에 data: 자리표시자를 두고 실제 주소를 data-* 속성에 둔다
+IMAGE_SRC_ATTRIBUTES = ['data-src', 'data-lazy-src', 'src']
+
+META_SELECTORS = [
+    '.product_meta',
+    '.woocommerce-product-attributes',
+    '.additional-information table',
+    '.product-details',
+    'table.shop_attributes'
+]
+
+SHORT_DESC_SELECTORS = [
+    '.woocommerce-product-details__short-description',
+    '.product-short-description',
+    '.entry-summary .product-excerpt'
+]
+
+TAB_SELECTORS = [
+    '#tab-description',
+    '#tab-reviews',
+    '#tab-additional_information',
+    '.woocommerce-Tabs-panel--description',
+    '.woocommerce-Tabs-panel--additional_information',
+    '.woocommerce-Tabs-panel--reviews'
+]
+
+# 한국어 키워드로 커스텀 탭 섹션 찾기 (앞쪽 키워드가 우선)
+KEYWORDS_MAP = {
+    '목차': 'table_of_contents',
+    '차례': 'table_of_contents',
+    '출판사': 'publisher_review',
+    '출판사리뷰': 'publisher_review',
+    '출판사 리뷰': 'publisher_review',
+    '추천': 'testimonials',
+    '추천평': 'testimonials',
+    '서평': 'testimonials',
+    '리뷰': 'testimonials',
+    '책소개': 'description',
+    '내용': 'description',
+    '소개': 'description'
+}
+
+# 모든 키워드를 한 번에 검사하는 정규식 (긴 키워드 우선)
+KEYWORDS_RE = re.compile('|'.join(
+    re.escape(keyword) for keyword in sorted(KEYWORDS_MAP, key=len, reverse=True)
+))
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+ISBN_CHARS = set('0123456789Xx-')
+
+
+def clean_text(text):
+    """텍스트 정리"""
+    if not text:
+        return ""
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def image_source(element):
+    """img 요소의 실제 이미지 주소 (data: 자리표시자는 건너뜀)"""
+    for attribute in IMAGE_SRC_ATTRIBUTES:
+        value = (element.get(attribute) or '').strip()
+        if value and not value.startswith('data:'):
+            return value
+    return ''
+
+
+def new_book_data(book_url, book_title):
+    """기본값으로 채운 도서 정보 딕셔너리"""
+    return {
+        'title': book_title,
+        'url': book_url,
+        'author': '',
+        'publisher': '골든래빗',
+        'publication_date': '',
+        'price': '',
+        'isbn': '',
+        'page_count': '',
+        'description': '',
+        'table_of_contents': '',
+        'publisher_review': '',
+        'testimonials': '',
+        'cover_image_url': '',
+        'category': 'IT전문서'
+    }
+
+
+def match_keyword_field(text):
+    """텍스트에 포함된 키워드 중 KEYWORDS_MAP 순서상 첫 번째 키워드의 필드 반환"""
+    # 대부분의 후보는 정규식 한 번으로 걸러지고, 일치한 경우에만 우선순위를 따진다
+    if not KEYWORDS_RE.search(text):
+        return None
+
+    for keyword, field in KEYWORDS_MAP.items():
+        if keyword in text:
+            return field
+    return None
+
+
+def assign_meta_value(label, value, book_data):
+    """라벨에 따라 적절한 필드에 값 할당"""
+    if not value:
+        return
+
+    if '저자' in label or 'author' in label:
+        book_data['author'] = value
+    elif 'isbn' in label:
+        book_data['isbn'] = value
+    elif '페이지' in label or 'page' in label:
+        book_data['page_count'] = value
+    elif '출간' in label or 'publish' in label or '발행' in label:
+        book_data['publication_date'] = value
+    elif '크기' in label or '판형' in label or 'size' in label:
+        book_data['size'] = value
+
+
+def parse_meta_text(text, book_data):
+    """일반 텍스트에서 메타 정보 파싱"""
+    # "저자 : 홍길동" 형태
+    if ':' in text:
+        parts = text.split(':', 1)
+        if len(parts) == 2:
+            label = clean_text(parts[0]).lower()
+            value = clean_text(parts[1])
+            assign_meta_value(label, value, book_data)
+
+
+def html_to_text(fragment):
+    """HTML 조각을 정리된 텍스트로 변환"""
+    if not fragment:
+        return ''
+    return clean_text(lxml.html.fragment_fromstring(fragment, create_parent='div').text_content())
+
+
+def header_charset(content_type):
+    """Content-Type 헤더에 선언된 charset (없으면 None)"""
+    match = HEADER_CHARSET_RE.search(content_type or '')
+    return match.group(1) if match else None
+
+
+def known_encoding(name):
+    """파이썬이 아는 인코딩 이름이면 그대로, 아니면 None"""
+    try:
+        codecs.lookup(name)
+    except (LookupError, TypeError):
+        return None
+    return name
+
+
+def html_encoding(html, declared=None):
+    """bytes 본문의 문자 인코딩 (응답 헤더 charset, 본문의 <meta charset>, 둘 다 없으면 UTF-8)
+
+    파서에 맡기면 선언이 없는 페이지를 Latin-1로 읽어 한글이 깨지므로 항상 정해서 넘긴다.
+    """
+    if declared and known_encoding(declared):
+        return declared
+    match = META_CHARSET_RE.search(html[:META_SNIFF_BYTES])
+    if match and known_encoding(match.group(1).decode('ascii')):
+        return match.group(1).decode('ascii')
+    return DEFAULT_ENCODING
+
+
+def looks_like_isbn(value):
+    """ISBN 형식(10 또는 13자리)인지 확인"""
+    digits = value.replace('-', '')
+    return bool(value) and set(value) <= ISBN_CHARS and len(digits) in (10, 13)
+
+
+def isbn13_check_digit(digits):
+    """ISBN-13 앞 12자리의 검증 숫자"""
+    total = sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(digits[:12]))
+    return str((10 - total % 10) % 10)
+
+
+def isbn13(value):
+    """ISBN 문자열을 검증된 13자리 숫자로 변환 (ISBN-10은 978로 변환, 아니면 None)
+
+    '979-11-91905-23-6 93000'처럼 부가기호가 붙은 값은 앞의 ISBN만 쓴다.
+    """
+    for token in (value or '').split():
+        digits = token.replace('-', '').upper()
+        if len(digits) == 13 and digits.isdigit() and digits[:3] in ('978', '979'):
+            if isbn13_check_digit(digits) == digits[12]:
+                return digits
+        elif len(digits) == 10 and digits[:9].isdigit() and (digits[9].isdigit() or digits[9] == 'X'):
+            check = 10 if digits[9] == 'X' else int(digits[9])
+            if (sum((10 - i) * int(digit) for i, digit in enumerate(digits[:9])) + check) % 11 == 0:
+                return '978' + digits[:9] + isbn13_check_digit('978' + digits[:9])
+    return None
+
+
+def merge_missing(base, extra):
+    """base의 빈 필드만 extra 값으로 채운 새 딕셔너리 (base에 없는 키는 빈 값이어도 추가)"""
+    merged = dict(base)
+    for field, value in extra.items():
+        if field not in merged or (value and not merged.get(field)):
+            merged[field] = value
+    return merged
+
+
+def find_json_ld_product(blocks):
+    """JSON-LD 블록(문자열 목록)에서 Product 객체 찾기"""
+    for block in blocks:
+        try:
+            data = json.loads(block or '')
+        except ValueError:
+            continue
+
+        candidates = data if isinstance(data, list) else [data]
+        for candidate in list(candidates):
+            if isinstance(candidate, dict) and '@graph' in candidate:
+                candidates.extend(candidate['@graph'])
+
+        for candidate in candidates:
+            if not isinstance(candidate, dict):
+                continue
+            types = candidate.get('@type')
+            types = types if isinstance(types, list) else [types]
+            if 'Product' in types:
+                return candidate
+    return None
+
+
+def json_ld_price(value):
+    """JSON-LD offers.price 값을 숫자로 변환 ('24,000'처럼 천 단위 구분 기호 허용, 해석할 수 없으면 None)"""
+    price = WHITESPACE_RE.sub('', str(value)).replace(',', '')
+    try:
+        return float(price) if '.' in price else int(price)
+    except ValueError:
+        return None
+
+
+def apply_json_ld(blocks, book_data):
+    """JSON-LD Product 정보로 선택자가 채우지 못한 필드 채우기"""
+    product = find_json_ld_product(blocks)
+    if not product:
+        return
+
+    fields = {}
+
+    image = product.get('image')
+    if isinstance(image, list):
+        image = image[0] if image else ''
+    if isinstance(image, dict):
+        image = image.get('url', '')
+    fields['cover_image_url'] = image or ''
+
+    for key in ('isbn', 'gtin13', 'sku'):
+        value = str(product.get(key) or '')
+        if looks_like_isbn(value):
+            fields['isbn'] = value
+            break
+
+    fields['description'] = html_to_text(product.get('description'))
+
+    offers = product.get('offers')
+    if isinstance(offers, list):
+        offers = offers[0] if offers else {}
+    if isinstance(offers, dict) and offers.get('price'):
+        amount = json_ld_price(offers['price'])
+        if amount is not None:
+            currency = '₩' if offers.get('priceCurrency') in (None, 'KRW') else f"{offers['priceCurrency']} "
+            fields['price'] = f"{currency}{amount:,.0f}"
+
+    author = product.get('author')
+    if isinstance(author, dict):
+        author = author.get('name')
+    if isinstance(author, str):
+        fields['author'] = clean_text(author)
+
+    book_data.update(merge_missing(book_data, fields))
+
+
+def _compile(selectors):
+    return [(selector, CSSSelector(selector)) for selector in selectors]
+
+
+class BookExtractor:
+    """lxml 기반 단일 파싱 도서 정보 추출기
+
+    문서를 lxml로 한 번만 파싱하고, 모든 CSS 선택자는 생성 시점에 XPath로
+    컴파일해 둔다. 헤딩과 class가 있는 div는 트리를 한 번 순회하면서 모아
+    커스텀 탭 탐색에 재사용한다. 결과는 BeautifulSoup 경로와 같은 스키마의
+    딕셔너리다.
+    """
+
+    # 스크립트/스타일 내용은 본문 텍스트에서 제외 (BeautifulSoup get_text()와 동일)
+    TEXT_XPATH = etree.XPath(
+        'descendant-or-self::text()[not(parent::script) and not(parent::style)]'
+    )
+
+    JSON_LD_XPATH = etree.XPath('//script[@type="application/ld+json"]/text()')
+
+    def __init__(self):
+        self.price_selectors = _compile(PRICE_SELECTORS)
+        self.image_selectors = _compile(IMAGE_SELECTORS)
+        self.meta_selectors = _compile(META_SELECTORS)
+        self.short_desc_selectors = _compile(SHORT_DESC_SELECTORS)
+        self.tab_selectors = _compile(TAB_SELECTORS)
+        # 인코딩별 lxml 파서
+        self.parsers = {}
+
+    def parse(self, html, encoding=None):
+        """HTML(str 또는 bytes)을 lxml 트리로 파싱
+
+        bytes는 html_encoding으로 정한 인코딩(encoding은 응답 헤더의 charset)으로 읽는다.
+        """
+        if not isinstance(html, bytes):
+            return lxml.html.document_fromstring(html)
+        encoding = html_encoding(html, encoding)
+        if encoding not in self.parsers:
+            self.parsers[encoding] = lxml.html.HTMLParser(encoding=encoding)
+        return lxml.html.document_fromstring(html, parser=self.parsers[encoding])
+
+    def text(self, element):
+        """요소 하위의 모든 텍스트를 이어 붙여 반환"""
+        return ''.join(self.TEXT_XPATH(element))
+
+    def select_one(self, compiled, root):
+        """컴파일된 선택자로 문서 순서상 첫 번째 요소 반환"""
+        matches = compiled(root)
+        return matches[0] if matches else None
+
+    def extract(self, html, book_url, book_title, encoding=None):
+        """상세 페이지 HTML에서 모든 정보 추출 (encoding: 응답 헤더의 charset)"""
+        root = self.parse(html, encoding)
+        book_data = new_book_data(book_url, book_title)
+        headings, class_divs = self.collect_candidates(root)
+
+        # 가격 정보
+        for _, selector in self.price_selectors:
+            price_element = self.select_one(selector, root)
+            if price_element is not None:
+                book_data['price'] = clean_text(self.text(price_element))
+                break
+
+        # 상품 이미지
+        for _, selector in self.image_selectors:
+            img_element = self.select_one(selector, root)
+            if img_element is not None:
+                src = image_source(img_element)
+                if src:
+                    book_data['cover_image_url'] = src
+                    break
+
+        self.extract_product_meta_info(root, book_data)
+        self.extract_product_descriptions(root, book_data)
+        self.extract_tabbed_content(root, book_data)
+        self.extract_custom_tabs(headings, class_divs, book_data)
+
+        # 선택자로 찾지 못한 필드는 JSON-LD 구조화 데이터로 보완
+        apply_json_ld(self.JSON_LD_XPATH(root), book_data)
+
+        return book_data
+
+    def collect_candidates(self, root):
+        """트리를 한 번 순회하며 커스텀 탭 후보(헤딩, class가 있는 div) 수집"""
+        headings = []
+        class_divs = []
+        for element in root.iter():
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+            if tag in HEADING_TAGS:
+                headings.append(element)
+            elif tag == 'div' and element.get('class') is not None:
+                class_divs.append(element)
+        return headings, class_divs
+
+    def extract_product_meta_info(self, root, book_data):
+        """상품 메타 정보 추출 (저자, ISBN, 페이지 수 등)"""
+        for _, selector in self.meta_selectors:
+            meta_section = self.select_one(selector, root)
+            if meta_section is None:
+                continue
+
+            # 테이블 형태
+            for row in meta_section.iter('tr'):
+                th = row.find('.//th')
+                td = row.find('.//td')
+                if th is not None and td is not None:
+                    label = clean_text(self.text(th)).lower()
+                    value = clean_text(self.text(td))
+                    assign_meta_value(label, value, book_data)
+
+            # 정의 목록 형태 (dt, dd)
+            for dt, dd in zip(meta_section.iter('dt'), meta_section.iter('dd')):
+                label = clean_text(self.text(dt)).lower()
+                value = clean_text(self.text(dd))
+                assign_meta_value(label, value, book_data)
+
+            # span 형태 메타 정보
+            for span in meta_section.iter('span'):
+                parse_meta_text(clean_text(self.text(span)), book_data)
+
+    def extract_product_descriptions(self, root, book_data):
+        """짧은 상품 설명 추출"""
+        for _, selector in self.short_desc_selectors:
+            element = self.select_one(selector, root)
+            if element is not None:
+                text = clean_text(self.text(element))
+                if text and len(text) > len(book_data['description']):
+                    book_data['description'] = text
+                break
+
+    def extract_tabbed_content(self, root, book_data):
+        """WooCommerce 탭 콘텐츠 추출 (설명, 리뷰)"""
+        for name, selector in self.tab_selectors:
+            tab_content = self.select_one(selector, root)
+            if tab_content is None:
+                continue
+
+            text = clean_text(self.text(tab_content))
+            if 'description' in name and text:
+                if len(text) > len(book_data['description']):
+                    book_data['description'] = text
+            elif 'review' in name and text:
+                book_data['testimonials'] = text
+
+    def extract_custom_tabs(self, headings, class_divs, book_data):
+        """커스텀 탭 또는 아코디언 형태의 콘텐츠 추출"""
+        for heading in headings:
+            field = match_keyword_field(clean_text(self.text(heading)).lower())
+            if field:
+                content = self.get_content_after_heading(heading)
+                if content and len(content) > len(book_data.get(field, '')):
+                    book_data[field] = content
+
+        # class 이름에 키워드가 있는 div만 후보로 남긴다
+        candidates = []
+        for div in class_divs:
+            field = match_keyword_field(' '.join(div.get('class', '').split()).lower())
+            if field:
+                candidates.append((div, field))
+
+        texts = self.candidate_texts([div for div, _ in candidates])
+        for div, field in candidates:
+            content = clean_text(texts[div])
+            if content and len(content) > len(book_data.get(field, '')):
+                book_data[field] = content
+
+    def candidate_texts(self, candidates):
+        """중첩된 후보 요소들의 텍스트를 각 하위 트리당 한 번씩만 만들어 반환
+
+        안쪽 후보부터 텍스트를 만들고, 바깥 후보는 안쪽 후보의 결과를 재사용한다.
+        후보를 포함하지 않는 하위 트리는 XPath로 한 번에 텍스트를 얻는다.
+        """
+        # 후보를 품고 있는 조상 요소 표시
+        on_path = set()
+        for element in candidates:
+            for ancestor in element.iterancestors():
+                if ancestor in on_path:
+                    break
+                on_path.add(ancestor)
+
+        cache = {}
+
+        def build(element):
+            if element in cache:
+                return cache[element]
+            if element not in on_path:
+                return self.text(element)
+
+            parts = []
+            if element.text and element.tag not in ('script', 'style'):
+                parts.append(element.text)
+            for child in element:
+                if isinstance(child.tag, str):
+                    parts.append(build(child))
+                if child.tail:
+                    parts.append(child.tail)
+            return ''.join(parts)
+
+        # 문서 역순(안쪽 후보 먼저)으로 계산
+        for element in reversed(candidates):
+            if element not in cache:
+                cache[element] = build(element)
+        return cache
+
+    def get_content_after_heading(self, heading):
+        """헤딩 태그 다음의 콘텐츠 추출 (최대 5개 요소, 다음 헤딩 전까지)"""
+        content_parts = []
+
+        def siblings():
+            # lxml은 요소 사이 텍스트를 tail로 보관하므로 요소와 tail을 번갈아 돌려준다
+            yield heading.tail
+            for sibling in heading.itersiblings():
+                if not isinstance(sibling.tag, str):
+                    yield sibling.tail
+                    continue
+                if sibling.tag in HEADING_TAGS:
+                    return
+                yield sibling
+                yield sibling.tail
+
+        for node in siblings():
+            if len(content_parts) >= 5:
+                break
+            if node is None:
+                continue
+
+            text = clean_text(node if isinstance(node, str) else self.text(node))
+            if text:
+                content_parts.append(text)
+
+        return ' '.join(content_parts)
+
+
+class SoupExtractor:
+    """BeautifulSoup(html.parser) 기반 도서 정보 추출기
+
+    BookExtractor 이전의 추출 방식으로, 결과 비교와 --parser soup용으로 남겨 둔다.
+    bs4는 이 추출기를 만들 때만 가져온다.
+    """
+
+    def __init__(self):
+        from bs4 import BeautifulSoup, NavigableString, Tag
+        self.BeautifulSoup = BeautifulSoup
+        self.NavigableString = NavigableString
+        self.Tag = Tag
+
+    def parse(self, html, encoding=None):
+        """HTML(str 또는 bytes)을 BeautifulSoup 트리로 파싱 (bytes는 html_encoding으로 정한 인코딩)"""
+        if isinstance(html, bytes):
+            return self.BeautifulSoup(html, 'html.parser', from_encoding=html_encoding(html, encoding))
+        return self.BeautifulSoup(html, 'html.parser')
+
+    def extract(self, html, book_url, book_title, encoding=None):
+        """상세 페이지 HTML에서 도서 정보 딕셔너리 추출 (encoding: 응답 헤더의 charset)"""
+        soup = self.parse(html, encoding)
+
+        # 기본 정보 추출
+        book_data = new_book_data(book_url, book_title)
+
+        # 가격 정보
+        for selector in PRICE_SELECTORS:
+            price_element = soup.select_one(selector)
+            if price_element:
+                book_data['price'] = clean_text(price_element.get_text())
+                break
+
+        # 상품 이미지
+        for selector in IMAGE_SELECTORS:
+            img_element = soup.select_one(selector)
+            if img_element:
+                src = image_source(img_element)
+                if src:
+                    book_data['cover_image_url'] = src
+                    break
+
+        # 상품 정보 테이블 또는 메타 정보에서 상세 정보 추출
+        self.extract_product_meta_info(soup, book_data)
+
+        # 상품 설명 섹션들 추출
+        self.extract_product_descriptions(soup, book_data)
+
+        # 탭 형태의 추가 정보 추출
+        self.extract_tabbed_content(soup, book_data)
+
+        # 선택자로 찾지 못한 필드는 JSON-LD 구조화 데이터로 보완
+        json_ld = soup.select('script[type="application/ld+json"]')
+        apply_json_ld([script.string for script in json_ld], book_data)
+
+        return book_data
+
+    def extract_product_meta_info(self, soup, book_data):
+        """상품 메타 정보 추출 (저자, ISBN, 페이지 수 등)"""
+        for meta_selector in META_SELECTORS:
+            meta_section = soup.select_one(meta_selector)
+            if meta_section:
+                # 테이블 형태
+                for row in meta_section.find_all('tr'):
+                    self.process_meta_row(row, book_data)
+
+                # 정의 목록 형태 (dt, dd)
+                dt_elements = meta_section.find_all('dt')
+                dd_elements = meta_section.find_all('dd')
+                for dt, dd in zip(dt_elements, dd_elements):
+                    label = clean_text(dt.get_text()).lower()
+                    value = clean_text(dd.get_text())
+                    assign_meta_value(label, value, book_data)
+
+                # span 형태 메타 정보
+                for span in meta_section.find_all('span'):
+                    parse_meta_text(clean_text(span.get_text()), book_data)
+
+    def process_meta_row(self, row, book_data):
+        """테이블 행에서 메타 정보 처리"""
+        th = row.find('th')
+        td = row.find('td')
+
+        if th and td:
+            label = clean_text(th.get_text()).lower()
+            value = clean_text(td.get_text())
+            assign_meta_value(label, value, book_data)
+
+    def extract_product_descriptions(self, soup, book_data):
+        """상품 설명 섹션들 추출"""
+        # 짧은 설명
+        for selector in SHORT_DESC_SELECTORS:
+            element = soup.select_one(selector)
+            if element:
+                text = clean_text(element.get_text())
+                if text and len(text) > len(book_data['description']):
+                    book_data['description'] = text
+                break
+
+    def extract_tabbed_content(self, soup, book_data):
+        """탭 형태의 콘텐츠 추출 (설명, 목차, 리뷰 등)"""
+        # WooCommerce 탭 구조
+        for selector in TAB_SELECTORS:
+            tab_content = soup.select_one(selector)
+            if tab_content:
+                text = clean_text(tab_content.get_text())
+
+                if 'description' in selector and text:
+                    if len(text) > len(book_data['description']):
+                        book_data['description'] = text
+                elif 'review' in selector and text:
+                    book_data['testimonials'] = text
+
+        # 커스텀 탭들 찾기
+        self.extract_custom_tabs(soup, book_data)
+
+    def extract_custom_tabs(self, soup, book_data):
+        """커스텀 탭 또는 아코디언 형태의 콘텐츠 추출"""
+        # 헤딩 태그들 확인 (한국어 키워드는 미리 컴파일된 정규식으로 한 번에 검사)
+        for heading in soup.find_all(list(HEADING_TAGS)):
+            field = match_keyword_field(clean_text(heading.get_text()).lower())
+            if field:
+                # 헤딩 다음의 콘텐츠 찾기
+                content = self.get_content_after_heading(heading)
+                if content and len(content) > len(book_data.get(field, '')):
+                    book_data[field] = content
+
+        # div 클래스명으로 찾기 (키워드가 있는 div만 후보로 남김)
+        candidates = []
+        for div in soup.find_all('div', class_=True):
+            field = match_keyword_field(' '.join(div.get('class', [])).lower())
+            if field:
+                candidates.append((div, field))
+
+        texts = self.candidate_texts([div for div, _ in candidates])
+        for div, field in candidates:
+            content = clean_text(texts[id(div)])
+            if content and len(content) > len(book_data.get(field, '')):
+                book_data[field] = content
+
+    def candidate_texts(self, candidates):
+        """중첩된 후보 div의 텍스트를 하위 트리당 한 번씩만 만들어 id(요소) -> 텍스트로 반환"""
+        # 후보를 품고 있는 조상 요소 표시
+        on_path = set()
+        for element in candidates:
+            for parent in element.parents:
+                if id(parent) in on_path:
+                    break
+                on_path.add(id(parent))
+
+        cache = {}
+
+        def build(element):
+            key = id(element)
+            if key in cache:
+                return cache[key]
+            if key not in on_path:
+                return element.get_text()
+
+            parts = []
+            for child in element.children:
+                if isinstance(child, self.Tag):
+                    parts.append(build(child))
+                elif type(child) is self.NavigableString:
+                    parts.append(str(child))
+            return ''.join(parts)
+
+        # 문서 역순(안쪽 후보 먼저)으로 계산해 바깥 후보가 재사용
+        for element in reversed(candidates):
+            if id(element) not in cache:
+                cache[id(element)] = build(element)
+        return cache
+
+    def get_content_after_heading(self, heading):
+        """헤딩 태그 다음의 콘텐츠 추출 (최대 5개 요소, 다음 헤딩 전까지)"""
+        content_parts = []
+        current = heading.next_sibling
+
+        while current and len(content_parts) < 5:
+            if hasattr(current, 'get_text'):
+                text = clean_text(current.get_text())
+                if text:
+                    content_parts.append(text)
+            elif isinstance(current, str):
+                text = clean_text(current)
+                if text:
+                    content_parts.append(text)
+
+            current = current.next_sibling
+
+            # 다른 헤딩을 만나면 중단
+            if current and hasattr(current, 'name') and current.name in HEADING_TAGS:
+                break
+
+        return ' '.join(content_parts)
@@ -0,0 +1,265 @@
+"""최초 버전 스크레이퍼의 상세 페이지 추출 코드 (벤치마크 기준선 전용, 수정 금지)
+
+complete_goldenrabbit_scraper.py 최초 커밋의 BeautifulSoup 추출 경로를 그대로 옮겨 둔 고정본이다.
+benchmark_extractor.py가 현재 추출 엔진의 속도와 결과를 이 기준선과 비교할 때만 사용한다.
+원본에서 달라진 점은 네트워크 요청·대기·출력을 뺀 것과 bytes 본문을 디코딩하는 것뿐이다.
+"""
+import re
+
+from bs4 import BeautifulSoup
+
+from goldenrabbit_extractor import html_encoding
+
+
+class BaselineExtractor:
+    """최초 버전 GoldenRabbitCompleteScraper의 상세 페이지 추출 메서드 고정본"""
+
+    def extract(self, html, book_url, book_title, encoding=None):
+        """상세 페이지 HTML에서 모든 정보 추출 (최초 버전 extract_book_detail의 파싱 부분)"""
+        if isinstance(html, bytes):
+            html = html.decode(html_encoding(html, encoding), errors='replace')
+
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # 기본 정보 추출
+        book_data = {
+            'title': book_title,
+            'url': book_url,
+            'author': '',
+            'publisher': '골든래빗',
+            'publication_date': '',
+            'price': '',
+            'isbn': '',
+            'page_count': '',
+            'description': '',
+            'table_of_contents': '',
+            'publisher_review': '',
+            'testimonials': '',
+            'cover_image_url': '',
+            'category': 'IT전문서'
+        }
+
+        # 가격 정보
+        price_selectors = [
+            '.price .woocommerce-Price-amount.amount',
+            '.price .amount',
+            'span.price .amount',
+            '.woocommerce-Price-amount',
+        ]
+
+        for selector in price_selectors:
+            price_element = soup.select_one(selector)
+            if price_element:
+                book_data['price'] = self.clean_text(price_element.get_text())
+                break
+
+        # 상품 이미지
+        image_selectors = [
+            '.woocommerce-product-gallery__image img',
+            '.product-image img',
+            '.wp-post-image',
+            'img[class*="attachment"]'
+        ]
+
+        for selector in image_selectors:
+            img_element = soup.select_one(selector)
+            if img_element:
+                src = img_element.get('src') or img_element.get('data-src')
+                if src:
+                    book_data['cover_image_url'] = src
+                    break
+
+        # 상품 정보 테이블 또는 메타 정보에서 상세 정보 추출
+        self.extract_product_meta_info(soup, book_data)
+
+        # 상품 설명 섹션들 추출
+        self.extract_product_descriptions(soup, book_data)
+
+        # 탭 형태의 추가 정보 추출
+        self.extract_tabbed_content(soup, book_data)
+
+        return book_data
+
+    def clean_text(self, text):
+        """텍스트 정리"""
+        if not text:
+            return ""
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def extract_product_meta_info(self, soup, book_data):
+        """상품 메타 정보 추출 (저자, ISBN, 페이지 수 등)"""
+        # 다양한 메타 정보 섹션 찾기
+        meta_selectors = [
+            '.product_meta',
+            '.woocommerce-product-attributes',
+            '.additional-information table',
+            '.product-details',
+            'table.shop_attributes'
+        ]
+
+        for meta_selector in meta_selectors:
+            meta_section = soup.select_one(meta_selector)
+            if meta_section:
+                # 테이블 형태
+                rows = meta_section.find_all('tr')
+                for row in rows:
+                    self.process_meta_row(row, book_data)
+
+                # 정의 목록 형태 (dt, dd)
+                dt_elements = meta_section.find_all('dt')
+                dd_elements = meta_section.find_all('dd')
+                for dt, dd in zip(dt_elements, dd_elements):
+                    label = self.clean_text(dt.get_text()).lower()
+                    value = self.clean_text(dd.get_text())
+                    self.assign_meta_value(label, value, book_data)
+
+                # span 형태 메타 정보
+                spans = meta_section.find_all('span')
+                for span in spans:
+                    text = self.clean_text(span.get_text())
+                    self.parse_meta_text(text, book_data)
+
+    def process_meta_row(self, row, book_data):
+        """테이블 행에서 메타 정보 처리"""
+        th = row.find('th')
+        td = row.find('td')
+
+        if th and td:
+            label = self.clean_text(th.get_text()).lower()
+            value = self.clean_text(td.get_text())
+            self.assign_meta_value(label, value, book_data)
+
+    def assign_meta_value(self, label, value, book_data):
+        """라벨에 따라 적절한 필드에 값 할당"""
+        if not value:
+            return
+
+        if '저자' in label or 'author' in label:
+            book_data['author'] = value
+        elif 'isbn' in label:
+            book_data['isbn'] = value
+        elif '페이지' in label or 'page' in label:
+            book_data['page_count'] = value
+        elif '출간' in label or 'publish' in label or '발행' in label:
+            book_data['publication_date'] = value
+        elif '크기' in label or '판형' in label or 'size' in label:
+            book_data['size'] = value
+
+    def parse_meta_text(self, text, book_data):
+        """일반 텍스트에서 메타 정보 파싱"""
+        # "저자 : 홍길동" 형태
+        if ':' in text:
+            parts = text.split(':', 1)
+            if len(parts) == 2:
+                label = self.clean_text(parts[0]).lower()
+                value = self.clean_text(parts[1])
+                self.assign_meta_value(label, value, book_data)
+
+    def extract_product_descriptions(self, soup, book_data):
+        """상품 설명 섹션들 추출"""
+        # 짧은 설명
+        short_desc_selectors = [
+            '.woocommerce-product-details__short-description',
+            '.product-short-description',
+            '.entry-summary .product-excerpt'
+        ]
+
+        for selector in short_desc_selectors:
+            element = soup.select_one(selector)
+            if element:
+                text = self.clean_text(element.get_text())
+                if text and len(text) > len(book_data['description']):
+                    book_data['description'] = text
+                break
+
+    def extract_tabbed_content(self, soup, book_data):
+        """탭 형태의 콘텐츠 추출 (설명, 목차, 리뷰 등)"""
+        # WooCommerce 탭 구조
+        tab_selectors = [
+            '#tab-description',
+            '#tab-reviews',
+            '#tab-additional_information',
+            '.woocommerce-Tabs-panel--description',
+            '.woocommerce-Tabs-panel--additional_information',
+            '.woocommerce-Tabs-panel--reviews'
+        ]
+
+        for selector in tab_selectors:
+            tab_content = soup.select_one(selector)
+            if tab_content:
+                text = self.clean_text(tab_content.get_text())
+
+                if 'description' in selector and text:
+                    if len(text) > len(book_data['description']):
+                        book_data['description'] = text
+                elif 'review' in selector and text:
+                    book_data['testimonials'] = text
+
+        # 커스텀 탭들 찾기
+        self.extract_custom_tabs(soup, book_data)
+
+    def extract_custom_tabs(self, soup, book_data):
+        """커스텀 탭 또는 아코디언 형태의 콘텐츠 추출"""
+        # 한국어 키워드로 섹션 찾기
+        keywords_map = {
+            '목차': 'table_of_contents',
+            '차례': 'table_of_contents',
+            '출판사': 'publisher_review',
+            '출판사리뷰': 'publisher_review',
+            '출판사 리뷰': 'publisher_review',
+            '추천': 'testimonials',
+            '추천평': 'testimonials',
+            '서평': 'testimonials',
+            '리뷰': 'testimonials',
+            '책소개': 'description',
+            '내용': 'description',
+            '소개': 'description'
+        }
+
+        # 헤딩 태그들 확인
+        headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        for heading in headings:
+            heading_text = self.clean_text(heading.get_text()).lower()
+
+            for keyword, field in keywords_map.items():
+                if keyword in heading_text:
+                    # 헤딩 다음의 콘텐츠 찾기
+                    content = self.get_content_after_heading(heading)
+                    if content and len(content) > len(book_data.get(field, '')):
+                        book_data[field] = content
+                    break
+
+        # div 클래스명으로 찾기
+        div_classes = soup.find_all('div', class_=True)
+        for div in div_classes:
+            class_text = ' '.join(div.get('class', [])).lower()
+
+            for keyword, field in keywords_map.items():
+                if keyword in class_text:
+                    content = self.clean_text(div.get_text())
+                    if content and len(content) > len(book_data.get(field, '')):
+                        book_data[field] = content
+                    break
+
+    def get_content_after_heading(self, heading):
+        """헤딩 태그 다음의 콘텐츠 추출"""
+        content_parts = []
+        current = heading.next_sibling
+
+        while current and len(content_parts) < 5:  # 최대 5개 요소까지
+            if hasattr(current, 'get_text'):
+                text = self.clean_text(current.get_text())
+                if text:
+                    content_parts.append(text)
+            elif isinstance(current, str):
+                text = self.clean_text(current)
+                if text:
+                    content_parts.append(text)
+
+            current = current.next_sibling
+
+            # 다른 헤딩을 만나면 중단
+            if current and hasattr(current, 'name') and current.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+                break
+
+        return ' '.join(content_parts)
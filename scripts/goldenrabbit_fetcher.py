@@ -0,0 +1,294 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from goldenrabbit_metrics import Metrics
+
+
+# 서버 과부하/일시 장애로 보고 다시 시도하는 상태 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 다시 시도하는 네트워크 오류
+RETRY_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# Retry-After가 이보다 길면 기다리지 않고 실패로 처리 (초)
+MAX_RETRY_AFTER = 300
+
+
+class TokenBucket:
+    """호스트별 토큰 버킷 레이트 리미터 (초당 rate개, 최대 burst개)"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        if not self.rate or self.rate <= 0:
+            return
+
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 변환 (해석할 수 없으면 None)"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """지수 백오프 + 전체 지터 (0 ~ base * 2^attempt, 최대 cap초)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class HostLimiter:
+    """호스트 하나의 동시 요청 창과 요청 속도를 AIMD로 조절하는 리미터
+
+    응답이 목표 지연 시간 안에 성공하면 창과 속도를 조금씩(1/현재값) 늘리고,
+    429/5xx, 네트워크 오류, 목표를 넘는 지연이 관측되면 절반으로 줄인다.
+    한 번 줄인 뒤 cooldown초 동안은 다시 줄이지 않아, 동시에 실패한 요청들
+    때문에 창이 한꺼번에 바닥까지 떨어지지 않게 한다.
+    """
+
+    def __init__(self, window, max_window, rate, max_rate, burst, target_latency=2.0):
+        self.window = float(window)
+        self.max_window = max(window, max_window)
+        self.rate = rate
+        self.max_rate = max(rate, max_rate) if rate and rate > 0 else rate
+        self.min_rate = min(rate, 0.2) if rate and rate > 0 else rate
+        self.burst = burst
+        self.target_latency = target_latency
+        self.cooldown = max(1.0, target_latency)
+        self.last_decrease = 0.0
+        self.blocked_until = 0.0
+        self.bind()
+
+    def bind(self):
+        """현재 이벤트 루프용 동기화 객체를 새로 만든다 (학습한 창과 속도는 유지)"""
+        self.in_flight = 0
+        self.condition = asyncio.Condition()
+        self.bucket = TokenBucket(self.rate, self.burst)
+
+    async def acquire(self):
+        """Retry-After 대기, 동시 요청 창, 토큰 버킷을 차례로 통과할 때까지 대기"""
+        delay = self.blocked_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.window))
+            self.in_flight += 1
+        await self.bucket.acquire()
+
+    async def release(self):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def block(self, seconds):
+        """Retry-After 동안 이 호스트로의 새 요청을 모두 멈춘다"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def on_success(self, latency):
+        """성공 응답 반영 (느리면 혼잡으로 간주)"""
+        if latency > self.target_latency:
+            self.on_congestion()
+            return
+
+        self.window = min(self.max_window, self.window + 1 / self.window)
+        if self.rate and self.rate > 0:
+            self.set_rate(min(self.max_rate, self.rate + 1 / self.rate))
+
+    def on_congestion(self):
+        """혼잡 신호 반영: 창과 속도를 절반으로"""
+        now = time.monotonic()
+        if now - self.last_decrease < self.cooldown:
+            return
+        self.last_decrease = now
+
+        self.window = max(1.0, self.window / 2)
+        if self.rate and self.rate > 0:
+            self.set_rate(max(self.min_rate, self.rate / 2))
+
+    def set_rate(self, rate):
+        self.rate = rate
+        self.bucket.rate = rate
+
+
+class AsyncFetcher:
+    """재시도 + 호스트별 적응형(AIMD) 동시성/레이트 리미트를 적용한 비동기 페이지 수집기
+
+    requests.Session 호출은 블로킹이므로 전용 스레드 풀에서 실행한다.
+    concurrency와 rate는 시작 값이고, 서버 응답에 따라 max_concurrency와
+    max_rate 사이에서 자동으로 조절된다. 연결 풀도 max_concurrency에 맞춘다.
+    """
+
+    def __init__(self, session, concurrency=4, rate=2.0, burst=None, timeout=30,
+                 max_concurrency=None, max_rate=None, retries=3, target_latency=2.0, metrics=None):
+        self.session = session
+        self.concurrency = max(1, concurrency)
+        self.max_concurrency = max(self.concurrency, max_concurrency or self.concurrency * 2)
+        self.rate = rate
+        self.max_rate = max_rate if max_rate is not None else rate * 2
+        self.burst = burst if burst is not None else self.concurrency
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.target_latency = target_latency
+        # 요청 수, 수집 바이트, 요청 시간, 재시도 수는 공유 측정기에 기록
+        self.metrics = metrics or Metrics()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self._loop = None
+        self._limiters = {}
+
+        # 동시 요청 수만큼 연결을 재사용하도록 연결 풀 크기 조정
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency, pool_maxsize=self.max_concurrency)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+    def _ensure_loop(self):
+        """이벤트 루프가 바뀌면 루프에 묶인 동기화 객체를 새로 만든다"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            for limiter in self._limiters.values():
+                limiter.bind()
+        return loop
+
+    def limiter_for(self, url):
+        """URL의 호스트에 해당하는 리미터 반환"""
+        host = urlsplit(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = HostLimiter(
+                self.concurrency, self.max_concurrency, self.rate, self.max_rate,
+                self.burst, self.target_latency,
+            )
+        return self._limiters[host]
+
+    def configure_host(self, url, concurrency=None, rate=None):
+        """URL의 호스트에만 동시 요청 수와 초당 요청 수 상한을 따로 지정
+
+        외부 서점 검색처럼 더 조심스럽게 다뤄야 하는 호스트용으로, 지정한 값은
+        늘리지 않는 상한이다 (혼잡 신호에 따라 줄었다가 상한까지만 회복).
+        """
+        host = urlsplit(url).netloc
+        concurrency = max(1, min(concurrency or self.concurrency, self.max_concurrency))
+        rate = self.rate if rate is None else rate
+        self._limiters[host] = HostLimiter(concurrency, concurrency, rate, rate, concurrency, self.target_latency)
+        return self._limiters[host]
+
+    def bucket_for(self, url):
+        """URL의 호스트에 해당하는 토큰 버킷 반환"""
+        return self.limiter_for(url).bucket
+
+    async def fetch(self, url, headers=None):
+        """URL 하나를 가져와 requests.Response 반환
+
+        429/5xx 응답과 네트워크 오류는 Retry-After(없으면 지수 백오프 + 지터)만큼
+        기다린 뒤 retries번까지 다시 시도한다. 끝까지 실패하면 마지막 응답을
+        돌려주거나(호출한 쪽의 raise_for_status가 처리) 마지막 오류를 던진다.
+        """
+        loop = self._ensure_loop()
+        limiter = self.limiter_for(url)
+
+        def timed_get():
+            # 지연 시간은 워커 스레드 안에서 요청만 잰다. 이벤트 루프에서 재면 같은 루프의
+            # 파싱 같은 CPU 작업으로 늦게 깨어난 시간까지 더해져 리미터가 괜히 속도를 줄인다.
+            started = time.monotonic()
+            try:
+                return self.session.get(url, timeout=self.timeout, headers=headers), None, time.monotonic() - started
+            except RETRY_EXCEPTIONS as e:
+                return None, e, time.monotonic() - started
+
+        for attempt in range(self.retries + 1):
+            await limiter.acquire()
+            try:
+                self.metrics.incr('requests')
+                response, error, latency = await loop.run_in_executor(self.executor, timed_get)
+            finally:
+                await limiter.release()
+            self.metrics.observe('fetch_seconds', latency)
+            if response is not None:
+                self.metrics.incr('bytes_fetched', len(response.content))
+            self.metrics.log(
+                'fetch', url=url, status=response.status_code if response is not None else None,
+                bytes=len(response.content) if response is not None else 0,
+                seconds=round(latency, 4), attempt=attempt + 1,
+                error=type(error).__name__ if error is not None else None,
+            )
+
+            if error is None and response.status_code not in RETRY_STATUSES:
+                limiter.on_success(latency)
+                return response
+
+            limiter.on_congestion()
+            retry_after = None
+            if response is not None:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    self.metrics.incr('throttled')
+
+            if attempt == self.retries or (retry_after or 0) > MAX_RETRY_AFTER:
+                self.metrics.incr('fetch_errors')
+                if error is not None:
+                    raise error
+                return response
+
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            if retry_after is not None:
+                limiter.block(delay)
+            reason = f"HTTP {response.status_code}" if response is not None else type(error).__name__
+            print(f"🔁 재시도 {attempt + 1}/{self.retries} ({reason}, {delay:.1f}초 후): {url}")
+            self.metrics.incr('retries')
+            self.metrics.log('retry', url=url, reason=reason, delay=round(delay, 3), attempt=attempt + 1)
+            await asyncio.sleep(delay)
+
+    def print_stats(self):
+        """요청/재시도 통계와 호스트별 최종 창·속도 출력"""
+        counters = self.metrics.counters
+        if not counters.get('requests'):
+            return
+        print(f"🌐 요청 {counters['requests']}회, 재시도 {counters.get('retries', 0)}회, "
+              f"Retry-After {counters.get('throttled', 0)}회, 최종 실패 {counters.get('fetch_errors', 0)}회")
+        for host, limiter in self._limiters.items():
+            rate = f"{limiter.rate:.1f}/초" if limiter.rate and limiter.rate > 0 else "제한 없음"
+            print(f"  - {host}: 동시 요청 {int(limiter.window)}개, 속도 {rate}")
+
+    def close(self):
+        """스레드 풀 종료"""
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,136 @@
+import asyncio
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from goldenrabbit_fetcher import backoff_delay
+
+
+LISTING_URL = "https://goldenrabbit.co.kr/product-category/books/"
+
+# 상품 목록에서 도서 링크를 찾는 선택자 (Selenium 경로와 동일한 구조)
+BOOK_LINK_SELECTORS = [
+    "ul.products li.product h3 a",
+    "ul.products li.product .woocommerce-loop-product__title a",
+    "ul.products li.product a.woocommerce-LoopProduct-link",
+]
+
+# 목록 페이지 하나를 (수집기 자체 재시도와 별도로) 다시 요청하는 횟수
+LISTING_PAGE_RETRIES = 2
+
+
+def listing_page_url(base_url, page):
+    """WooCommerce 카테고리의 N번째 페이지 URL
+
+    끝에 '/'가 없으면 urljoin이 마지막 경로(카테고리)를 버리므로 먼저 붙인다.
+    """
+    if not base_url.endswith('/'):
+        base_url += '/'
+    if page <= 1:
+        return base_url
+    return urljoin(base_url, f"page/{page}/")
+
+
+def parse_listing_page(html, page_url):
+    """목록 페이지 HTML에서 도서 제목과 URL 추출"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for selector in BOOK_LINK_SELECTORS:
+        elements = soup.select(selector)
+        if not elements:
+            continue
+
+        book_links = []
+        for element in elements:
+            title = element.get_text(strip=True)
+            href = element.get('href')
+            if title and href:
+                book_links.append({
+                    'title': title,
+                    'url': urljoin(page_url, href)
+                })
+        return book_links
+
+    return []
+
+
+class ListingEnumerator:
+    """브라우저 없이 페이지네이션된 카테고리 목록을 병렬로 순회
+
+    한 번에 batch_size개 페이지를 요청하고, 404 또는 상품이 없는 페이지를
+    만나면 순회를 끝낸다. 클릭 횟수 제한이 없으므로 목록 길이에 상관없이
+    모든 도서를 찾는다.
+
+    오류가 난 페이지는 LISTING_PAGE_RETRIES번 다시 요청하고, 그래도 실패하면
+    failed_pages에 남긴 채 나머지 페이지의 도서로 순회를 이어 간다.
+    한 묶음의 페이지가 모두 실패하면 더 진행하지 않는다.
+    """
+
+    def __init__(self, fetcher, base_url=LISTING_URL, batch_size=None):
+        self.fetcher = fetcher
+        self.base_url = base_url
+        self.batch_size = batch_size or fetcher.concurrency
+        # 다시 요청해도 실패한 목록 페이지 번호 (있으면 목록이 불완전함)
+        self.failed_pages = []
+
+    async def fetch_page(self, page):
+        """목록 페이지 하나를 가져와 도서 링크 목록 반환 (마지막 페이지 이후면 None)"""
+        url = listing_page_url(self.base_url, page)
+        response = await self.fetcher.fetch(url)
+
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+
+        book_links = parse_listing_page(response.content, url)
+        print(f"📄 목록 페이지 {page}: {len(book_links)}개 도서")
+        return book_links or None
+
+    async def fetch_page_retrying(self, page):
+        """fetch_page를 오류가 나면 백오프 후 LISTING_PAGE_RETRIES번까지 다시 시도"""
+        for attempt in range(LISTING_PAGE_RETRIES + 1):
+            try:
+                return await self.fetch_page(page)
+            except Exception as e:
+                if attempt == LISTING_PAGE_RETRIES:
+                    raise
+                print(f"🔁 목록 페이지 {page} 다시 요청 ({attempt + 1}/{LISTING_PAGE_RETRIES}): {e}")
+                await asyncio.sleep(backoff_delay(attempt))
+
+    async def enumerate(self):
+        """모든 목록 페이지를 순회하여 중복 없는 도서 링크 목록 반환"""
+        book_links = []
+        seen = set()
+        page = 1
+
+        while True:
+            pages = range(page, page + self.batch_size)
+            results = await asyncio.gather(*(self.fetch_page_retrying(n) for n in pages),
+                                           return_exceptions=True)
+
+            finished = False
+            for number, result in zip(pages, results):
+                if isinstance(result, Exception):
+                    # 실패한 페이지는 목록의 끝이 아니므로 기록만 하고 계속
+                    print(f"❌ 목록 페이지 {number} 수집 실패: {result}")
+                    self.failed_pages.append(number)
+                    continue
+
+                # 빈 페이지 이후의 결과는 무시 (페이지 순서 유지)
+                if result is None:
+                    finished = True
+                    break
+
+                for link in result:
+                    if link['url'] not in seen:
+                        seen.add(link['url'])
+                        book_links.append(link)
+
+            if finished:
+                break
+            if all(isinstance(result, Exception) for result in results):
+                print(f"❌ 목록 페이지 {page}~{page + self.batch_size - 1}이 모두 실패해 순회를 멈춥니다.")
+                break
+            page += self.batch_size
+
+        return book_links
@@ -0,0 +1,278 @@
+"""스크래핑 결과를 books 테이블 적재용 SQL로 변환
+
+사용법:
+    python goldenrabbit_loader.py <결과 JSON/JSONL> [--format insert|copy] [--batch-size 50] [--output 파일]
+
+- insert: 임시 테이블(books_stage)에 여러 행을 묶은 INSERT 후 한 번에 upsert
+- copy:   임시 테이블로 COPY ... FROM STDIN 후 한 번에 upsert
+
+도서 id는 상품 URL에서 만든 UUIDv5라서 같은 도서는 항상 같은 id를 가진다.
+따라서 생성된 SQL은 여러 번 실행해도 중복 행을 만들지 않는다.
+
+첫 적재: 이전 방식(insert_goldenrabbit_books_20250723_163518.sql)으로 넣은 행은
+임의의 UUIDv4를 id로 가지고 있어 UUIDv5와 맞지 않는다. 그래서 upsert 전에
+임시 테이블의 id를 제목(공백·대소문자 무시)이 같은 기존 행의 id로 바꾼다.
+books.id는 다른 테이블이 참조하므로 기존 id를 다시 만들지 않고 그대로 쓴다.
+제목이 바뀐 도서나 제목이 겹치는 도서는 맞출 수 없어 새 행으로 들어가므로,
+첫 적재 전에 books 테이블 내보내기와 goldenrabbit_diff.py로 추가될 도서를 확인한다.
+"""
+import argparse
+import json
+import re
+import uuid
+from datetime import datetime
+
+from goldenrabbit_record import BookRecord
+from goldenrabbit_sink import iter_jsonl
+
+
+BOOK_COLUMNS = [
+    'id', 'title', 'author', 'category', 'price', 'description', 'cover_image_url',
+    'isbn', 'page_count', 'publication_date', 'table_of_contents', 'author_bio',
+    'is_featured', 'is_active', 'publisher_review', 'testimonials', 'yes24_link',
+    'kyobo_link', 'aladin_link', 'ridibooks_link', 'size', 'created_at', 'updated_at',
+]
+
+# 재적재 시 스크래핑 값으로 덮어쓰는 컬럼
+UPDATE_COLUMNS = [
+    'title', 'author', 'category', 'price', 'description', 'cover_image_url', 'isbn',
+    'page_count', 'publication_date', 'table_of_contents', 'publisher_review',
+    'testimonials', 'size', 'updated_at',
+]
+
+# 새 값이 있을 때만 덮어쓰는 컬럼 (관리자가 직접 입력한 값 보존)
+PRESERVE_IF_NULL_COLUMNS = ['yes24_link', 'kyobo_link', 'aladin_link', 'ridibooks_link']
+
+# 결과에 키가 없으면 '수집하지 않음'으로 보고 기존 값을 그대로 두는 컬럼
+# (예: --structured에서 HTML 보완 없이 끝난 도서의 목차, 출판사 리뷰, 추천평)
+KEEP_IF_MISSING_COLUMNS = ['description', 'table_of_contents', 'publisher_review', 'testimonials']
+
+# 행 딕셔너리에서 수집하지 않은 컬럼 목록을 담는 키 (books 컬럼 아님)
+UNKNOWN_KEY = 'unknown_columns'
+
+WHITESPACE_RE = re.compile(r'\s')
+
+# 상품 URL로 도서 id를 만들 때 쓰는 네임스페이스
+BOOK_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'https://goldenrabbit.co.kr/')
+
+
+def book_id(book):
+    """상품 URL(없으면 ISBN, 제목)로 만든 고정 UUID"""
+    key = book.get('url') or book.get('isbn') or book.get('title', '')
+    return str(uuid.uuid5(BOOK_ID_NAMESPACE, key))
+
+
+def empty_to_none(value):
+    """빈 문자열을 NULL로"""
+    return value if value not in ('', None) else None
+
+
+def book_to_row(book, now=None):
+    """스크래핑한 도서 정보(딕셔너리 또는 BookRecord)를 books 테이블 컬럼 딕셔너리로 변환
+
+    가격·페이지 수는 정수, 출간일은 ISO 날짜, ISBN은 검증된 13자리로 정규화된다.
+    결과에 키가 없던 KEEP_IF_MISSING_COLUMNS는 UNKNOWN_KEY에 모아 적재 때 덮어쓰지 않는다.
+    """
+    now = now or datetime.now().isoformat()
+    record = book if isinstance(book, BookRecord) else BookRecord.from_dict(book)
+    extra = record.extra
+    return {
+        'id': book_id({'url': record.url, 'isbn': record.isbn, 'title': record.title}),
+        'title': record.title,
+        'author': empty_to_none(record.author),
+        'category': record.category,
+        'price': record.price,
+        'description': empty_to_none(record.description),
+        'cover_image_url': empty_to_none(record.cover_image_url),
+        'isbn': record.isbn,
+        'page_count': record.page_count or 0,
+        'publication_date': record.publication_date.isoformat() if record.publication_date else None,
+        'table_of_contents': empty_to_none(record.table_of_contents),
+        'author_bio': empty_to_none(record.author_bio),
+        'is_featured': False,
+        'is_active': True,
+        'publisher_review': empty_to_none(record.publisher_review),
+        'testimonials': empty_to_none(record.testimonials),
+        'yes24_link': empty_to_none(extra.get('yes24_link')),
+        'kyobo_link': empty_to_none(extra.get('kyobo_link')),
+        'aladin_link': empty_to_none(extra.get('aladin_link')),
+        'ridibooks_link': empty_to_none(extra.get('ridibooks_link')),
+        'size': empty_to_none(record.size),
+        'created_at': now,
+        'updated_at': now,
+        UNKNOWN_KEY: tuple(column for column in KEEP_IF_MISSING_COLUMNS if column not in record.texts),
+    }
+
+
+def load_books(path):
+    """결과 파일(JSON의 {"book_N": ...} 또는 JSONL)에서 도서 정보를 한 건씩 반환"""
+    if path.endswith('.jsonl'):
+        yield from iter_jsonl(path)
+        return
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    yield from (data.values() if isinstance(data, dict) else data)
+
+
+def sql_literal(value):
+    """파이썬 값을 PostgreSQL 리터럴로 변환"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def copy_literal(value):
+    """파이썬 값을 COPY text 형식 필드로 변환"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    text = str(value)
+    return (text.replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def upsert_clause(table='books', keep=()):
+    """id 충돌 시 갱신할 컬럼 목록 (keep의 컬럼은 기존 값 유지)"""
+    assignments = [f"{column} = EXCLUDED.{column}" for column in UPDATE_COLUMNS if column not in keep]
+    assignments += [
+        f"{column} = COALESCE(EXCLUDED.{column}, {table}.{column})"
+        for column in PRESERVE_IF_NULL_COLUMNS
+    ]
+    return "ON CONFLICT (id) DO UPDATE SET\n  " + ",\n  ".join(assignments)
+
+
+def title_key(title):
+    """제목 비교용 키 (공백 제거, 소문자, title_key_sql과 같은 규칙)"""
+    return WHITESPACE_RE.sub('', (title or '').lower())
+
+
+def title_key_sql(column):
+    """제목 비교용 SQL 식 (공백 제거, 소문자)"""
+    return f"regexp_replace(lower({column}), '\\s', '', 'g')"
+
+
+def stage_statement():
+    """트랜잭션이 끝나면 사라지는 임시 적재 테이블 생성문 (수집하지 않은 컬럼 목록 컬럼 추가)"""
+    return ("CREATE TEMP TABLE books_stage (LIKE books INCLUDING DEFAULTS) ON COMMIT DROP;\n"
+            f"ALTER TABLE books_stage ADD COLUMN {UNKNOWN_KEY} text;\n")
+
+
+def unknown_literal(row):
+    """행의 수집하지 않은 컬럼 목록을 임시 테이블 값으로 (없으면 None)"""
+    return ','.join(row.get(UNKNOWN_KEY) or ()) or None
+
+
+def merge_statements(unknown_sets=(None,)):
+    """임시 테이블의 id를 기존 행 id로 맞춘 뒤 books에 upsert하는 SQL
+
+    id가 books에 없는 행은 제목이 같은 기존 행(양쪽 모두에서 제목이 유일한 경우만)의
+    id를 쓴다. 이전 방식으로 넣은 UUIDv4 행도 중복 없이 갱신된다.
+    upsert는 수집하지 않은 컬럼 조합(unknown_sets)별로 나눠, 그 컬럼은 덮어쓰지 않는다.
+    """
+    columns = ', '.join(BOOK_COLUMNS)
+    stage_title, books_title = title_key_sql('s.title'), title_key_sql('b.title')
+    yield (
+        "UPDATE books_stage s SET id = b.id\n"
+        "FROM books b\n"
+        "WHERE NOT EXISTS (SELECT 1 FROM books e WHERE e.id = s.id)\n"
+        f"  AND {books_title} = {stage_title}\n"
+        f"  AND (SELECT count(*) FROM books x WHERE {title_key_sql('x.title')} = {stage_title}) = 1\n"
+        f"  AND (SELECT count(*) FROM books_stage y WHERE {title_key_sql('y.title')} = {stage_title}) = 1;\n"
+    )
+    for unknown in sorted(set(unknown_sets), key=lambda value: value or ''):
+        condition = f"{UNKNOWN_KEY} IS NULL" if unknown is None else f"{UNKNOWN_KEY} = {sql_literal(unknown)}"
+        keep = unknown.split(',') if unknown else ()
+        yield (f"INSERT INTO books ({columns})\nSELECT {columns} FROM books_stage WHERE {condition}\n"
+               f"{upsert_clause(keep=keep)};\n")
+
+
+def insert_statements(rows, batch_size=50):
+    """임시 테이블에 batch_size개씩 묶은 다중 행 INSERT 후 한 번에 upsert하는 SQL 생성 (행이 없으면 없음)"""
+    columns = ', '.join(BOOK_COLUMNS + [UNKNOWN_KEY])
+    batch = []
+    unknown_sets = set()
+
+    def flush():
+        values = ',\n'.join(
+            '(' + ', '.join([sql_literal(row[column]) for column in BOOK_COLUMNS]
+                            + [sql_literal(unknown_literal(row))]) + ')'
+            for row in batch
+        )
+        return f"INSERT INTO books_stage ({columns}) VALUES\n{values};\n"
+
+    for row in rows:
+        if not unknown_sets:
+            yield stage_statement()
+        unknown_sets.add(unknown_literal(row))
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield flush()
+            batch = []
+    if batch:
+        yield flush()
+    if unknown_sets:
+        yield from merge_statements(unknown_sets)
+
+
+def copy_statements(rows):
+    """임시 테이블에 COPY로 적재한 뒤 한 번에 upsert하는 SQL 생성"""
+    columns = ', '.join(BOOK_COLUMNS + [UNKNOWN_KEY])
+    unknown_sets = set()
+    yield stage_statement()
+    yield f"COPY books_stage ({columns}) FROM STDIN;\n"
+    for row in rows:
+        unknown = unknown_literal(row)
+        unknown_sets.add(unknown)
+        yield '\t'.join([copy_literal(row[column]) for column in BOOK_COLUMNS] + [copy_literal(unknown)]) + '\n'
+    yield "\\.\n"
+    yield from merge_statements(unknown_sets or (None,))
+
+
+def write_sql(books, output_path, fmt='insert', batch_size=50):
+    """도서 정보를 적재용 SQL 파일로 저장하고 도서 수 반환"""
+    now = datetime.now()
+    count = 0
+
+    def rows():
+        nonlocal count
+        for book in books:
+            count += 1
+            yield book_to_row(book, now.isoformat())
+
+    statements = copy_statements(rows()) if fmt == 'copy' else insert_statements(rows(), batch_size)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(f"-- 골든래빗 도서 데이터 {fmt.upper()} SQL\n")
+        f.write(f"-- 생성일: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write("BEGIN;\n\n")
+        for statement in statements:
+            f.write(statement)
+        f.write("\nCOMMIT;\n")
+        f.write(f"-- 총 {count}개 도서\n")
+
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑 결과를 books 테이블 적재 SQL로 변환")
+    parser.add_argument('input', help="스크래핑 결과 JSON 또는 JSONL")
+    parser.add_argument('--format', choices=['insert', 'copy'], default='insert',
+                        help="출력 형식 (기본값: insert)")
+    parser.add_argument('--batch-size', type=int, default=50,
+                        help="INSERT 한 문장에 묶을 행 수 (기본값: 50)")
+    parser.add_argument('--output', default=None, help="출력 SQL 경로")
+    args = parser.parse_args()
+
+    output = args.output or f"{args.format}_goldenrabbit_books_{datetime.now().strftime('%Y%m%d_%H%M%S')}.sql"
+    count = write_sql(load_books(args.input), output, args.format, args.batch_size)
+    print(f"💾 {count}개 도서의 적재 SQL을 {output}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
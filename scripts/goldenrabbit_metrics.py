@@ -0,0 +1,196 @@
+import cProfile
+import json
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# Prometheus 지표 이름 접두사
+METRIC_PREFIX = 'goldenrabbit_scraper'
+
+
+def percentile(sorted_values, q):
+    """정렬된 값 목록의 q 분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Metrics:
+    """수집 단계별 소요 시간, 처리량, 큐 깊이, 재시도 수를 모으는 측정기
+
+    - stage(name): 단계(브라우저 시작, 목록, 상세, 기록 등)의 경과 시간 누적
+    - observe(name, seconds): 페이지별 시간 표본 (요청, 파싱, 기록)
+    - incr(name, n): 누적 카운터 (요청 수, 수집 바이트, 재시도 수 등)
+    - gauge(name, value): 현재 값과 최대값 (큐 깊이 등)
+
+    log_path를 지정하면 모든 이벤트를 한 줄에 하나씩 JSON으로 기록하고,
+    종료 시 write()로 JSON 요약 또는 Prometheus textfile을 저장한다.
+    """
+
+    def __init__(self, log_path=None):
+        self.started = time.monotonic()
+        self.stages = {}
+        self.counters = {}
+        self.timings = {}
+        self.gauges = {}
+        self.log_file = open(log_path, 'a', encoding='utf-8') if log_path else None
+
+    def incr(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        self.timings.setdefault(name, []).append(seconds)
+
+    def gauge(self, name, value):
+        current = self.gauges.setdefault(name, {'last': value, 'max': value})
+        current['last'] = value
+        current['max'] = max(current['max'], value)
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록의 경과 시간을 단계 시간에 더한다"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            self.log('stage', stage=name, seconds=round(elapsed, 4))
+
+    def log(self, event, **fields):
+        """구조화 로그 한 줄 기록 (log_path가 없으면 무시)"""
+        if not self.log_file:
+            return
+        record = {'ts': datetime.now().isoformat(timespec='milliseconds'), 'event': event, **fields}
+        self.log_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def timing_summary(self, values):
+        values = sorted(values)
+        total = sum(values)
+        return {
+            'count': len(values),
+            'sum': round(total, 4),
+            'mean': round(total / len(values), 4) if values else 0.0,
+            'p50': round(percentile(values, 0.50), 4),
+            'p99': round(percentile(values, 0.99), 4),
+            'max': round(values[-1], 4) if values else 0.0,
+        }
+
+    def summary(self):
+        """측정 결과 요약 딕셔너리"""
+        elapsed = time.monotonic() - self.started
+        books = self.counters.get('books_written', 0)
+        return {
+            'elapsed_seconds': round(elapsed, 3),
+            'books_per_second': round(books / elapsed, 3) if elapsed else 0.0,
+            'stages': {name: round(seconds, 3) for name, seconds in self.stages.items()},
+            'counters': dict(self.counters),
+            'timings': {name: self.timing_summary(values) for name, values in self.timings.items()},
+            'gauges': dict(self.gauges),
+        }
+
+    def prometheus_lines(self):
+        """Prometheus textfile collector 형식의 지표 줄"""
+        summary = self.summary()
+        lines = [
+            f"# TYPE {METRIC_PREFIX}_elapsed_seconds gauge",
+            f"{METRIC_PREFIX}_elapsed_seconds {summary['elapsed_seconds']}",
+            f"# TYPE {METRIC_PREFIX}_books_per_second gauge",
+            f"{METRIC_PREFIX}_books_per_second {summary['books_per_second']}",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds gauge",
+        ]
+        for name, seconds in summary['stages'].items():
+            lines.append(f'{METRIC_PREFIX}_stage_seconds{{stage="{name}"}} {seconds}')
+
+        for name, value in summary['counters'].items():
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+            lines.append(f"{METRIC_PREFIX}_{name}_total {value}")
+
+        for name, timing in summary['timings'].items():
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} summary")
+            lines.append(f'{metric}{{quantile="0.5"}} {timing["p50"]}')
+            lines.append(f'{metric}{{quantile="0.99"}} {timing["p99"]}')
+            lines.append(f"{metric}_sum {timing['sum']}")
+            lines.append(f"{metric}_count {timing['count']}")
+
+        for name, gauge in summary['gauges'].items():
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+            lines.append(f"{METRIC_PREFIX}_{name} {gauge['last']}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name}_max gauge")
+            lines.append(f"{METRIC_PREFIX}_{name}_max {gauge['max']}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_last_run_timestamp_seconds {int(time.time())}")
+        return lines
+
+    def write(self, path):
+        """측정 결과 저장 (.prom이면 Prometheus textfile, 아니면 JSON)
+
+        node_exporter가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체한다.
+        """
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if path.endswith('.prom'):
+                f.write('\n'.join(self.prometheus_lines()) + '\n')
+            else:
+                json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def print_summary(self):
+        """단계별 소요 시간과 페이지당 시간 요약 출력"""
+        summary = self.summary()
+        if summary['stages']:
+            stages = ', '.join(f"{name} {seconds:.1f}초" for name, seconds in summary['stages'].items())
+            print(f"⏱️ 단계별 소요 시간: {stages}")
+        for name, timing in summary['timings'].items():
+            print(f"  - {name}: {timing['count']}회, p50 {timing['p50'] * 1000:.1f}ms, "
+                  f"p99 {timing['p99'] * 1000:.1f}ms")
+        fetched = summary['counters'].get('bytes_fetched', 0)
+        if fetched:
+            print(f"📦 수집한 데이터: {fetched / 1024 / 1024:.1f}MB, 처리량: {summary['books_per_second']:.2f}권/초")
+
+    def close(self):
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+
+
+def profile_call(func, *args, profiler='cprofile', output=None, limit=30):
+    """함수 한 번의 실행을 프로파일링해 상위 항목을 출력하고 결과 반환
+
+    pyinstrument(선택적 의존성)가 없으면 cProfile을 사용한다.
+    output을 지정하면 cProfile은 .prof, pyinstrument는 HTML 보고서로 저장한다.
+    """
+    if profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ pyinstrument가 설치되어 있지 않아 cProfile을 사용합니다. (pip install pyinstrument)")
+        else:
+            profile = Profiler()
+            profile.start()
+            try:
+                return func(*args)
+            finally:
+                profile.stop()
+                print(profile.output_text(unicode=True))
+                if output:
+                    with open(output, 'w', encoding='utf-8') as f:
+                        f.write(profile.output_html())
+                    print(f"💾 프로파일 보고서: {output}")
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        return func(*args)
+    finally:
+        profile.disable()
+        pstats.Stats(profile).sort_stats('cumulative').print_stats(limit)
+        if output:
+            profile.dump_stats(output)
+            print(f"💾 프로파일 결과: {output} (snakeviz 등으로 확인)")
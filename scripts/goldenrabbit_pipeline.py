@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from goldenrabbit_extractor import BookExtractor, SoupExtractor
+
+
+# 워커 프로세스마다 한 번만 만드는 추출기
+_worker_extractors = {}
+
+
+def parse_book_page(html, book_url, book_title, parser='lxml', encoding=None):
+    """워커 프로세스에서 상세 페이지 HTML을 파싱해 도서 정보 딕셔너리 반환 (encoding: 응답 헤더의 charset)"""
+    if parser not in _worker_extractors:
+        if parser == 'soup':
+            _worker_extractors[parser] = SoupExtractor().extract
+        else:
+            _worker_extractors[parser] = BookExtractor().extract
+
+    return _worker_extractors[parser](html, book_url, book_title, encoding)
+
+
+def default_workers():
+    """기본 파서 워커 수 (CPU 코어 수)"""
+    return os.cpu_count() or 1
+
+
+class ParsePipeline:
+    """네트워크 수집과 파싱을 분리한 단계형 파이프라인
+
+    수집 단계는 원시 HTML(bytes)을 크기가 제한된 큐에 넣고, 파싱 단계는
+    ProcessPoolExecutor의 워커들이 큐에서 꺼내 파싱한다. 큐가 가득 차면
+    수집이 잠시 멈추므로 메모리 사용량이 큐 크기로 제한된다. 파싱 결과는
+    완료되는 대로 on_result 콜백으로 전달된다.
+    """
+
+    def __init__(self, workers=None, queue_size=32, parser='lxml', metrics=None):
+        self.workers = workers or default_workers()
+        self.queue_size = queue_size
+        self.parser = parser
+        self.metrics = metrics
+
+    async def run(self, items, fetch_page, on_result):
+        """items를 fetch_page로 수집하고 파싱해 on_result(item, book_data, error) 호출
+
+        fetch_page(item)는 (html, url, title, 응답 헤더의 charset 또는 None) 튜플을 돌려주는 코루틴이며,
+        건너뛸 항목이면 None을 돌려준다.
+        on_result가 예외를 던지면(결과 기록 실패 등) 남은 수집을 취소하고 그 예외를 다시 던진다.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        failures = []
+        producers = None
+
+        def deliver(item, book_data, error):
+            # 콜백 예외가 소비자 태스크를 죽이면 수집 단계가 가득 찬 큐에서 영원히 멈추므로
+            # 여기서 잡아 두고 수집을 취소한다
+            try:
+                on_result(item, book_data, error)
+            except Exception as e:
+                if not failures:
+                    print(f"❌ 결과 처리 오류: {e}")
+                failures.append(e)
+                if self.metrics:
+                    self.metrics.incr('result_errors')
+                if producers:
+                    producers.cancel()
+
+        async def produce(item):
+            try:
+                page = await fetch_page(item)
+            except Exception as e:
+                print(f"❌ 수집 오류: {e}")
+                deliver(item, None, e)
+                return
+
+            if page is None:
+                deliver(item, None, None)
+            else:
+                await queue.put((item, page))
+                if self.metrics:
+                    self.metrics.gauge('parse_queue_depth', queue.qsize())
+
+        async def consume(pool):
+            while True:
+                entry = await queue.get()
+                try:
+                    if entry is None:
+                        return
+
+                    item, (html, book_url, book_title, encoding) = entry
+                    error = None
+                    started = time.monotonic()
+                    try:
+                        book_data = await loop.run_in_executor(
+                            pool, parse_book_page, html, book_url, book_title, self.parser, encoding
+                        )
+                    except Exception as e:
+                        print(f"❌ 파싱 오류 ({book_title}): {e}")
+                        book_data, error = None, e
+                    if self.metrics:
+                        # 워커 왕복(직렬화 포함) 시간
+                        elapsed = time.monotonic() - started
+                        self.metrics.observe('parse_seconds', elapsed)
+                        self.metrics.log('parse', url=book_url, seconds=round(elapsed, 4), ok=error is None)
+                    deliver(item, book_data, error)
+                finally:
+                    queue.task_done()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            consumers = [asyncio.create_task(consume(pool)) for _ in range(self.workers)]
+
+            producers = asyncio.ensure_future(asyncio.gather(*(produce(item) for item in items)))
+            try:
+                await producers
+            except asyncio.CancelledError:
+                if not failures:
+                    raise
+
+            if failures:
+                for consumer in consumers:
+                    consumer.cancel()
+                await asyncio.gather(*consumers, return_exceptions=True)
+                raise failures[0]
+
+            # 모든 수집이 끝나면 워커 수만큼 종료 신호 전달
+            for _ in consumers:
+                await queue.put(None)
+            await asyncio.gather(*consumers)
+            if failures:
+                raise failures[0]
@@ -0,0 +1,322 @@
+"""정규화된 타입을 가진 도서 레코드 (BookRecord)와 빠른 직렬화
+
+사용법:
+    python goldenrabbit_record.py <결과 JSON/JSONL> [--repeat 20] [--output typed.jsonl]
+
+추출기가 만드는 도서 딕셔너리는 모든 값이 문자열이다 ('₩24,000', '2022년 12월 20일').
+BookRecord는 이를 한 번에 정규화한다.
+- price: 원 단위 정수
+- page_count: 정수
+- publication_date: datetime.date
+- isbn: 체크 숫자를 검증한 ISBN-13 (검증에 실패한 원래 값은 extra['isbn_raw']에 보존)
+
+설명, 목차, 출판사 리뷰처럼 큰 텍스트 필드는 compress=True로 만들면 zlib으로
+압축해 두고, 속성에 접근할 때만 풀어 돌려준다 (많은 도서를 메모리에 둘 때용).
+
+직렬화는 orjson이 있으면 orjson, msgpack이 있으면 msgpack을 쓰고, 없으면 표준 json으로 대신한다.
+"""
+import argparse
+import json
+import re
+import time
+import tracemalloc
+import zlib
+from dataclasses import dataclass, field
+from datetime import date
+
+from goldenrabbit_extractor import isbn13
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# 지연 디코딩하는 큰 텍스트 필드
+TEXT_FIELDS = ['description', 'table_of_contents', 'publisher_review', 'testimonials', 'author_bio']
+
+# 이보다 짧은 텍스트는 압축하지 않음 (바이트)
+COMPRESS_MIN_BYTES = 512
+
+# to_dict가 기록하는 필드 순서 (추출기의 기존 출력 순서)
+FIELD_ORDER = [
+    'title', 'url', 'author', 'publisher', 'publication_date', 'price', 'isbn', 'page_count',
+    'description', 'table_of_contents', 'publisher_review', 'testimonials', 'cover_image_url',
+    'category', 'size', 'author_bio',
+]
+
+DIGITS_RE = re.compile(r'\d+')
+
+# 가격 문자열의 첫 금액 ('24,000', '24000', '24,000.00'의 정수 부분과 소수 부분)
+AMOUNT_RE = re.compile(r'(\d[\d,]*)(?:\.\d+)?')
+
+# 천 단위 구분 기호가 올바른 금액 ('1,234,000')
+GROUPED_AMOUNT_RE = re.compile(r'\d{1,3}(?:,\d{3})+')
+
+# '2022년 12월 20일', '2022-12-20', '2022.12.20', '2022/12/20', '2022년 12월'
+DATE_RE = re.compile(r'(\d{4})\s*[년.\-/]\s*(\d{1,2})\s*(?:[월.\-/]\s*(?:(\d{1,2})\s*일?)?)?')
+
+# pack_records 출력의 첫 바이트 (형식 표시)
+PACK_MSGPACK = b'M'
+PACK_JSON = b'J'
+
+
+def parse_price(value):
+    """'₩24,000' 같은 가격 문자열의 첫 금액을 정수(원)로 변환
+
+    소수점 아래('₩24,000.00')는 버리고, 할인가가 함께 적힌 '₩30,000 ₩27,000'은 첫 금액(정가)만 읽는다.
+    천 단위 구분이 어긋난 '24,00'처럼 해석이 모호하면 None.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return round(value)
+    match = AMOUNT_RE.search(value or '')
+    if not match:
+        return None
+    amount = match.group(1).rstrip(',')
+    if ',' in amount and not GROUPED_AMOUNT_RE.fullmatch(amount):
+        return None
+    return int(amount.replace(',', ''))
+
+
+def format_price(value):
+    """정수 가격을 화면 표시용 '₩24,000' 문자열로 (문자열은 그대로, 없으면 '')"""
+    if isinstance(value, int):
+        return f"₩{value:,}"
+    return value or ''
+
+
+def parse_page_count(value):
+    """'320쪽' 같은 페이지 수 문자열을 정수로 변환 (없으면 0)"""
+    if isinstance(value, int):
+        return value
+    match = DIGITS_RE.search(value or '')
+    return int(match.group()) if match else 0
+
+
+def parse_date(value):
+    """'2022년 12월 20일' 같은 출간일을 date로 변환 (일이 없으면 1일, 해석할 수 없으면 None)"""
+    if isinstance(value, date):
+        return value
+    match = DATE_RE.search(value or '')
+    if not match:
+        return None
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3) or 1))
+    except ValueError:
+        return None
+
+
+def json_dumps(data):
+    """압축된 UTF-8 JSON bytes (orjson이 있으면 orjson)
+
+    한글이 많은 본문은 bytes를 다시 str로 바꾸는 비용이 직렬화만큼 크므로 bytes 그대로 돌려준다.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(text):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+@dataclass(slots=True)
+class BookRecord:
+    """정규화된 도서 레코드
+
+    큰 텍스트 필드는 texts에 문자열 또는 압축된 bytes로 두고, record.description처럼
+    읽을 때 풀어 돌려준다. 값을 바꿀 때는 set_text를 쓴다.
+    서점 링크, 표지 변형처럼 정해지지 않은 나머지 필드는 extra에 그대로 둔다.
+    """
+
+    title: str
+    url: str = ''
+    author: str = ''
+    publisher: str = '골든래빗'
+    category: str = 'IT전문서'
+    price: int | None = None
+    page_count: int | None = None
+    publication_date: date | None = None
+    isbn: str | None = None
+    size: str | None = None
+    cover_image_url: str = ''
+    texts: dict = field(default_factory=dict)
+    extra: dict = field(default_factory=dict)
+
+    def __getattr__(self, name):
+        # 슬롯에 없는 이름만 여기로 온다
+        if name in TEXT_FIELDS:
+            return self.text(name)
+        raise AttributeError(name)
+
+    def text(self, name):
+        """큰 텍스트 필드 값 (압축되어 있으면 풀어서, 없으면 '')"""
+        value = self.texts.get(name, '')
+        return zlib.decompress(value).decode('utf-8') if isinstance(value, bytes) else value
+
+    def set_text(self, name, value, compress=False):
+        """큰 텍스트 필드 값 설정 (compress면 긴 텍스트를 압축해 보관)"""
+        if compress and value:
+            data = value.encode('utf-8')
+            if len(data) >= COMPRESS_MIN_BYTES:
+                value = zlib.compress(data)
+        self.texts[name] = value
+
+    @classmethod
+    def from_dict(cls, book, compress=False):
+        """추출기의 도서 딕셔너리(또는 to_dict 결과)로 레코드 생성"""
+        record = cls(
+            title=book.get('title') or '',
+            url=book.get('url') or '',
+            author=book.get('author') or '',
+            publisher=book.get('publisher') or '골든래빗',
+            category=book.get('category') or 'IT전문서',
+            price=parse_price(book.get('price')),
+            page_count=parse_page_count(book.get('page_count')) or None,
+            publication_date=parse_date(book.get('publication_date')),
+            isbn=isbn13(book.get('isbn')),
+            size=book.get('size') or None,
+            cover_image_url=book.get('cover_image_url') or '',
+        )
+        for name in TEXT_FIELDS:
+            if name in book:
+                record.set_text(name, book[name] or '', compress)
+        record.extra = {key: value for key, value in book.items() if key not in FIELD_ORDER}
+        if book.get('isbn') and not record.isbn and not record.extra.get('isbn_raw'):
+            record.extra['isbn_raw'] = book['isbn']
+        return record
+
+    def to_dict(self):
+        """JSON으로 저장할 수 있는 딕셔너리 (날짜는 ISO 문자열, 없는 값은 None)"""
+        data = {
+            'title': self.title,
+            'url': self.url,
+            'author': self.author,
+            'publisher': self.publisher,
+            'publication_date': self.publication_date.isoformat() if self.publication_date else None,
+            'price': self.price,
+            'isbn': self.isbn,
+            'page_count': self.page_count,
+        }
+        for name in TEXT_FIELDS:
+            if name in self.texts:
+                data[name] = self.text(name)
+        data['cover_image_url'] = self.cover_image_url
+        data['category'] = self.category
+        if self.size is not None:
+            data['size'] = self.size
+        data.update(self.extra)
+        return data
+
+    def to_json(self):
+        """JSONL 한 줄용 압축된 JSON (UTF-8 bytes)"""
+        return json_dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text, compress=False):
+        return cls.from_dict(json_loads(text), compress)
+
+
+def pack_records(records):
+    """레코드 목록을 bytes로 직렬화 (msgpack이 있으면 msgpack, 없으면 JSON)"""
+    data = [record.to_dict() for record in records]
+    if msgpack is not None:
+        return PACK_MSGPACK + msgpack.packb(data, use_bin_type=True)
+    return PACK_JSON + json_dumps(data)
+
+
+def unpack_records(data, compress=False):
+    """pack_records 결과를 레코드 목록으로 복원"""
+    if data[:1] == PACK_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("msgpack으로 저장된 데이터입니다. pip install msgpack 후 다시 실행하세요.")
+        items = msgpack.unpackb(data[1:], raw=False)
+    else:
+        items = json_loads(data[1:])
+    return [BookRecord.from_dict(item, compress) for item in items]
+
+
+def measure_memory(build):
+    """build()가 만든 객체가 차지하는 메모리 (바이트)
+
+    정규식 컴파일 같은 첫 실행 비용이 섞이지 않도록 한 번 실행한 뒤 측정한다.
+    """
+    build()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = build()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del objects
+    return used
+
+
+def time_call(func, repeat):
+    """func를 repeat번 실행한 평균 시간 (초)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    # 적재기가 이 모듈을 가져오므로 순환 import를 피해 여기서 가져온다
+    from goldenrabbit_loader import load_books
+
+    parser = argparse.ArgumentParser(description="도서 레코드의 메모리와 직렬화 시간 측정, 정규화 변환")
+    parser.add_argument('input', help="스크래핑 결과 JSON 또는 JSONL")
+    parser.add_argument('--repeat', type=int, default=20, help="직렬화 반복 횟수 (기본값: 20)")
+    parser.add_argument('--output', default=None, help="정규화한 레코드를 저장할 JSONL 경로")
+    args = parser.parse_args()
+
+    books = list(load_books(args.input))
+    if not books:
+        print("❌ 도서 정보가 없습니다.")
+        return
+    if orjson is None:
+        print("⚠️ orjson이 설치되어 있지 않아 표준 json을 사용합니다. (pip install orjson)")
+    if msgpack is None:
+        print("⚠️ msgpack이 설치되어 있지 않아 pack_records가 JSON을 사용합니다. (pip install msgpack)")
+
+    count = len(books)
+    lines = [json.dumps(book, ensure_ascii=False) for book in books]
+    memory = {
+        '딕셔너리': measure_memory(lambda: [json.loads(line) for line in lines]),
+        'BookRecord': measure_memory(lambda: [BookRecord.from_json(line) for line in lines]),
+        'BookRecord(압축)': measure_memory(lambda: [BookRecord.from_json(line, compress=True) for line in lines]),
+    }
+    print(f"🧠 도서당 메모리 ({count}개 도서):")
+    for label, used in memory.items():
+        print(f"  - {label}: {used / count / 1024:.1f}KB")
+
+    records = [BookRecord.from_dict(book) for book in books]
+    timings = {
+        '딕셔너리 json.dumps': time_call(
+            lambda: [json.dumps(book, ensure_ascii=False, separators=(',', ':')) for book in books], args.repeat),
+        'BookRecord.to_json': time_call(lambda: [record.to_json() for record in records], args.repeat),
+        'pack_records': time_call(lambda: pack_records(records), args.repeat),
+    }
+    print("⏱️ 직렬화 시간 (전체 도서 1회):")
+    for label, seconds in timings.items():
+        print(f"  - {label}: {seconds * 1000:.2f}ms")
+
+    if args.output:
+        with open(args.output, 'wb') as f:
+            for record in records:
+                f.write(record.to_json() + b'\n')
+        print(f"💾 정규화한 레코드 {count}개를 {args.output}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""스크래핑 결과로 만드는 한국어 전문 검색 색인 (SQLite FTS5)
+
+사용법:
+    python goldenrabbit_search.py build <결과 JSON/JSONL> --index books_search.sqlite [--prune]
+    python goldenrabbit_search.py query "크롤링 자동화" --index books_search.sqlite [--limit 10]
+    python goldenrabbit_search.py bench --index books_search.sqlite [--source 결과.jsonl] [--repeat 200]
+
+FTS5 기본 토크나이저는 띄어쓰기 단위로 자르기 때문에 '크롤링'으로 '웹크롤링'을
+찾지 못하고, trigram 토크나이저는 두 글자 단어('코딩')를 찾지 못한다. 그래서
+한글은 파이썬에서 두 글자씩 겹쳐 자른 토큰(바이그램)으로, 영문·숫자는 소문자
+단어로 바꿔 색인하고, 검색어도 같은 방식으로 잘라 인접 토큰 구문(phrase)으로 찾는다.
+
+도서마다 색인 대상 필드의 해시를 저장하므로, 다시 실행하면 바뀐 도서만 갱신한다.
+FTS5 테이블은 본문을 저장하지 않는(contentless) 형태라 파일이 작고, 갱신할 때 필요한
+이전 토큰은 books 테이블에 압축해 둔다.
+"""
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import statistics
+import time
+import zlib
+
+from goldenrabbit_loader import book_id, load_books
+from goldenrabbit_record import format_price
+
+
+# 토큰화 방식이 바뀌면 올려서 모든 도서를 다시 색인
+TOKENIZER_VERSION = 1
+
+# 색인 필드와 bm25 가중치 (제목, 저자 일치를 우선)
+INDEX_FIELDS = [
+    ('title', 10.0),
+    ('author', 5.0),
+    ('description', 1.0),
+    ('table_of_contents', 1.0),
+    ('publisher_review', 1.0),
+    ('testimonials', 0.5),
+]
+
+TOKEN_RE = re.compile(r'[가-힣]+|[0-9a-z]+')
+
+DEFAULT_QUERIES = ['파이썬', '챗GPT', '크롤링', '자바스크립트', '데이터 분석', '코딩 테스트', '업무 자동화', 'AI']
+
+
+def is_hangul(word):
+    return '가' <= word[0] <= '힣'
+
+
+def tokenize(text):
+    """텍스트를 색인 토큰 목록으로 변환 (한글은 바이그램, 그 외는 소문자 단어)"""
+    tokens = []
+    for match in TOKEN_RE.finditer((text or '').lower()):
+        word = match.group()
+        if is_hangul(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def build_match_query(query):
+    """검색어를 FTS5 MATCH 식으로 변환 (띄어 쓴 단어는 모두 포함, 단어 안은 인접 구문)"""
+    phrases = []
+    for term in query.split():
+        tokens = tokenize(term)
+        if tokens:
+            phrases.append('"' + ' '.join(tokens) + '"')
+    return ' AND '.join(phrases)
+
+
+def content_hash(book):
+    """색인 대상 필드의 해시 (토크나이저 버전 포함)"""
+    payload = json.dumps(
+        [TOKENIZER_VERSION] + [book.get(field) or '' for field, _ in INDEX_FIELDS],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SearchIndex:
+    """도서 검색 색인 (URL 기준 증분 갱신 + 검색 API)
+
+    books 테이블에 표시용 필드, 내용 해시, 압축한 토큰을 저장하고,
+    books_fts(contentless FTS5)에는 같은 rowid로 토큰만 색인한다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        columns = ', '.join(field for field, _ in INDEX_FIELDS)
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS books (
+                rowid INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                id TEXT NOT NULL,
+                title TEXT,
+                author TEXT,
+                price TEXT,
+                cover_image_url TEXT,
+                content_hash TEXT NOT NULL,
+                tokens BLOB NOT NULL,
+                indexed_at TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+                {columns}, content = '', tokenize = 'unicode61'
+            );
+        """)
+        self.conn.commit()
+
+    def index_books(self, books, prune=False):
+        """도서 정보를 색인에 반영하고 {추가, 갱신, 변경 없음, 삭제} 수 반환
+
+        prune이면 이번 입력에 없는 도서를 색인에서 지운다 (전체 결과로 동기화할 때).
+        """
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+        existing = {url: (rowid, digest) for rowid, url, digest in
+                    self.conn.execute("SELECT rowid, url, content_hash FROM books")}
+        seen = set()
+        now = time.strftime('%Y-%m-%dT%H:%M:%S')
+        columns = ', '.join(field for field, _ in INDEX_FIELDS)
+        placeholders = ', '.join('?' for _ in INDEX_FIELDS)
+
+        with self.conn:
+            for book in books:
+                url = book.get('url')
+                if not url or url in seen:
+                    continue
+                seen.add(url)
+
+                digest = content_hash(book)
+                row = existing.get(url)
+                if row and row[1] == digest:
+                    counts['unchanged'] += 1
+                    continue
+
+                tokens = [' '.join(tokenize(book.get(field))) for field, _ in INDEX_FIELDS]
+                values = (book_id(book), book.get('title', ''), book.get('author', ''),
+                          format_price(book.get('price')), book.get('cover_image_url', ''), digest,
+                          zlib.compress(json.dumps(tokens, ensure_ascii=False).encode('utf-8')), now)
+                if row:
+                    rowid = row[0]
+                    self.remove_tokens(rowid)
+                    self.conn.execute(
+                        "UPDATE books SET id = ?, title = ?, author = ?, price = ?, cover_image_url = ?, "
+                        "content_hash = ?, tokens = ?, indexed_at = ? WHERE rowid = ?",
+                        values + (rowid,),
+                    )
+                    counts['updated'] += 1
+                else:
+                    rowid = self.conn.execute(
+                        "INSERT INTO books (url, id, title, author, price, cover_image_url, content_hash, tokens, "
+                        "indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (url,) + values,
+                    ).lastrowid
+                    counts['added'] += 1
+
+                self.conn.execute(f"INSERT INTO books_fts (rowid, {columns}) VALUES (?, {placeholders})",
+                                  [rowid] + tokens)
+
+            if prune:
+                for url, (rowid, _) in existing.items():
+                    if url not in seen:
+                        self.remove_tokens(rowid)
+                        self.conn.execute("DELETE FROM books WHERE rowid = ?", (rowid,))
+                        counts['removed'] += 1
+
+        return counts
+
+    def remove_tokens(self, rowid):
+        """contentless 색인에서 도서 하나 제거 (색인할 때의 토큰을 그대로 넘겨야 함)"""
+        blob = self.conn.execute("SELECT tokens FROM books WHERE rowid = ?", (rowid,)).fetchone()[0]
+        tokens = json.loads(zlib.decompress(blob))
+        columns = ', '.join(field for field, _ in INDEX_FIELDS)
+        placeholders = ', '.join('?' for _ in INDEX_FIELDS)
+        self.conn.execute(f"INSERT INTO books_fts (books_fts, rowid, {columns}) VALUES ('delete', ?, {placeholders})",
+                          [rowid] + tokens)
+
+    def search(self, query, limit=10):
+        """검색어와 일치하는 도서를 관련도 순으로 반환"""
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        weights = ', '.join(str(weight) for _, weight in INDEX_FIELDS)
+        rows = self.conn.execute(
+            f"""
+            SELECT b.url, b.id, b.title, b.author, b.price, b.cover_image_url, bm25(books_fts, {weights}) AS score
+            FROM books_fts JOIN books b ON b.rowid = books_fts.rowid
+            WHERE books_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (match, limit),
+        ).fetchall()
+        return [
+            {'url': url, 'id': id_, 'title': title, 'author': author, 'price': price,
+             'cover_image_url': cover, 'score': round(-score, 4)}
+            for url, id_, title, author, price, cover, score in rows
+        ]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def optimize(self, vacuum=False):
+        """FTS5 세그먼트 병합 (배포용 파일 크기와 검색 속도 개선)"""
+        self.conn.execute("INSERT INTO books_fts (books_fts) VALUES ('optimize')")
+        self.conn.commit()
+        if vacuum:
+            self.conn.execute("VACUUM")
+
+    def close(self):
+        self.conn.close()
+
+
+def scan_search(books, query):
+    """비교용 전체 스캔 검색 (ILIKE와 같은 부분 문자열 검사)"""
+    terms = [term.lower() for term in query.split()]
+    results = []
+    for book in books:
+        text = ' '.join(book.get(field) or '' for field, _ in INDEX_FIELDS).lower()
+        if all(term in text for term in terms):
+            results.append(book)
+    return results
+
+
+def time_queries(run, queries, repeat):
+    """검색어별 반복 실행 시간(ms) 목록"""
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            run(query)
+            timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)
+
+
+def print_timings(label, timings):
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"  - {label}: 중앙값 {statistics.median(timings):.3f}ms, p99 {p99:.3f}ms, 최대 {timings[-1]:.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도서 전문 검색 색인 생성·검색·벤치마크")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="스크래핑 결과로 색인 생성/갱신")
+    build.add_argument('input', help="스크래핑 결과 JSON 또는 JSONL")
+    build.add_argument('--prune', action='store_true', help="입력에 없는 도서를 색인에서 삭제")
+
+    query = subparsers.add_parser('query', help="색인 검색")
+    query.add_argument('query', help="검색어 (띄어 쓴 단어는 모두 포함)")
+    query.add_argument('--limit', type=int, default=10)
+
+    bench = subparsers.add_parser('bench', help="검색 지연 시간 측정")
+    bench.add_argument('--queries', default=','.join(DEFAULT_QUERIES), help="쉼표로 구분한 검색어")
+    bench.add_argument('--repeat', type=int, default=200, help="검색어별 반복 횟수")
+    bench.add_argument('--source', default=None, help="전체 스캔과 비교할 스크래핑 결과")
+
+    for subparser in (build, query, bench):
+        subparser.add_argument('--index', default='goldenrabbit_search.sqlite', help="색인 파일 경로")
+    args = parser.parse_args()
+
+    index = SearchIndex(args.index)
+    try:
+        if args.command == 'build':
+            started = time.perf_counter()
+            counts = index.index_books(load_books(args.input), prune=args.prune)
+            index.optimize(vacuum=True)
+            print(f"🔎 색인 갱신: 추가 {counts['added']}개, 갱신 {counts['updated']}개, "
+                  f"변경 없음 {counts['unchanged']}개, 삭제 {counts['removed']}개 "
+                  f"({time.perf_counter() - started:.2f}초, 총 {index.count()}권)")
+
+        elif args.command == 'query':
+            started = time.perf_counter()
+            results = index.search(args.query, args.limit)
+            print(f"🔎 '{args.query}': {len(results)}건 ({(time.perf_counter() - started) * 1000:.2f}ms)")
+            for result in results:
+                print(f"  - [{result['score']:.2f}] {result['title']} ({result['author'] or '저자 미상'}) {result['url']}")
+
+        else:
+            queries = [q.strip() for q in args.queries.split(',') if q.strip()]
+            print(f"📚 색인 {index.count()}권, 검색어 {len(queries)}개 x {args.repeat}회")
+            print_timings('FTS5 색인', time_queries(index.search, queries, args.repeat))
+            if args.source:
+                books = list(load_books(args.source))
+                repeat = max(1, args.repeat // 10)
+                print_timings('전체 스캔', time_queries(lambda q: scan_search(books, q), queries, repeat))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import json
+import os
+
+
+class JsonlSink:
+    """도서 정보를 한 줄에 하나씩 JSON으로 즉시 기록하는 스트리밍 출력
+
+    기록할 때마다 flush와 fsync를 하므로, 수집 도중 프로세스가 죽어도
+    그때까지 추출한 도서는 파일에 남는다. 이어서 기록할 때는 중단으로 잘린
+    마지막 줄을 먼저 잘라내, 새 레코드가 잘린 줄에 붙어 함께 버려지지 않게 한다.
+    """
+
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        truncate_partial_line(path)
+        self.file = open(path, 'ab')
+
+    def write(self, book_data):
+        """도서 정보 한 건(딕셔너리 또는 BookRecord)을 압축된 JSON 한 줄로 기록"""
+        if hasattr(book_data, 'to_json'):
+            line = book_data.to_json()
+        else:
+            line = json.dumps(book_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.file.write(line + b'\n')
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        """파일 닫기"""
+        self.file.close()
+
+
+def truncate_partial_line(path, chunk_size=65536):
+    """파일이 줄바꿈으로 끝나지 않으면 마지막 줄바꿈 뒤의 잘린 내용을 잘라내고 잘라낸 바이트 수 반환"""
+    if not os.path.exists(path):
+        return 0
+
+    with open(path, 'r+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        # 끝에서부터 거꾸로 읽으며 마지막 줄바꿈 위치 찾기
+        while end > 0:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            index = f.read(end - start).rfind(b'\n')
+            if index >= 0:
+                end = start + index + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+    return size - end
+
+
+def count_jsonl(path):
+    """JSONL 파일에 기록된 도서 수 (파일이 없으면 0, 잘린 마지막 줄은 세지 않음)"""
+    if not path or not os.path.exists(path):
+        return 0
+    return sum(1 for _ in iter_jsonl(path))
+
+
+def iter_jsonl(path):
+    """JSONL 파일의 도서 정보를 한 건씩 반환 (마지막 줄이 잘려 있으면 무시)"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # 기록 도중 중단된 마지막 줄
+                continue
+
+
+def compact_jsonl(jsonl_path, json_path):
+    """JSONL을 기존 형식({"book_1": {...}, ...})의 보기 좋은 JSON으로 변환
+
+    레코드를 하나씩 읽어 쓰므로 전체 데이터를 메모리에 올리지 않는다.
+    """
+    count = 0
+    with open(json_path, 'w', encoding='utf-8') as out:
+        out.write('{')
+        for book_data in iter_jsonl(jsonl_path):
+            count += 1
+            body = json.dumps(book_data, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+            out.write(',' if count > 1 else '')
+            out.write(f'\n  "book_{count}": {body}')
+        out.write('\n}' if count else '}')
+    return count
@@ -0,0 +1,135 @@
+import sqlite3
+from datetime import datetime
+
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class CrawlState:
+    """재시작 가능한 수집을 위한 SQLite 작업 큐
+
+    목록에서 찾은 도서 URL마다 상태(pending/done/failed), 시도 횟수,
+    마지막 오류를 기록한다. 프로세스가 중간에 죽어도 다시 실행하면
+    목록 수집 없이 끝나지 않은 URL만 이어서 처리한다.
+    """
+
+    def __init__(self, path, max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS crawl_urls (
+                url TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS crawl_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self.conn.commit()
+
+    def now(self):
+        return datetime.now().isoformat(timespec='seconds')
+
+    def has_links(self):
+        """이전 실행에서 저장한 도서 목록이 있는지 확인"""
+        return self.conn.execute("SELECT 1 FROM crawl_urls LIMIT 1").fetchone() is not None
+
+    def add_links(self, book_links):
+        """목록에서 찾은 도서 링크를 대기 상태로 등록 (이미 있는 URL은 유지)"""
+        self.conn.executemany(
+            """
+            INSERT OR IGNORE INTO crawl_urls (url, title, position, status, updated_at)
+            VALUES (?, ?, ?, 'pending', ?)
+            """,
+            [(book['url'], book['title'], i, self.now()) for i, book in enumerate(book_links)],
+        )
+        self.conn.commit()
+
+    def remaining_links(self):
+        """아직 끝나지 않았고 재시도 한도를 넘지 않은 도서 링크 목록"""
+        rows = self.conn.execute(
+            """
+            SELECT url, title FROM crawl_urls
+            WHERE status != 'done' AND attempts < ?
+            ORDER BY position
+            """,
+            (self.max_attempts,),
+        ).fetchall()
+        return [{'title': title, 'url': url} for url, title in rows]
+
+    def mark_done(self, url):
+        """처리 완료로 표시"""
+        self.conn.execute(
+            """
+            UPDATE crawl_urls SET status = 'done', attempts = attempts + 1,
+                last_error = NULL, updated_at = ?
+            WHERE url = ?
+            """,
+            (self.now(), url),
+        )
+        self.conn.commit()
+
+    def mark_failed(self, url, error):
+        """실패로 표시하고 오류 기록"""
+        self.conn.execute(
+            """
+            UPDATE crawl_urls SET status = 'failed', attempts = attempts + 1,
+                last_error = ?, updated_at = ?
+            WHERE url = ?
+            """,
+            (str(error), self.now(), url),
+        )
+        self.conn.commit()
+
+    def counts(self):
+        """상태별 URL 수"""
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM crawl_urls GROUP BY status")
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+    def unfinished_urls(self):
+        """아직 완료되지 않은(대기 또는 실패) URL 목록"""
+        return [url for url, in self.conn.execute("SELECT url FROM crawl_urls WHERE status != 'done'")]
+
+    def exhausted(self):
+        """재시도 한도를 넘겨 더 이상 시도하지 않는 URL과 마지막 오류"""
+        return self.conn.execute(
+            """
+            SELECT url, last_error FROM crawl_urls
+            WHERE status = 'failed' AND attempts >= ?
+            ORDER BY position
+            """,
+            (self.max_attempts,),
+        ).fetchall()
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM crawl_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT INTO crawl_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+        self.conn.commit()
+
+    def reset(self):
+        """새 수집을 위해 모든 상태 삭제"""
+        self.conn.execute("DELETE FROM crawl_urls")
+        self.conn.execute("DELETE FROM crawl_meta")
+        self.conn.commit()
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
@@ -0,0 +1,123 @@
+import asyncio
+import html
+import json
+from urllib.parse import urlsplit
+
+from goldenrabbit_extractor import (
+    assign_meta_value,
+    clean_text,
+    html_to_text,
+    looks_like_isbn,
+    new_book_data,
+)
+
+
+STORE_API_PATH = '/wp-json/wc/store/products'
+
+# Store API가 한 번에 돌려주는 최대 상품 수
+STORE_API_PER_PAGE = 100
+
+# 구조화 데이터로 채워져야 하는 기본 필드 (비어 있으면 HTML로 보완)
+# 목차, 출판사 리뷰, 추천평은 HTML에만 있으므로 필요할 때만 지정한다
+DEFAULT_REQUIRED_FIELDS = ['title', 'price', 'cover_image_url', 'description']
+
+# Store API에 없고 HTML에만 있는 필드
+# 구조화 데이터만으로 만든 도서에는 이 키를 두지 않아 '수집하지 않음(기존 값 유지)'으로 구분한다
+HTML_ONLY_FIELDS = ['table_of_contents', 'publisher_review', 'testimonials']
+
+
+def price_amount(prices):
+    """Store API 가격 객체를 원 단위 정수로 변환 (가격이 없으면 None)
+
+    price는 최소 단위(currency_minor_unit자리) 정수 문자열이므로 ('2400000', 2자리 → 24000원)
+    문자열로 꾸몄다가 다시 읽지 않고 바로 반올림한 정수로 넘긴다.
+    """
+    raw = prices.get('price')
+    if not raw:
+        return None
+    minor_unit = int(prices.get('currency_minor_unit') or 0)
+    return round(int(raw) / (10 ** minor_unit)) if minor_unit else int(raw)
+
+
+def product_to_book(product):
+    """Store API 상품 하나를 도서 정보 딕셔너리로 변환 (가격은 원 단위 정수, HTML_ONLY_FIELDS 키는 없음)"""
+    book_data = new_book_data(product.get('permalink', ''), html.unescape(product.get('name', '')))
+    for field in HTML_ONLY_FIELDS:
+        del book_data[field]
+    amount = price_amount(product.get('prices') or {})
+    if amount is not None:
+        book_data['price'] = amount
+
+    images = product.get('images') or []
+    if images:
+        book_data['cover_image_url'] = images[0].get('src', '')
+
+    description = html_to_text(product.get('description'))
+    short_description = html_to_text(product.get('short_description'))
+    book_data['description'] = max(description, short_description, key=len)
+
+    sku = product.get('sku') or ''
+    if looks_like_isbn(sku):
+        book_data['isbn'] = sku
+
+    # 상품 속성 (저자, ISBN, 페이지, 출간일, 크기 등)
+    for attribute in product.get('attributes') or []:
+        label = clean_text(attribute.get('name', '')).lower()
+        value = ', '.join(clean_text(term.get('name', '')) for term in attribute.get('terms') or [])
+        assign_meta_value(label, value, book_data)
+
+    return book_data
+
+
+def missing_fields(book_data, required_fields):
+    """필수 필드 중 비어 있는 필드 목록"""
+    return [field for field in required_fields if not book_data.get(field)]
+
+
+class StoreApiClient:
+    """WooCommerce Store API에서 카테고리의 모든 상품을 100개씩 묶어 가져오는 클라이언트"""
+
+    def __init__(self, fetcher, listing_url):
+        parts = urlsplit(listing_url)
+        self.fetcher = fetcher
+        self.api_url = f"{parts.scheme}://{parts.netloc}{STORE_API_PATH}"
+        # /product-category/books/ -> books
+        self.category_slug = parts.path.rstrip('/').rsplit('/', 1)[-1]
+
+    def page_url(self, page):
+        return f"{self.api_url}?per_page={STORE_API_PER_PAGE}&page={page}"
+
+    async def fetch_page(self, page):
+        """상품 목록 한 페이지와 전체 페이지 수 반환"""
+        response = await self.fetcher.fetch(self.page_url(page), headers={'Accept': 'application/json'})
+        response.raise_for_status()
+        total_pages = int(response.headers.get('X-WP-TotalPages') or 0)
+        # 응답 헤더의 charset과 무관하게 UTF 본문을 그대로 해석
+        return json.loads(response.content), total_pages
+
+    def in_category(self, product):
+        """목록 URL의 카테고리에 속한 상품인지 확인"""
+        categories = product.get('categories') or []
+        return not categories or any(c.get('slug') == self.category_slug for c in categories)
+
+    async def fetch_books(self):
+        """카테고리의 모든 상품을 도서 정보 목록으로 반환"""
+        products, total_pages = await self.fetch_page(1)
+        print(f"🧾 Store API 1페이지: {len(products)}개 상품 (전체 {total_pages or '?'}페이지)")
+
+        if total_pages > 1:
+            # 전체 페이지 수를 알면 나머지 페이지는 한꺼번에 요청
+            pages = await asyncio.gather(*(self.fetch_page(n) for n in range(2, total_pages + 1)))
+            for more, _ in pages:
+                products.extend(more)
+        elif not total_pages and len(products) == STORE_API_PER_PAGE:
+            # 전체 페이지 수 헤더가 없으면 빈 페이지가 나올 때까지 순서대로 요청
+            page = 2
+            while True:
+                more, _ = await self.fetch_page(page)
+                if not more:
+                    break
+                products.extend(more)
+                page += 1
+
+        return [product_to_book(product) for product in products if self.in_category(product)]